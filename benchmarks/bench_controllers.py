@@ -0,0 +1,237 @@
+"""Throughput and latency of controller methods against local mock gas oracle.
+
+Every controller method is measured in sync and async mode, with cold (new controller and http client per call)
+and warm (reused controller) client, with and without cache::
+
+    python -m benchmarks.bench_controllers --requests 500 --concurrency 16 --latency 0.02 --error-rate 0.05
+
+Results can be saved with ``--json`` and compared with previous run by ``--compare``, which exits with status 1
+if p50 latency or throughput of any scenario regressed more than ``--threshold``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice import AsyncGaspriceController, GaspriceController
+from ethereum_gasprice.cache import GaspriceCache
+
+METHODS = ("get_gasprices", "get_gasprice_by_strategy", "get_fees", "get_gasprice_from_all_sources")
+MODES = ("sync", "async")
+CLIENTS = ("cold", "warm")
+CACHES = ("off", "on")
+
+
+class Scenario(NamedTuple):
+    mode: str
+    client: str
+    cache: str
+    method: str
+
+    @property
+    def name(self) -> str:
+        return "/".join(self)
+
+
+class Result(NamedTuple):
+    scenario: Scenario
+    requests: int
+    empty: int
+    seconds: float
+    throughput: float
+    p50: float
+    p99: float
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(scenario: Scenario, latencies: List[float], empty: int, seconds: float) -> Result:
+    return Result(
+        scenario=scenario,
+        requests=len(latencies),
+        empty=empty,
+        seconds=seconds,
+        throughput=len(latencies) / seconds,
+        p50=percentile(latencies, 0.5),
+        p99=percentile(latencies, 0.99),
+    )
+
+
+def run_sync(scenario: Scenario, server: MockOracleServer, requests: int, concurrency: int, cache_ttl: float) -> Result:
+    providers = mock_providers(server)
+    cache = GaspriceCache(ttl=cache_ttl) if scenario.cache == "on" else None
+
+    def make_controller() -> GaspriceController:
+        return GaspriceController(providers=providers, cache=cache)
+
+    warm = make_controller() if scenario.client == "warm" else None
+
+    def call() -> Any:
+        if warm is not None:
+            return getattr(warm, scenario.method)()
+
+        with make_controller() as controller:
+            return getattr(controller, scenario.method)()
+
+    if warm is not None:
+        call()
+
+    def timed(_: int) -> Any:
+        started_at = time.perf_counter()
+        result = call()
+        return time.perf_counter() - started_at, result
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    seconds = time.perf_counter() - started_at
+
+    if warm is not None:
+        warm.close()
+
+    return summarize(scenario, [latency for latency, _ in results], sum(not result for _, result in results), seconds)
+
+
+async def _run_async(
+    scenario: Scenario, server: MockOracleServer, requests: int, concurrency: int, cache_ttl: float
+) -> Result:
+    providers = mock_providers(server, asynchronous=True)
+    cache = GaspriceCache(ttl=cache_ttl) if scenario.cache == "on" else None
+
+    def make_controller() -> AsyncGaspriceController:
+        return AsyncGaspriceController(providers=providers, cache=cache)
+
+    warm = make_controller() if scenario.client == "warm" else None
+
+    async def call() -> Any:
+        if warm is not None:
+            return await getattr(warm, scenario.method)()
+
+        async with make_controller() as controller:
+            return await getattr(controller, scenario.method)()
+
+    if warm is not None:
+        await call()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed() -> Any:
+        async with semaphore:
+            started_at = time.perf_counter()
+            result = await call()
+            return time.perf_counter() - started_at, result
+
+    started_at = time.perf_counter()
+    results = await asyncio.gather(*(timed() for _ in range(requests)))
+    seconds = time.perf_counter() - started_at
+
+    if warm is not None:
+        await warm.aclose()
+
+    return summarize(scenario, [latency for latency, _ in results], sum(not result for _, result in results), seconds)
+
+
+def run_async(
+    scenario: Scenario, server: MockOracleServer, requests: int, concurrency: int, cache_ttl: float
+) -> Result:
+    return asyncio.run(_run_async(scenario, server, requests, concurrency, cache_ttl))
+
+
+RUNNERS: Dict[str, Callable[..., Result]] = {"sync": run_sync, "async": run_async}
+
+
+def compare(results: Sequence[Result], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Get descriptions of scenarios which are slower than in baseline.
+
+    :param results: current results
+    :param baseline: saved results, key is scenario name
+    :param threshold: allowed relative regression, e.g. 0.2 is 20%
+    """
+    regressions = []
+
+    for result in results:
+        previous = baseline.get(result.scenario.name)
+
+        if previous is None:
+            continue
+
+        if result.p50 > previous["p50"] * (1 + threshold):
+            regressions.append(f"{result.scenario.name}: p50 {previous['p50'] * 1e3:.2f} -> {result.p50 * 1e3:.2f} ms")
+
+        if result.throughput < previous["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{result.scenario.name}: throughput {previous['throughput']:.1f} -> {result.throughput:.1f} req/s"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="number of calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of concurrent calls")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random delay in seconds added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of mock server error response")
+    parser.add_argument("--cache-ttl", type=float, default=1.0, help="ttl of cache in seconds")
+    parser.add_argument("--mode", choices=MODES, action="append", help="run only given modes")
+    parser.add_argument("--client", choices=CLIENTS, action="append", help="run only given client kinds")
+    parser.add_argument("--cache", choices=CACHES, action="append", help="run only with or without cache")
+    parser.add_argument("--method", choices=METHODS, action="append", help="run only given controller methods")
+    parser.add_argument("--json", metavar="PATH", help="save results to json file")
+    parser.add_argument("--compare", metavar="PATH", help="compare results with json file of previous run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    # request logs of httpx would flood benchmark output
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    default = EndpointConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    scenarios = [
+        Scenario(*values)
+        for values in itertools.product(
+            args.mode or MODES, args.client or CLIENTS, args.cache or CACHES, args.method or METHODS
+        )
+    ]
+    results = []
+
+    print(f"{'scenario':<46} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'empty':>6}")
+
+    with MockOracleServer(default=default) as server:
+        for scenario in scenarios:
+            result = RUNNERS[scenario.mode](scenario, server, args.requests, args.concurrency, args.cache_ttl)
+            results.append(result)
+            print(
+                f"{scenario.name:<46} {result.throughput:9.1f} {result.p50 * 1e3:9.2f} {result.p99 * 1e3:9.2f}"
+                f" {result.empty:6}"
+            )
+
+    data = {result.scenario.name: {k: v for k, v in result._asdict().items() if k != "scenario"} for result in results}
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(data, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Micro-benchmark of decoding provider responses with every installed json backend::
+
+    python -m benchmarks.bench_decoding
+
+Payloads in ``benchmarks/payloads`` have the format of real api responses, EthGasStation one includes
+``gasPriceRange`` table. Every backend is measured with decoding and unification of response into gasprices, as done
+on every poll, and compared with previous ``response.json()`` of httpx.
+"""
+import json
+import os
+import timeit
+from typing import Dict
+
+from httpx import Response
+
+from ethereum_gasprice.consts import JsonBackend
+from ethereum_gasprice.decoding import available_backends
+from ethereum_gasprice.providers import EtherchainProvider, EtherscanProvider, EthGasStationProvider, PoaProvider
+
+PAYLOADS_PATH = os.path.join(os.path.dirname(__file__), "payloads")
+PROVIDERS = (EtherscanProvider, EthGasStationProvider, EtherchainProvider, PoaProvider)
+
+
+def load_payloads() -> Dict[str, bytes]:
+    """Load payloads as compact json bodies, as they are sent by apis."""
+    payloads = {}
+
+    for provider in PROVIDERS:
+        with open(os.path.join(PAYLOADS_PATH, provider.title + ".json")) as file:
+            payloads[provider.title] = json.dumps(json.load(file), separators=(",", ":")).encode()
+
+    return payloads
+
+
+def main(number: int = 20000) -> None:
+    payloads = load_payloads()
+    backends = available_backends()
+
+    print(f"{'provider':<14} {'bytes':>6} {'response.json()':>16}" + "".join(f" {b.value:>10}" for b in backends))
+
+    for provider in PROVIDERS:
+        body = payloads[provider.title]
+        response = Response(200, content=body)
+        instances = {backend: provider(json_backend=backend) for backend in backends}
+        baseline = instances[JsonBackend.STDLIB]
+
+        def previous():
+            data = response.json()
+            return baseline._is_valid_response_data(data) and baseline._proceed_response_data(data)
+
+        def current(instance):
+            data = instance.decoder.decode(response.content)
+            return instance._is_valid_response_data(data) and instance._proceed_response_data(data)
+
+        results = {backend: current(instance) for backend, instance in instances.items()}
+        if any(result != previous() for result in results.values()):
+            raise AssertionError(f"{provider.title}: backends returned different gasprices: {results}")
+
+        timings = [min(timeit.repeat(previous, number=number, repeat=3))]
+        for instance in instances.values():
+            timings.append(min(timeit.repeat(lambda: current(instance), number=number, repeat=3)))
+
+        columns = "".join(f" {seconds / number * 1e6:7.2f} us" for seconds in timings[1:])
+        print(f"{provider.title:<14} {len(body):6} {timings[0] / number * 1e6:13.2f} us{columns}")
+
+
+if __name__ == "__main__":
+    main()
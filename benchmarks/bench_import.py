@@ -0,0 +1,92 @@
+"""Import time of the package and its entry points, measured in fresh interpreters::
+
+    python -m benchmarks.bench_import --repeat 20 --max-ms 50
+
+Every statement is run in new interpreter with ``-X importtime`` and the median of cumulative import time of
+imported package modules is reported. Bare ``import ethereum_gasprice`` must not import heavy dependencies, status is
+1 if it does or if its median exceeds ``--max-ms``.
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+STATEMENTS = (
+    "import ethereum_gasprice",
+    "from ethereum_gasprice import GaspriceStrategy",
+    "from ethereum_gasprice import GaspriceController",
+    "from ethereum_gasprice import AsyncGaspriceController",
+)
+#: modules which must not be imported by bare ``import ethereum_gasprice``
+HEAVY_MODULES = ("httpx", "httpcore", "asyncio", "eth_utils", "web3", "ethereum_gasprice.controller.base")
+
+# "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+
+class ImportResult(NamedTuple):
+    statement: str
+    median_ms: float
+    max_ms: float
+
+
+def measure(statement: str) -> Tuple[float, List[str]]:
+    """Run statement in new interpreter, return import time in ms and names of imported modules."""
+    code = f"{statement}; import sys, json; print(json.dumps(sorted(sys.modules)))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    total_us = 0
+
+    for line in process.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+
+        # only top-level imports caused by statement, nested ones are included in their cumulative time
+        if match and not match.group(2) and match.group(3).split(".")[0] == "ethereum_gasprice":
+            total_us += int(match.group(1))
+
+    return total_us / 1e3, json.loads(process.stdout.splitlines()[-1])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="number of interpreters per statement")
+    parser.add_argument("--max-ms", type=float, help="allowed median import time of bare package import")
+    args = parser.parse_args(argv)
+
+    results: List[ImportResult] = []
+    modules: Dict[str, List[str]] = {}
+
+    print(f"{'statement':<56} {'median ms':>10} {'max ms':>10}")
+
+    for statement in STATEMENTS:
+        timings = []
+
+        for _ in range(args.repeat):
+            elapsed, modules[statement] = measure(statement)
+            timings.append(elapsed)
+
+        result = ImportResult(statement, statistics.median(timings), max(timings))
+        results.append(result)
+        print(f"{statement:<56} {result.median_ms:10.2f} {result.max_ms:10.2f}")
+
+    failures = []
+    heavy = [module for module in HEAVY_MODULES if module in modules[STATEMENTS[0]]]
+
+    if heavy:
+        failures.append(f"{STATEMENTS[0]!r} imports {', '.join(heavy)}")
+
+    if args.max_ms is not None and results[0].median_ms > args.max_ms:
+        failures.append(f"{STATEMENTS[0]!r} takes {results[0].median_ms:.2f} ms, budget is {args.max_ms:.2f} ms")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
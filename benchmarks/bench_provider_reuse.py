@@ -0,0 +1,62 @@
+"""Micro-benchmark of controller per-call overhead with and without provider/client reuse.
+
+Requests are served by in-memory httpx transport, so only library overhead is measured::
+
+    python -m benchmarks.bench_provider_reuse
+"""
+import timeit
+
+import httpx
+
+from ethereum_gasprice import GaspriceController
+from ethereum_gasprice.providers import EtherscanProvider
+
+PAYLOAD = {
+    "status": "1",
+    "message": "OK",
+    "result": {"SafeGasPrice": "20", "ProposeGasPrice": "25", "FastGasPrice": "30"},
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=PAYLOAD)
+
+
+def make_controller() -> GaspriceController:
+    return GaspriceController(http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def per_call_new_providers(controller: GaspriceController) -> None:
+    """Previous behaviour: provider is initialized on every call."""
+    controller._provider_instances.clear()
+    controller.get_gasprices()
+
+
+def per_call_new_client(controller: GaspriceController) -> None:
+    """Cold path: new http client (and connection pool) on every call."""
+    controller._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    controller.get_gasprices()
+
+
+def reused(controller: GaspriceController) -> None:
+    controller.get_gasprices()
+
+
+def init_provider_new(controller: GaspriceController) -> None:
+    controller._provider_instances.clear()
+    controller._init_provider(EtherscanProvider)
+
+
+def init_provider_reused(controller: GaspriceController) -> None:
+    controller._init_provider(EtherscanProvider)
+
+
+def main(number: int = 5000) -> None:
+    for func in (init_provider_new, init_provider_reused, per_call_new_client, per_call_new_providers, reused):
+        controller = make_controller()
+        seconds = min(timeit.repeat(lambda: func(controller), number=number, repeat=3))
+        print(f"{func.__name__:<24} {seconds / number * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
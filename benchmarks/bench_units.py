@@ -0,0 +1,91 @@
+"""Micro-benchmark of gasprice unit conversion: previous eth_utils based conversion against exact integer one::
+
+    python -m benchmarks.bench_units
+"""
+import timeit
+from decimal import Decimal
+
+from eth_utils import from_wei, to_wei
+
+from ethereum_gasprice.consts import EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.units import convert_mapping, convert_snapshot
+
+# gasprices in gwei as providers return them: strings, integers, floats and decimals
+SNAPSHOT = {
+    "etherscan": {
+        GaspriceStrategy.SLOW: None,
+        GaspriceStrategy.REGULAR: "20",
+        GaspriceStrategy.FAST: "25",
+        GaspriceStrategy.FASTEST: "30",
+    },
+    "ethgasstation": {
+        GaspriceStrategy.SLOW: 18,
+        GaspriceStrategy.REGULAR: 22,
+        GaspriceStrategy.FAST: 26,
+        GaspriceStrategy.FASTEST: 30,
+    },
+    "etherchain": {
+        GaspriceStrategy.SLOW: Decimal("19.5"),
+        GaspriceStrategy.REGULAR: Decimal("20"),
+        GaspriceStrategy.FAST: Decimal("20.5"),
+        GaspriceStrategy.FASTEST: Decimal("21.5"),
+    },
+    "poa": {
+        GaspriceStrategy.SLOW: 18.1,
+        GaspriceStrategy.REGULAR: 22.0,
+        GaspriceStrategy.FAST: 26.3,
+        GaspriceStrategy.FASTEST: 30.0,
+    },
+}
+
+HISTORY = [dict(SNAPSHOT["ethgasstation"]) for _ in range(1000)]
+
+
+def previous_convert_units(unit_from, unit_to, value):
+    """Conversion of controller before exact integer arithmetic."""
+    if value is None:
+        return None
+    elif unit_from == unit_to:
+        return int(value)
+    elif unit_to == EthereumUnit.WEI:
+        return int(to_wei(value, unit_from))
+    else:
+        return int(from_wei(to_wei(value, unit_from), unit_to))
+
+
+def previous_snapshot(unit):
+    return {
+        title: {k: previous_convert_units(EthereumUnit.GWEI, unit, v) for k, v in values.items()}
+        for title, values in SNAPSHOT.items()
+    }
+
+
+def previous_history(unit):
+    return [{k: previous_convert_units(EthereumUnit.GWEI, unit, v) for k, v in row.items()} for row in HISTORY]
+
+
+def new_snapshot(unit):
+    return convert_snapshot(SNAPSHOT, EthereumUnit.GWEI, unit)
+
+
+def new_history(unit):
+    return [convert_mapping(row, EthereumUnit.GWEI, unit) for row in HISTORY]
+
+
+def main(number: int = 2000) -> None:
+    for unit in (EthereumUnit.WEI, EthereumUnit.GWEI):
+        for name, func, n in (
+            ("previous snapshot", previous_snapshot, number),
+            ("new snapshot", new_snapshot, number),
+            ("previous history x1000", previous_history, number // 100),
+            ("new history x1000", new_history, number // 100),
+        ):
+            seconds = min(timeit.repeat(lambda: func(unit), number=n, repeat=3))
+            print(f"{unit.value:<5} {name:<24} {seconds / n * 1e6:10.2f} us/call")
+
+    print("previous gwei:", previous_snapshot(EthereumUnit.GWEI)["etherchain"])
+    print("new gwei:     ", new_snapshot(EthereumUnit.GWEI)["etherchain"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Local fake gas oracle serving Etherscan, EthGasStation, Etherchain and POA endpoints.
+
+Every endpoint has configurable latency, error rate and payload, so controllers can be benchmarked offline.
+Server can be started standalone and used by any client::
+
+    python -m benchmarks.mock_server --port 8000 --latency 0.05 --error-rate 0.1
+"""
+import argparse
+import json
+import random
+import select
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Sequence, Tuple, Type
+from urllib.parse import urlsplit
+
+from ethereum_gasprice.providers import (
+    AsyncEtherchainProvider,
+    AsyncEtherscanProvider,
+    AsyncEthGasStationProvider,
+    AsyncPoaProvider,
+    BaseGaspriceProvider,
+    EtherchainProvider,
+    EtherscanProvider,
+    EthGasStationProvider,
+    PoaProvider,
+)
+
+__all__ = ["DEFAULT_PAYLOADS", "EndpointConfig", "MockOracleServer", "mock_providers"]
+
+DEFAULT_PAYLOADS: Dict[str, Dict[str, Any]] = {
+    EtherscanProvider.title: {
+        "status": "1",
+        "message": "OK",
+        "result": {
+            "LastBlock": "13000000",
+            "SafeGasPrice": "20",
+            "ProposeGasPrice": "25",
+            "FastGasPrice": "30",
+            "suggestBaseFee": "18.5",
+        },
+    },
+    EthGasStationProvider.title: {"safeLow": 180, "average": 220, "fast": 260, "fastest": 300},
+    EtherchainProvider.title: {
+        "safeLow": 1,
+        "standard": 1.5,
+        "fast": 2,
+        "fastest": 3,
+        "currentBaseFee": 18.5,
+        "recommendedBaseFee": 37,
+    },
+    PoaProvider.title: {"health": True, "slow": 18, "standard": 22, "fast": 26, "instant": 30},
+}
+
+SYNC_PROVIDERS = (EtherscanProvider, EthGasStationProvider, EtherchainProvider, PoaProvider)
+ASYNC_PROVIDERS = (AsyncEtherscanProvider, AsyncEthGasStationProvider, AsyncEtherchainProvider, AsyncPoaProvider)
+
+
+@dataclass
+class EndpointConfig:
+    """Behaviour of one fake oracle endpoint.
+
+    :param latency: time in seconds before response
+    :param jitter: random time in seconds added to latency
+    :param error_rate: probability of error response
+    :param error_status: http status of error response
+    :param payload: json body of successful response, default payload of provider if it is not passed
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    payload: Optional[Dict[str, Any]] = None
+
+    def delay(self) -> float:
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)  # nosec
+
+    def is_error(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate  # nosec
+
+
+@dataclass
+class _EndpointState:
+    config: EndpointConfig
+    body: bytes = b""
+    requests: int = 0
+    errors: int = 0
+    aborted: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive, so warm http client reuses connections
+    protocol_version = "HTTP/1.1"
+    # headers and body are sent separately, with Nagle algorithm delayed ack adds 40ms to keep-alive responses
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def do_GET(self):
+        endpoint = self.server.endpoints.get(urlsplit(self.path).path.strip("/"))
+
+        if endpoint is None:
+            self._respond(404, b'{"error": "not found"}')
+            return
+
+        delay = endpoint.config.delay()
+        if delay:
+            time.sleep(delay)
+
+            if self._is_aborted():
+                with endpoint.lock:
+                    endpoint.aborted += 1
+
+                self.close_connection = True
+                return
+
+        is_error = endpoint.config.is_error()
+
+        with endpoint.lock:
+            endpoint.requests += 1
+            endpoint.errors += is_error
+
+        if is_error:
+            self._respond(endpoint.config.error_status, b'{"error": "mock error"}')
+        else:
+            self._respond(200, endpoint.body)
+
+    def _is_aborted(self) -> bool:
+        """Check if client closed connection while response was delayed, e.g. cancelled request."""
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        return bool(readable) and self.connection.recv(1, socket.MSG_PEEK) == b""
+
+    def _respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # default backlog is too small for concurrent cold clients
+    request_queue_size = 1024
+    endpoints: Dict[str, _EndpointState]
+
+
+class MockOracleServer:
+    """Fake gas oracle http server running in background thread.
+
+    Endpoint of provider is served at ``/<provider title>``, e.g. ``http://127.0.0.1:<port>/etherscan``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        default: Optional[EndpointConfig] = None,
+        endpoints: Optional[Dict[str, EndpointConfig]] = None,
+    ):
+        """
+        :param host: address to listen on
+        :param port: port to listen on, random free port is used by default
+        :param default: behaviour of endpoints which are not configured in endpoints
+        :param endpoints: behaviour of endpoints, key is provider title
+        """
+        self.host: str = host
+        self.port: int = port
+        self._endpoints: Dict[str, _EndpointState] = {}
+
+        for title in DEFAULT_PAYLOADS:
+            self.configure(title, (endpoints or {}).get(title) or default or EndpointConfig())
+
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def configure(self, title: str, config: EndpointConfig) -> None:
+        """Change behaviour of endpoint, can be called while server is running.
+
+        :param title: provider title
+        :param config: endpoint behaviour
+        """
+        payload = config.payload if config.payload is not None else DEFAULT_PAYLOADS[title]
+        # running server shares the dict, so new endpoint state is picked up by the next request
+        self._endpoints[title] = _EndpointState(config=config, body=json.dumps(payload).encode())
+
+    def start(self) -> None:
+        """Start server in background thread."""
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.endpoints = self._endpoints
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-oracle", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop server and wait for its thread."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def url(self, title: str) -> str:
+        """Get url of provider endpoint.
+
+        :param title: provider title
+        """
+        return f"{self.base_url}/{title}"
+
+    @property
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """Number of requests and error responses of every endpoint."""
+        return {title: (endpoint.requests, endpoint.errors) for title, endpoint in self._endpoints.items()}
+
+    @property
+    def aborted(self) -> Dict[str, int]:
+        """Number of requests of every endpoint, which were aborted by client before delayed response."""
+        return {title: endpoint.aborted for title, endpoint in self._endpoints.items()}
+
+
+def mock_providers(
+    server: MockOracleServer,
+    asynchronous: bool = False,
+    providers: Optional[Sequence[Type[BaseGaspriceProvider]]] = None,
+) -> Tuple[Type[BaseGaspriceProvider], ...]:
+    """Get subclasses of providers requesting mock server instead of real api.
+
+    Rate limits of providers are disabled, server latency and error rate are the only constraints.
+
+    :param server: running mock server
+    :param asynchronous: get async providers
+    :param providers: providers to patch, all api providers by default
+    """
+    if providers is None:
+        providers = ASYNC_PROVIDERS if asynchronous else SYNC_PROVIDERS
+
+    return tuple(
+        type(provider.__name__, (provider,), {"api_url": server.url(provider.title), "rate_limit": None})
+        for provider in providers
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random delay in seconds added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of error response")
+    parser.add_argument("--error-status", type=int, default=500, help="http status of error response")
+    args = parser.parse_args()
+
+    default = EndpointConfig(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, error_status=args.error_status
+    )
+
+    with MockOracleServer(args.host, args.port, default=default) as server:
+        for title in DEFAULT_PAYLOADS:
+            print(f"{title:<14} {server.url(title)}")
+
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
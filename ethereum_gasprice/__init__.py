@@ -1,12 +1,63 @@
-from .consts import EthereumUnit, GaspriceStrategy
-from .controller import AsyncGaspriceController, GaspriceController
-from .providers import (
-    AsyncEtherchainProvider,
-    AsyncEtherscanProvider,
-    AsyncEthGasStationProvider,
-    AsyncPoaProvider,
-    EtherchainProvider,
-    EtherscanProvider,
-    EthGasStationProvider,
-    PoaProvider,
+from typing import TYPE_CHECKING
+
+from . import _lazy
+from .consts import (
+    AggregationMethod,
+    Chain,
+    EthereumUnit,
+    FallbackMode,
+    FanOutMode,
+    GaspriceStrategy,
+    JsonBackend,
+    ProviderOrdering,
 )
+
+if TYPE_CHECKING:
+    from .controller import (
+        AsyncGaspriceController,
+        AsyncMultiChainGaspriceController,
+        GaspriceController,
+        MultiChainGaspriceController,
+    )
+    from .providers import (
+        AsyncEtherchainProvider,
+        AsyncEtherscanProvider,
+        AsyncEthGasStationProvider,
+        AsyncPoaProvider,
+        EtherchainProvider,
+        EtherscanProvider,
+        EthGasStationProvider,
+        PoaProvider,
+    )
+    from .snapshot import GaspriceSnapshot
+
+# controllers and providers import httpx, they and other modules are imported on first access
+_LAZY_IMPORTS = {
+    "AsyncGaspriceController": ".controller",
+    "AsyncMultiChainGaspriceController": ".controller",
+    "GaspriceController": ".controller",
+    "MultiChainGaspriceController": ".controller",
+    "AsyncEtherchainProvider": ".providers",
+    "AsyncEtherscanProvider": ".providers",
+    "AsyncEthGasStationProvider": ".providers",
+    "AsyncPoaProvider": ".providers",
+    "EtherchainProvider": ".providers",
+    "EtherscanProvider": ".providers",
+    "EthGasStationProvider": ".providers",
+    "PoaProvider": ".providers",
+    "GaspriceSnapshot": ".snapshot",
+}
+
+__all__ = [
+    "AggregationMethod",
+    "Chain",
+    "EthereumUnit",
+    "FallbackMode",
+    "FanOutMode",
+    "GaspriceStrategy",
+    "JsonBackend",
+    "ProviderOrdering",
+    *_LAZY_IMPORTS,
+]
+
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,124 @@
+"""Command line interface of ethereum-gasprice::
+
+    python -m ethereum_gasprice serve --port 8080 --provider etherscan --provider etherchain
+
+Secrets of providers are read from their environment variables, e.g. ``ETHGASPRICE_ETHERSCAN_SECRET``.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Type
+
+from ethereum_gasprice.consts import Chain, EthereumUnit
+
+if TYPE_CHECKING:
+    from ethereum_gasprice.controller import AsyncGaspriceController
+    from ethereum_gasprice.server import GaspriceServer
+
+__all__ = ["main"]
+
+#: providers by title, web3 provider requires web3 package
+_PROVIDERS: Dict[str, str] = {
+    "etherscan": "AsyncEtherscanProvider",
+    "ethgasstation": "AsyncEthGasStationProvider",
+    "etherchain": "AsyncEtherchainProvider",
+    "poa": "AsyncPoaProvider",
+    "web3": "AsyncWeb3Provider",
+}
+_DEFAULT_PROVIDERS = ("etherscan", "ethgasstation", "etherchain")
+
+
+def _get_provider(title: str) -> Type:
+    if title == "web3":
+        from ethereum_gasprice.providers.web3_provider import AsyncWeb3Provider
+
+        return AsyncWeb3Provider
+
+    from ethereum_gasprice import providers
+
+    return getattr(providers, _PROVIDERS[title])
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m ethereum_gasprice", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="poll providers and serve gasprices over local http api")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8080, help="port to listen on")
+    serve.add_argument("--unix", metavar="PATH", help="listen on unix socket instead of tcp port")
+    serve.add_argument(
+        "--provider",
+        dest="providers",
+        action="append",
+        choices=list(_PROVIDERS),
+        help=f"provider to poll, can be repeated, default: {', '.join(_DEFAULT_PROVIDERS)}",
+    )
+    serve.add_argument("--chain", default=Chain.ETHEREUM.value, choices=[chain.value for chain in Chain])
+    serve.add_argument("--unit", default=EthereumUnit.WEI.value, choices=[unit.value for unit in EthereumUnit])
+    serve.add_argument("--interval", type=float, default=15.0, help="initial poll interval in seconds")
+    serve.add_argument("--min-interval", type=float, default=3.0, help="minimal poll interval in seconds")
+    serve.add_argument("--max-interval", type=float, default=60.0, help="maximal poll interval in seconds")
+    serve.add_argument("--max-wait", type=float, default=30.0, help="maximal duration of long-poll in seconds")
+    serve.add_argument("--max-age", type=float, help="age of gasprices in seconds after which /health fails")
+    serve.add_argument("--forecast", action="store_true", help="serve gasprice forecasts at /v1/forecasts")
+    serve.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+
+    return parser
+
+
+def _build_server(args: argparse.Namespace, controller: "AsyncGaspriceController") -> "GaspriceServer":
+    """Build poller and server of serve command around controller."""
+    from ethereum_gasprice.aggregation import GaspriceAggregator
+    from ethereum_gasprice.forecast import GaspriceForecaster
+    from ethereum_gasprice.poller import AsyncGaspricePoller
+    from ethereum_gasprice.server import GaspriceServer
+
+    poller = AsyncGaspricePoller(
+        controller,
+        interval=args.interval,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        aggregator=GaspriceAggregator(),
+        forecaster=GaspriceForecaster() if args.forecast else None,
+    )
+    return GaspriceServer(
+        poller, host=args.host, port=args.port, unix_path=args.unix, max_wait=args.max_wait, max_age=args.max_age
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    from ethereum_gasprice.controller import AsyncGaspriceController
+
+    providers = [_get_provider(title) for title in args.providers or _DEFAULT_PROVIDERS]
+
+    async with AsyncGaspriceController(
+        return_unit=EthereumUnit(args.unit), chain=Chain(args.chain), providers=providers
+    ) as controller:
+        server = _build_server(args, controller)
+        task = asyncio.ensure_future(server.serve_forever())
+        loop = asyncio.get_running_loop()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, task.cancel)
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "serve":
+        asyncio.run(_serve(args))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
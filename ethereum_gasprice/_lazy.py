@@ -0,0 +1,34 @@
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+__all__ = ["attach"]
+
+
+def attach(package: str, imports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Get module ``__getattr__`` and ``__dir__`` of package, which import its attributes on first access.
+
+    Imported attribute is stored in package namespace, so next access doesn't call ``__getattr__``::
+
+        __getattr__, __dir__ = attach(__name__, {"GaspriceController": ".sync_wrapper"})
+
+    :param package: name of package, ``__name__`` of its ``__init__``
+    :param imports: module of every lazy attribute, relative to package
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = imports.get(name)
+
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(import_module(module, package), name)
+        namespace[name] = value
+
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(imports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,145 @@
+from decimal import Decimal
+from statistics import median
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from ethereum_gasprice.consts import AggregationMethod, EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.fees import Gasprice, Number
+from ethereum_gasprice.units import UNIT_SCALES, normalize
+
+__all__ = ["AggregatedGasprice", "GaspriceAggregator"]
+
+#: consistency constant, which makes MAD comparable to standard deviation of normal distribution
+MAD_SCALE = 1.4826
+
+GaspriceData = Mapping[str, Mapping[GaspriceStrategy, Optional[Number]]]
+
+
+def _exact(value: Number) -> Decimal:
+    """Convert gasprice to Decimal, floats are converted by their shortest repr as in unit conversion."""
+    return value if isinstance(value, Decimal) else Decimal(value if type(value) is int else str(value))
+
+
+class AggregatedGasprice(NamedTuple):
+    values: Dict[GaspriceStrategy, Optional[Gasprice]]
+    sources: Dict[GaspriceStrategy, Tuple[str, ...]]
+
+
+class GaspriceAggregator:
+    """Consensus gasprice from several providers.
+
+    Gasprices from all sources are arranged into strategy x provider matrix, which is processed column by column:
+    outliers are rejected with MAD (median absolute deviation) filter, then remaining values are aggregated with
+    chosen method, if there is enough of them to reach quorum.
+
+    Gasprices are aggregated with exact decimal arithmetic, so integer wei and fractional gwei (``Decimal``) from
+    controllers are processed the same way.
+    """
+
+    def __init__(
+        self,
+        method: AggregationMethod = AggregationMethod.MEDIAN,
+        *,
+        weights: Optional[Mapping[str, float]] = None,
+        trim: float = 0.2,
+        mad_threshold: Optional[float] = 3.0,
+        tolerance: float = 0.05,
+        quorum: int = 1,
+    ):
+        """
+        :param method: aggregation method
+        :param weights: weights of providers for weighted method, key is provider title, default weight is 1
+        :param trim: part of values cut from each side for trimmed mean method
+        :param mad_threshold: values further than mad_threshold scaled MADs from median are rejected,
+            None disables outlier rejection
+        :param tolerance: relative deviation from median, which is never considered as outlier. It matters when most
+            providers return the same value and MAD is zero
+        :param quorum: minimal number of providers for strategy, otherwise its value is None
+        """
+        if not 0 <= trim < 0.5:
+            raise ValueError("trim must be in [0, 0.5)")
+
+        if quorum < 1:
+            raise ValueError("quorum must be positive")
+
+        self.method: AggregationMethod = AggregationMethod(method)
+        self.weights: Mapping[str, float] = weights or {}
+        self._weights: Dict[str, Decimal] = {title: _exact(weight) for title, weight in self.weights.items()}
+        self.trim: float = trim
+        self.mad_threshold: Optional[float] = mad_threshold
+        self.tolerance: float = tolerance
+        self.quorum: int = quorum
+
+    @staticmethod
+    def _build_matrix(data: GaspriceData) -> Tuple[Tuple[str, ...], Dict[GaspriceStrategy, List[Optional[Number]]]]:
+        """Arrange gasprices into columns of values of every provider, one column per strategy."""
+        titles = tuple(title for title, gasprices in data.items() if gasprices)
+        rows = [data[title] for title in titles]
+        matrix = {strategy: [row.get(strategy) for row in rows] for strategy in GaspriceStrategy}
+        return titles, matrix
+
+    def _reject_outliers(self, values: Sequence[Decimal]) -> List[bool]:
+        """Get mask of values passing MAD filter.
+
+        :param values: gasprices of one strategy
+        """
+        if self.mad_threshold is None or len(values) < 3:
+            return [True] * len(values)
+
+        center = median(values)
+        deviations = [abs(value - center) for value in values]
+        limit = max(
+            _exact(self.mad_threshold) * _exact(MAD_SCALE) * median(deviations), _exact(self.tolerance) * abs(center)
+        )
+        return [deviation <= limit for deviation in deviations]
+
+    def _trimmed_mean(self, values: Sequence[Decimal]) -> Decimal:
+        ordered = sorted(values)
+        cut = int(len(ordered) * self.trim)
+        kept = ordered[cut:-cut] if cut else ordered
+        return sum(kept) / len(kept)
+
+    def _weighted_mean(self, values: Sequence[Decimal], titles: Sequence[str]) -> Optional[Decimal]:
+        weights = [self._weights.get(title, Decimal(1)) for title in titles]
+        total = sum(weights)
+        return sum(value * weight for value, weight in zip(values, weights)) / total if total else None
+
+    def _aggregate_column(self, values: Sequence[Decimal], titles: Sequence[str]) -> Optional[Decimal]:
+        if self.method == AggregationMethod.MEDIAN:
+            return median(values)
+        elif self.method == AggregationMethod.TRIMMED_MEAN:
+            return self._trimmed_mean(values)
+
+        return self._weighted_mean(values, titles)
+
+    def aggregate(self, data: GaspriceData, unit: Optional[EthereumUnit] = None) -> AggregatedGasprice:
+        """Aggregate gasprices from all sources into one value per strategy.
+
+        Values are int when they are whole numbers and exact Decimal otherwise.
+
+        :param data: result of get_gasprice_from_all_sources
+        :param unit: unit of gasprices, if passed, values are rounded to whole wei, e.g. to integer in wei
+        """
+        titles, matrix = self._build_matrix(data)
+        quantum = Decimal(1) / UNIT_SCALES[unit] if unit is not None else None
+        values: Dict[GaspriceStrategy, Optional[Gasprice]] = {}
+        sources: Dict[GaspriceStrategy, Tuple[str, ...]] = {}
+
+        for strategy, column in matrix.items():
+            present = [(_exact(value), title) for value, title in zip(column, titles) if value is not None]
+            mask = self._reject_outliers([value for value, _ in present])
+            kept = [item for item, passed in zip(present, mask) if passed]
+
+            if len(kept) < self.quorum:
+                values[strategy], sources[strategy] = None, ()
+                continue
+
+            kept_values, kept_titles = [value for value, _ in kept], tuple(title for _, title in kept)
+            result = self._aggregate_column(kept_values, kept_titles)
+            if result is None:
+                values[strategy], sources[strategy] = None, ()
+                continue
+
+            values[strategy] = normalize((result.quantize(quantum) if quantum is not None else result).normalize())
+            sources[strategy] = kept_titles
+
+        return AggregatedGasprice(values=values, sources=sources)
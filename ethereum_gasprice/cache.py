@@ -0,0 +1,221 @@
+from typing import Any, Hashable, NamedTuple, Optional
+
+from ethereum_gasprice.consts import CacheStatus
+from ethereum_gasprice.stores import BaseSnapshotStore, CacheEntry, MemoryStore
+
+__all__ = ["CacheEntry", "CacheLookup", "CacheStats", "GaspriceCache"]
+
+
+class CacheLookup(NamedTuple):
+    """Value with its cache status and age in seconds.
+
+    Results of controller methods fetched from providers by the call itself have MISS status and zero age.
+    """
+
+    status: CacheStatus
+    value: Any
+    age: Optional[float]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    stale_hits: int
+    misses: int
+    revalidations: int
+
+
+class GaspriceCache:
+    """In-memory cache for controller results with stale-while-revalidate semantics.
+
+    Value lifetime is split into three windows (all in seconds since the value was stored):
+
+    * ``[0, ttl]`` - value is fresh and returned as is;
+    * ``(ttl, ttl + stale_while_revalidate]`` - value is stale, it is returned immediately and a single
+      background refresh is started;
+    * ``(ttl, ttl + max_stale]`` - value is too old to be served by default, but it is still returned
+      when fetching a new value from providers fails.
+
+    Values are kept in memory of process by default. With shared store (file or Redis) cache is shared by several
+    processes, only one of them holding refresh lock fetches value from providers and others read it from store.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        *,
+        stale_while_revalidate: float = 0.0,
+        max_stale: float = 0.0,
+        store: Optional[BaseSnapshotStore] = None,
+        lock_timeout: float = 10.0,
+        poll_interval: float = 0.05,
+    ):
+        """
+        :param ttl: time in seconds while cached value is considered fresh
+        :param stale_while_revalidate: time in seconds after ttl while stale value is served during refresh
+        :param max_stale: time in seconds after ttl while stale value is served if providers are unavailable
+        :param store: storage of values, in-memory store of current process by default
+        :param lock_timeout: time in seconds after which refresh lock of shared store is considered abandoned,
+            also maximal time of waiting for value fetched by another process
+        :param poll_interval: time in seconds between checks of shared store while another process fetches value
+        """
+        if ttl < 0 or stale_while_revalidate < 0 or max_stale < 0:
+            raise ValueError("cache lifetimes must be non-negative")
+
+        self.ttl: float = ttl
+        self.stale_while_revalidate: float = stale_while_revalidate
+        self.max_stale: float = max_stale
+        self.store: BaseSnapshotStore = store or MemoryStore()
+        self.lock_timeout: float = lock_timeout
+        self.poll_interval: float = poll_interval
+
+        self.hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self.revalidations: int = 0
+
+    @property
+    def shared(self) -> bool:
+        """Cache is shared with other processes."""
+        return self.store.shared
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        """Convert cache key to string key of store."""
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        return ":".join(str(getattr(part, "value", part)) for part in key)
+
+    def _get(self, key: Hashable) -> Optional[CacheEntry]:
+        return self.store.get(self._key(key))
+
+    def clock(self) -> float:
+        """Current time of cache, it is wall clock for shared stores."""
+        return self.store.clock()
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        """Copy result dicts, so callers can't modify cached value. Snapshots are immutable and shared."""
+        if isinstance(value, dict):
+            return {k: dict(v) if isinstance(v, dict) else v for k, v in value.items()}
+
+        return value
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits, stale_hits=self.stale_hits, misses=self.misses, revalidations=self.revalidations
+        )
+
+    def _record(self, lookup: CacheLookup) -> CacheLookup:
+        if lookup.status == CacheStatus.HIT:
+            self.hits += 1
+        elif lookup.status == CacheStatus.STALE:
+            self.stale_hits += 1
+        else:
+            self.misses += 1
+
+        return lookup
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Get age in seconds of cached value or None if there is no value.
+
+        :param key: cache key
+        """
+        entry = self._get(key)
+        return None if entry is None else self.clock() - entry.stored_at
+
+    def peek(self, key: Hashable) -> CacheLookup:
+        """Get cached value with its status and age without counting it in stats.
+
+        :param key: cache key
+        """
+        entry = self._get(key)
+
+        if entry is None:
+            return CacheLookup(CacheStatus.MISS, None, None)
+
+        age = self.clock() - entry.stored_at
+
+        if age <= self.ttl:
+            return CacheLookup(CacheStatus.HIT, self._copy(entry.value), age)
+        elif age <= self.ttl + self.stale_while_revalidate:
+            return CacheLookup(CacheStatus.STALE, self._copy(entry.value), age)
+
+        return CacheLookup(CacheStatus.MISS, None, age)
+
+    def lookup(self, key: Hashable) -> CacheLookup:
+        """Get cached value with its status and age.
+
+        :param key: cache key
+        """
+        return self._record(self.peek(key))
+
+    def get_stale(self, key: Hashable) -> Optional[CacheLookup]:
+        """Get cached value which is still inside max_stale window.
+
+        Used as a fallback when providers failed to return new value.
+
+        :param key: cache key
+        """
+        entry = self._get(key)
+
+        if entry is None:
+            return None
+
+        age = self.clock() - entry.stored_at
+
+        if age > self.ttl + max(self.max_stale, self.stale_while_revalidate):
+            return None
+
+        self.stale_hits += 1
+        return CacheLookup(CacheStatus.STALE, self._copy(entry.value), age)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value in cache.
+
+        :param key: cache key
+        :param value: controller result
+        """
+        self.store.set(
+            self._key(key),
+            CacheEntry(value=self._copy(value), stored_at=self.clock()),
+            expire=self.ttl + max(self.max_stale, self.stale_while_revalidate),
+        )
+
+    def invalidate(self, key: Optional[Hashable] = None, *, stored_before: Optional[float] = None) -> None:
+        """Remove value from cache.
+
+        :param key: cache key, if it is not passed whole store will be cleared
+        :param stored_before: remove value only if it was stored before this time of cache clock, so value already
+            refreshed by another process sharing store is kept
+        """
+        if key is None:
+            self.store.clear()
+        elif stored_before is None:
+            self.store.delete(self._key(key))
+        else:
+            entry = self._get(key)
+
+            if entry is not None and entry.stored_at < stored_before:
+                self.store.delete(self._key(key))
+
+    def claim_refresh(self, key: Hashable) -> bool:
+        """Mark key as being refreshed. Returns False if another refresh is already running.
+
+        With shared store refresh can be running in another process.
+
+        :param key: cache key
+        """
+        if not self.store.acquire_lock(self._key(key), self.lock_timeout):
+            return False
+
+        self.revalidations += 1
+        return True
+
+    def release_refresh(self, key: Hashable) -> None:
+        """Mark refresh of key as finished.
+
+        :param key: cache key
+        """
+        self.store.release_lock(self._key(key))
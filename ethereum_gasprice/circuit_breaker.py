@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Optional
+
+from ethereum_gasprice.consts import CircuitState
+
+__all__ = ["CircuitBreaker"]
+
+
+class CircuitBreaker:
+    """Circuit breaker for gasprice provider.
+
+    After ``failure_threshold`` consecutive failures circuit is opened and provider is skipped. When
+    ``recovery_timeout`` seconds passed, circuit becomes half-open and single probe request is allowed:
+    its success closes circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        :param failure_threshold: number of consecutive failures to open circuit, 0 disables breaker
+        :param recovery_timeout: time in seconds before probe request is allowed to open circuit
+        """
+        if failure_threshold < 0 or recovery_timeout < 0:
+            raise ValueError("failure threshold and recovery timeout must be non-negative")
+
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+
+        self.state: CircuitState = CircuitState.CLOSED
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} state={self.state!r} failures={self.failures}>"
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def allow_request(self) -> bool:
+        """Check if request to provider is allowed.
+
+        In half-open state only one probe request is allowed per recovery_timeout.
+        """
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        with self._lock:
+            now = self._clock()
+
+            if now - self.opened_at < self.recovery_timeout:
+                return False
+
+            # move open timestamp, so concurrent callers wait for this probe
+            self.state = CircuitState.HALF_OPEN
+            self.opened_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+            if not self.failure_threshold:
+                return
+
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = self._clock()
+
+    def record(self, success: bool) -> None:
+        """Record result of request to provider.
+
+        :param success: request status
+        """
+        if success:
+            self.record_success()
+        else:
+            self.record_failure()
@@ -1,6 +1,18 @@
 from enum import Enum
 
-__all__ = ["EthereumUnit", "GaspriceStrategy"]
+__all__ = [
+    "EthereumUnit",
+    "Chain",
+    "GaspriceStrategy",
+    "CacheStatus",
+    "FallbackMode",
+    "FanOutMode",
+    "ProviderOrdering",
+    "CircuitState",
+    "RequestOutcome",
+    "AggregationMethod",
+    "JsonBackend",
+]
 
 
 class EthereumUnit(str, Enum):
@@ -8,6 +20,18 @@ class EthereumUnit(str, Enum):
     GWEI = "gwei"
 
 
+class Chain(str, Enum):
+    ETHEREUM = "ethereum"
+    POLYGON = "polygon"
+    BSC = "bsc"
+    ARBITRUM = "arbitrum"
+    OPTIMISM = "optimism"
+    BASE = "base"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
 class GaspriceStrategy(str, Enum):
     SLOW = "slow"
     REGULAR = "regular"
@@ -16,3 +40,79 @@ class GaspriceStrategy(str, Enum):
 
     def __repr__(self):
         return "{!r}".format(self._value_)
+
+
+class CacheStatus(str, Enum):
+    HIT = "hit"
+    STALE = "stale"
+    MISS = "miss"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+class FallbackMode(str, Enum):
+    SEQUENTIAL = "sequential"
+    RACE = "race"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+class FanOutMode(str, Enum):
+    SEQUENTIAL = "sequential"
+    CONCURRENT = "concurrent"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+class ProviderOrdering(str, Enum):
+    FIXED = "fixed"
+    ADAPTIVE = "adaptive"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+class RequestOutcome(str, Enum):
+    SUCCESS = "success"
+    TIMEOUT = "timeout"
+    HTTP_ERROR = "http_error"
+    BAD_STATUS = "bad_status"
+    JSON_ERROR = "json_error"
+    INVALID_RESPONSE = "invalid_response"
+    RATE_LIMITED = "rate_limited"
+    CIRCUIT_OPEN = "circuit_open"
+    ERROR = "error"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+class AggregationMethod(str, Enum):
+    MEDIAN = "median"
+    TRIMMED_MEAN = "trimmed_mean"
+    WEIGHTED = "weighted"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
+
+
+# value is name of module decoding json
+class JsonBackend(str, Enum):
+    MSGSPEC = "msgspec"
+    ORJSON = "orjson"
+    STDLIB = "json"
+
+    def __repr__(self):
+        return "{!r}".format(self._value_)
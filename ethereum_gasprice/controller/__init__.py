@@ -1,2 +1,20 @@
-from .async_wrapper import AsyncGaspriceController
-from .sync_wrapper import GaspriceController
+from typing import TYPE_CHECKING
+
+from .. import _lazy
+
+if TYPE_CHECKING:
+    from .async_wrapper import AsyncGaspriceController
+    from .multichain import AsyncMultiChainGaspriceController, MultiChainGaspriceController
+    from .sync_wrapper import GaspriceController
+
+# controller modules import httpx and providers, they are imported on first access
+_LAZY_IMPORTS = {
+    "AsyncGaspriceController": ".async_wrapper",
+    "AsyncMultiChainGaspriceController": ".multichain",
+    "MultiChainGaspriceController": ".multichain",
+    "GaspriceController": ".sync_wrapper",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
@@ -1,11 +1,41 @@
 import asyncio
-from typing import Any, Dict, Literal, Optional, Sequence, Type, Union
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits
 
-from ethereum_gasprice.consts import EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.aggregation import AggregatedGasprice, GaspriceAggregator
+from ethereum_gasprice.cache import CacheLookup, GaspriceCache
+from ethereum_gasprice.consts import (
+    CacheStatus,
+    Chain,
+    EthereumUnit,
+    FallbackMode,
+    GaspriceStrategy,
+    ProviderOrdering,
+    RequestOutcome,
+)
+from ethereum_gasprice.fees import Eip1559Fee, Gasprice
+from ethereum_gasprice.hooks import GaspriceHooks
 from ethereum_gasprice.providers import AsyncEtherchainProvider, AsyncEtherscanProvider, AsyncEthGasStationProvider
-from ethereum_gasprice.providers.base import BaseAsyncAPIGaspriceProvider, BaseGaspriceProvider
+from ethereum_gasprice.providers.base import BaseAsyncGaspriceProvider, BaseGaspriceProvider
+from ethereum_gasprice.scheduling import ProviderScheduler
+from ethereum_gasprice.singleflight import AsyncSingleFlight
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 from .sync_wrapper import GaspriceController
 
@@ -19,78 +49,271 @@ class AsyncGaspriceController(GaspriceController):
         self,
         *,
         return_unit: Literal[EthereumUnit.WEI, EthereumUnit.GWEI] = EthereumUnit.WEI,
+        chain: Chain = Chain.ETHEREUM,
         providers: Sequence[Type[BaseGaspriceProvider]] = (
             AsyncEtherscanProvider,
             AsyncEthGasStationProvider,
             AsyncEtherchainProvider,
         ),
         settings: Optional[Dict[str, Optional[str]]] = None,
+        cache: Optional[GaspriceCache] = None,
+        coalesce_requests: bool = True,
+        fallback_mode: FallbackMode = FallbackMode.SEQUENTIAL,
+        hedge_delay: float = 0.5,
+        provider_ordering: ProviderOrdering = ProviderOrdering.FIXED,
+        scheduler: Optional[ProviderScheduler] = None,
+        provider_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        breaker_failure_threshold: int = 5,
+        breaker_recovery_timeout: float = 30.0,
+        http_client: Optional[AsyncClient] = None,
+        http_limits: Optional[Limits] = None,
+        http2: bool = False,
+        hooks: Optional[GaspriceHooks] = None,
     ):
         """
         :param return_unit: type of return value
+        :param chain: chain of gasprices, all providers must support it
         :param providers: gasprice provider class
         :param settings: controller settings
+        :param cache: cache for controller results
+        :param coalesce_requests: share one in-flight request to provider between concurrent calls
+        :param fallback_mode: sequential or race provider fallback
+        :param hedge_delay: delay in seconds before requesting next provider in race mode
+        :param provider_ordering: fixed order of providers or adaptive order by their latency and success rate
+        :param scheduler: latency and success rate statistics of providers used in adaptive order
+        :param provider_options: extra options for providers (e.g. timeout, retries), key is provider title
+        :param breaker_failure_threshold: number of consecutive provider failures to skip provider
+        :param breaker_recovery_timeout: time in seconds after which skipped provider is probed again
+        :param http_client: externally owned http client, it is not closed by controller
+        :param http_limits: connection pool limits and keep-alive settings of http client created by controller
+        :param http2: enable HTTP/2 in http client created by controller
+        :param hooks: instrumentation hooks (metrics, tracing) of controller and its providers
         """
-        super().__init__(return_unit=return_unit, providers=providers, settings=settings)
+        super().__init__(
+            return_unit=return_unit,
+            chain=chain,
+            providers=providers,
+            settings=settings,
+            cache=cache,
+            fallback_mode=fallback_mode,
+            hedge_delay=hedge_delay,
+            provider_ordering=provider_ordering,
+            scheduler=scheduler,
+            provider_options=provider_options,
+            breaker_failure_threshold=breaker_failure_threshold,
+            breaker_recovery_timeout=breaker_recovery_timeout,
+            http_client=http_client,
+            http_limits=http_limits,
+            http2=http2,
+            hooks=hooks,
+        )
+
+        self.single_flight: Optional[AsyncSingleFlight] = AsyncSingleFlight() if coalesce_requests else None
+
+        self._refresh_tasks: Set[asyncio.Future] = set()
 
     async def __aenter__(self):
         """Init http client and return self."""
-        self._http_client = self._init_http_client()
+        self.http_client
         return self
 
     async def __aexit__(self, *args):
-        if not self._http_client.is_closed:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close http client created by controller."""
+        if self._owns_http_client and self._http_client is not None and not self._http_client.is_closed:
             await self._http_client.aclose()
 
-    @staticmethod
-    def _init_http_client() -> AsyncClient:
-        return AsyncClient()
+    def _init_http_client(self) -> AsyncClient:
+        return AsyncClient(**self._http_client_options())
 
     def _init_provider(
         self,
         provider: Type[BaseGaspriceProvider],
     ) -> Any:
-        if not issubclass(provider, BaseAsyncAPIGaspriceProvider):
+        if not issubclass(provider, BaseAsyncGaspriceProvider):
             raise TypeError(
-                f"provider must be instance of {BaseAsyncAPIGaspriceProvider.__name__} and implement async functions"
+                f"provider must be instance of {BaseAsyncGaspriceProvider.__name__} and implement async functions"
             )
 
         return super()._init_provider(provider)
 
-    # TODO follow DRY, unify functions
+    async def _call_provider(
+        self, provider_instance: BaseAsyncGaspriceProvider, fees: bool = False
+    ) -> Tuple[bool, Dict]:
+        """Get gasprice or EIP-1559 fees from provider, unless its circuit breaker is open or quota is exhausted.
+
+        :param provider_instance: initialized provider
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        if fees and not provider_instance.supports_eip1559:
+            return False, provider_instance._fee_template
+
+        breaker = self.circuit_breakers[provider_instance.title]
+
+        # skip provider instead of sending request, which would be rejected, next provider or cache is used
+        if provider_instance.is_rate_limited():
+            self._on_provider_skipped(provider_instance.title, RequestOutcome.RATE_LIMITED)
+            return False, provider_instance._fee_template if fees else provider_instance._data_template
+
+        if not breaker.allow_request():
+            self._on_provider_skipped(provider_instance.title, RequestOutcome.CIRCUIT_OPEN)
+            return False, provider_instance._fee_template if fees else provider_instance._data_template
+
+        started_at = time.perf_counter()
+
+        with self._span("ethereum_gasprice.provider", provider=provider_instance.title, fees=fees):
+            response = await (provider_instance.get_fees() if fees else provider_instance.get_gasprice())
+
+        breaker.record(response[0])
+        self.scheduler.record(provider_instance.title, time.perf_counter() - started_at, response[0])
+        return response
+
+    async def _request_provider(
+        self, provider_instance: BaseAsyncGaspriceProvider, fees: bool = False
+    ) -> Tuple[bool, Dict]:
+        """Get gasprice or EIP-1559 fees from provider, joining request already in flight if there is one.
+
+        :param provider_instance: initialized provider
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        if self.single_flight is None:
+            return await self._call_provider(provider_instance, fees)
+
+        return await self.single_flight.do(
+            (type(provider_instance), fees), lambda: self._call_provider(provider_instance, fees)
+        )
+
+    async def _cache_call(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Call method of cache, in default executor if its store is shared, so network and file I/O of store
+        don't block event loop.
+
+        :param method: bound method of cache
+        :param args: method arguments
+        """
+        if not self.cache.shared:
+            return method(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def _refresh_cache(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            # value could be refreshed by another process sharing cache
+            if self.cache.shared:
+                lookup = await self._cache_call(self.cache.peek, key)
+
+                if lookup.status == CacheStatus.HIT:
+                    return
+
+            value = await fetch()
+            if self._is_valid_result(value):
+                await self._cache_call(self.cache.set, key, value)
+        finally:
+            await self._cache_call(self.cache.release_refresh, key)
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> CacheLookup:
+        value = await fetch()
+
+        if self._is_valid_result(value):
+            await self._cache_call(self.cache.set, key, value)
+            return self._fetched(value)
+
+        stale = await self._cache_call(self.cache.get_stale, key)
+
+        if stale is None:
+            return self._fetched(value)
+
+        self._on_cache_lookup(key, stale)
+        return stale
+
+    async def _fetch_as_leader(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> CacheLookup:
+        """Fetch value holding refresh lock of shared cache or wait for value fetched by another process.
+
+        Value is fetched without lock, if lock holder has not stored it in lock_timeout seconds.
+
+        :param key: cache key
+        :param fetch: coroutine function fetching result from providers
+        """
+        deadline = time.monotonic() + self.cache.lock_timeout
+
+        while not await self._cache_call(self.cache.claim_refresh, key):
+            if time.monotonic() >= deadline:
+                return await self._fetch_and_store(key, fetch)
+
+            await asyncio.sleep(self.cache.poll_interval)
+            lookup = await self._cache_call(self.cache.peek, key)
+
+            if lookup.status != CacheStatus.MISS:
+                return lookup
+
+        try:
+            lookup = await self._cache_call(self.cache.peek, key)
+
+            if lookup.status == CacheStatus.HIT:
+                return lookup
+
+            return await self._fetch_and_store(key, fetch)
+        finally:
+            await self._cache_call(self.cache.release_refresh, key)
+
+    async def _cached(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> CacheLookup:
+        """Return result from cache or fetch it from providers.
+
+        Stale value is returned immediately, while it is refreshed in background task.
+
+        :param key: cache key
+        :param fetch: coroutine function fetching result from providers
+        """
+        if self.cache is None:
+            return self._fetched(await fetch())
+
+        lookup = await self._cache_call(self.cache.lookup, key)
+        self._on_cache_lookup(key, lookup)
+
+        if lookup.status == CacheStatus.HIT:
+            return lookup
+        elif lookup.status == CacheStatus.STALE:
+            if await self._cache_call(self.cache.claim_refresh, key):
+                task = asyncio.ensure_future(self._refresh_cache(key, fetch))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return lookup
+
+        if self.cache.shared:
+            return await self._fetch_as_leader(key, fetch)
+
+        return await self._fetch_and_store(key, fetch)
+
     async def get_gasprice_by_strategy(
         self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
-    ) -> Optional[int]:
+    ) -> Optional[Gasprice]:
         """Get gasprice with chosen strategy from first available provider.
 
         :param strategy: strategy class or identifier (str)
         """
-        for provider in self.providers:
-            provider_instance = self._init_provider(provider)
-            status, gasprice_data = await provider_instance.get_gasprice()
-            if not status or gasprice_data.get(strategy) is None:
-                continue
-            else:
-                return self._convert_units(EthereumUnit.GWEI, self.return_unit, gasprice_data[strategy])
-
-        return None
+        return (await self.get_gasprice_by_strategy_with_age(strategy)).value
 
-    async def get_gasprices(self) -> Optional[Dict[GaspriceStrategy, Optional[int]]]:
-        """Get all gasprice strategies values from first available provider."""
-        for provider in self.providers:
-            provider_instance = self._init_provider(provider)
-            status, gasprice_data = await provider_instance.get_gasprice()
-            if not status:
-                continue
+    async def get_gasprice_by_strategy_with_age(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> CacheLookup:
+        """Get result of get_gasprice_by_strategy() with cache status and age in seconds of returned value.
 
-            for k, v in gasprice_data.items():
-                gasprice_data[k] = self._convert_units(EthereumUnit.GWEI, self.return_unit, v)
+        :param strategy: strategy class or identifier (str)
+        """
+        return await self._cached(
+            self._cache_key("gasprice_by_strategy", strategy), lambda: self._fetch_gasprice_by_strategy(strategy)
+        )
 
-            return gasprice_data
+    async def get_gasprices(self) -> Optional[GaspriceSnapshot]:
+        """Get all gasprice strategies values from first available provider."""
+        return (await self.get_gasprices_with_age()).value
 
-        return None
+    async def get_gasprices_with_age(self) -> CacheLookup:
+        """Get result of get_gasprices() with cache status and age in seconds of returned value."""
+        return await self._cached(self._cache_key("gasprices"), self._fetch_gasprices)
 
-    async def get_gasprice_from_all_sources(self) -> Dict[str, Dict[str, int]]:
+    async def get_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
         """Get all gasprices from all available providers.
 
         Uses asyncio.gather to speed up requests
@@ -98,18 +321,174 @@ class AsyncGaspriceController(GaspriceController):
         It is useful when you don't trust single provider and what to verify gasprice with other providers.
         It is a good pratice to calculate an average gasprice for every strategy and take the average gasprice value.
         """
+        return (await self.get_gasprice_from_all_sources_with_age()).value
+
+    async def get_gasprice_from_all_sources_with_age(self) -> CacheLookup:
+        """Get result of get_gasprice_from_all_sources() with cache status and age in seconds of returned value."""
+        return await self._cached(self._cache_key("gasprice_from_all_sources"), self._fetch_gasprice_from_all_sources)
+
+    async def get_fees_by_strategy(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> Optional[Eip1559Fee]:
+        """Get EIP-1559 fee suggestion with chosen strategy from first available provider supporting EIP-1559.
+
+        :param strategy: strategy class or identifier (str)
+        """
+        return (await self.get_fees_by_strategy_with_age(strategy)).value
+
+    async def get_fees_by_strategy_with_age(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> CacheLookup:
+        """Get result of get_fees_by_strategy() with cache status and age in seconds of returned value.
+
+        :param strategy: strategy class or identifier (str)
+        """
+        return await self._cached(
+            self._cache_key("fees_by_strategy", strategy), lambda: self._fetch_fees_by_strategy(strategy)
+        )
+
+    async def get_fees(self) -> Optional[Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions for all strategies from first available provider supporting EIP-1559."""
+        return (await self.get_fees_with_age()).value
+
+    async def get_fees_with_age(self) -> CacheLookup:
+        """Get result of get_fees() with cache status and age in seconds of returned value."""
+        return await self._cached(self._cache_key("fees"), self._fetch_fees)
+
+    async def get_aggregated_gasprices(self, aggregator: Optional[GaspriceAggregator] = None) -> AggregatedGasprice:
+        """Get consensus gasprices from all available providers.
+
+        :param aggregator: aggregation settings, median without outliers is used by default
+        """
+        return (aggregator or GaspriceAggregator()).aggregate(
+            await self.get_gasprice_from_all_sources(), self.return_unit
+        )
+
+    async def refresh_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
+        """Get all gasprices from all available providers bypassing cache and store them in cache.
+
+        With shared cache gasprices are fetched only if they are not fresh and no other process is fetching them,
+        otherwise value from cache is returned.
+        """
+        key = self._cache_key("gasprice_from_all_sources")
+
+        if self.cache is not None and self.cache.shared:
+            return (await self._fetch_as_leader(key, self._fetch_gasprice_from_all_sources)).value
+
+        data = await self._fetch_gasprice_from_all_sources()
+
+        if self.cache is not None and self._is_valid_result(data):
+            await self._cache_call(self.cache.set, key, data)
+
+        return data
+
+    async def _race_providers(
+        self, strategy: Optional[Union[GaspriceStrategy, str]] = None, fees: bool = False
+    ) -> Optional[Dict]:
+        """Request providers concurrently and return data from first valid response.
+
+        Next provider is requested when previous failed or has not answered in hedge_delay seconds.
+        Requests of losers are cancelled, shared request of single-flight is cancelled when it has no other waiters.
+
+        :param strategy: strategy class or identifier (str), which must be present in valid response
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        provider_instances = [self._init_provider(provider) for provider in self._ordered_providers()]
+        pending: Dict[asyncio.Future, int] = {}
+        next_index = 0
+
+        try:
+            while pending or next_index < len(provider_instances):
+                if next_index < len(provider_instances):
+                    task = asyncio.ensure_future(self._request_provider(provider_instances[next_index], fees))
+                    pending[task] = next_index
+                    next_index += 1
+
+                    if self.hedge_delay == 0:
+                        continue
+
+                timeout = self.hedge_delay if next_index < len(provider_instances) else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in sorted(done, key=pending.__getitem__):
+                    depth = pending.pop(task)
+                    response = task.result()
+                    if self._is_valid_response(response, strategy):
+                        self._on_fallback(fees, depth, True)
+                        return response[1]
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self._on_fallback(fees, len(provider_instances), False)
+        return None
+
+    async def _get_first_valid_gasprice_data(
+        self, strategy: Optional[Union[GaspriceStrategy, str]] = None, fees: bool = False
+    ) -> Optional[Dict]:
+        """Get gasprice or EIP-1559 fees data from first provider with valid response.
+
+        :param strategy: strategy class or identifier (str), which must be present in valid response
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        if self.fallback_mode == FallbackMode.RACE:
+            with self._span("ethereum_gasprice.race", fees=fees):
+                return await self._race_providers(strategy, fees)
+
+        with self._span("ethereum_gasprice.fallback", fees=fees):
+            for depth, provider in enumerate(self._ordered_providers()):
+                provider_instance = self._init_provider(provider)
+                response = await self._request_provider(provider_instance, fees)
+                if self._is_valid_response(response, strategy):
+                    self._on_fallback(fees, depth, True)
+                    return response[1]
+
+            self._on_fallback(fees, len(self.providers), False)
+
+        return None
+
+    async def _fetch_gasprice_by_strategy(self, strategy: Union[GaspriceStrategy, str]) -> Optional[Gasprice]:
+        gasprice_data = await self._get_first_valid_gasprice_data(strategy)
+
+        if gasprice_data is None:
+            return None
+
+        return self._convert_units(EthereumUnit.GWEI, self.return_unit, gasprice_data[strategy])
+
+    async def _fetch_gasprices(self) -> Optional[GaspriceSnapshot]:
+        gasprice_data = await self._get_first_valid_gasprice_data()
+
+        if gasprice_data is None:
+            return None
+
+        return self._convert_gasprice_data(gasprice_data)
+
+    async def _fetch_fees_by_strategy(self, strategy: Union[GaspriceStrategy, str]) -> Optional[Eip1559Fee]:
+        fee_data = await self._get_first_valid_gasprice_data(strategy, fees=True)
+
+        if fee_data is None:
+            return None
+
+        return self._convert_fee(fee_data[strategy])
+
+    async def _fetch_fees(self) -> Optional[Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        fee_data = await self._get_first_valid_gasprice_data(fees=True)
+
+        if fee_data is None:
+            return None
+
+        return self._convert_fee_data(fee_data)
+
+    async def _fetch_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
         data = {}
         providers = [self._init_provider(provider) for provider in self.providers]
-        results = await asyncio.gather(*[provider.get_gasprice() for provider in providers])
+        results = await asyncio.gather(*[self._request_provider(provider) for provider in providers])
 
         for result, provider in zip(results, providers):
             status, gasprice_data = result
             if not status:
                 continue
 
-            for k, v in gasprice_data.items():
-                gasprice_data[k] = self._convert_units(EthereumUnit.GWEI, self.return_unit, v)
-
-            data[provider.title] = gasprice_data
+            data[provider.title] = self._convert_gasprice_data(gasprice_data)
 
         return data
@@ -1,11 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Literal, Optional, Sequence, Type, Union
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, Type, Union
 
-from eth_utils import from_wei, to_wei
-from httpx import AsyncClient, Client
+from httpx import AsyncClient, Client, Limits
 
-from ethereum_gasprice.consts import EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.cache import CacheLookup, GaspriceCache
+from ethereum_gasprice.circuit_breaker import CircuitBreaker
+from ethereum_gasprice.consts import (
+    CacheStatus,
+    Chain,
+    CircuitState,
+    EthereumUnit,
+    FallbackMode,
+    GaspriceStrategy,
+    ProviderOrdering,
+    RequestOutcome,
+)
+from ethereum_gasprice.fees import Eip1559Fee, Gasprice, Number
+from ethereum_gasprice.hooks import GaspriceHooks
 from ethereum_gasprice.providers import BaseGaspriceProvider
+from ethereum_gasprice.scheduling import ProviderScheduler
+from ethereum_gasprice.snapshot import GaspriceSnapshot
+from ethereum_gasprice.units import convert, convert_many
 
 __all__ = ["BaseGaspriceController"]
 
@@ -15,25 +31,82 @@ class BaseGaspriceController(ABC):
         self,
         *,
         return_unit: Literal[EthereumUnit.WEI, EthereumUnit.GWEI] = EthereumUnit.WEI,
+        chain: Chain = Chain.ETHEREUM,
         providers: Sequence[Type[BaseGaspriceProvider]] = (),
-        settings: Optional[Dict[str, Optional[str]]] = None
+        settings: Optional[Dict[str, Optional[str]]] = None,
+        cache: Optional[GaspriceCache] = None,
+        fallback_mode: FallbackMode = FallbackMode.SEQUENTIAL,
+        hedge_delay: float = 0.5,
+        provider_ordering: ProviderOrdering = ProviderOrdering.FIXED,
+        scheduler: Optional[ProviderScheduler] = None,
+        provider_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        breaker_failure_threshold: int = 5,
+        breaker_recovery_timeout: float = 30.0,
+        http_client: Optional[Union[Client, AsyncClient]] = None,
+        http_limits: Optional[Limits] = None,
+        http2: bool = False,
+        hooks: Optional[GaspriceHooks] = None,
     ):
         """
         :param return_unit: ethereum unit, which
+        :param chain: chain of gasprices, all providers must support it
         :param providers: tuple of providers classes, which will be initialized and used in given order
         :param settings: Secrets for providers
+        :param cache: cache for results of controller methods, results are not cached if it is not passed
+        :param fallback_mode: how next provider is used when previous is slow or unavailable. In sequential mode
+            providers are requested one by one. In race mode next provider is requested if previous one
+            has not answered in hedge_delay seconds, first valid answer wins
+        :param hedge_delay: delay in seconds before requesting next provider in race mode, with 0 all providers are
+            requested at once
+        :param provider_ordering: order of providers in fallback chain. Fixed order is order of providers tuple,
+            in adaptive order the fastest healthy provider is tried first
+        :param scheduler: latency and success rate statistics of providers used in adaptive order
+        :param provider_options: extra options for providers (e.g. timeout, retries), key is provider title
+        :param breaker_failure_threshold: number of consecutive provider failures after which provider is skipped,
+            0 disables circuit breakers
+        :param breaker_recovery_timeout: time in seconds after which skipped provider is probed again
+        :param http_client: externally owned http client, it is shared by all providers and is not closed
+            by controller
+        :param http_limits: connection pool limits and keep-alive settings of http client created by controller
+        :param http2: enable HTTP/2 in http client created by controller, requires httpx[http2] extra
+        :param hooks: instrumentation hooks (metrics, tracing) of controller and its providers
         """
         self.return_unit: Literal[EthereumUnit.WEI, EthereumUnit.GWEI] = return_unit
+        self.chain: Chain = Chain(chain)
         self.providers: Sequence[Type[BaseGaspriceProvider]] = providers
+        self.cache: Optional[GaspriceCache] = cache
+        self.fallback_mode: FallbackMode = FallbackMode(fallback_mode)
+        self.hedge_delay: float = hedge_delay
+        self.provider_ordering: ProviderOrdering = ProviderOrdering(provider_ordering)
+        self.scheduler: ProviderScheduler = scheduler or ProviderScheduler()
+        self.provider_options: Dict[str, Dict[str, Any]] = provider_options or {}
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {
+            provider.title: CircuitBreaker(breaker_failure_threshold, breaker_recovery_timeout)
+            for provider in providers
+        }
 
-        self._http_client: Optional[Union[Client, AsyncClient]] = None
+        self.hooks: Optional[GaspriceHooks] = hooks
+        self.http_limits: Optional[Limits] = http_limits
+        self.http2: bool = http2
+
+        self._http_client: Optional[Union[Client, AsyncClient]] = http_client
+        self._owns_http_client: bool = http_client is None
+        self._provider_instances: Dict[Type[BaseGaspriceProvider], BaseGaspriceProvider] = {}
+        self._provider_instances_client: Optional[Union[Client, AsyncClient]] = None
 
         if len(self.providers) < 1:
             raise ValueError("providers priority tuple is empty")
 
+        unsupported = [provider.title for provider in self.providers if not provider.supports_chain(self.chain)]
+        if unsupported:
+            raise ValueError(f"providers {', '.join(unsupported)} do not support {self.chain.value} chain")
+
         if self.return_unit not in (EthereumUnit.WEI, EthereumUnit.GWEI):
             raise ValueError("invalid return unit")
 
+        if self.hedge_delay < 0:
+            raise ValueError("hedge delay must be non-negative")
+
         if not settings:
             self.settings = {provider.title: None for provider in providers}
         else:
@@ -55,55 +128,216 @@ class BaseGaspriceController(ABC):
     def _init_http_client(self):
         pass
 
+    def _http_client_options(self) -> Dict[str, Any]:
+        """Get options for http client created by controller."""
+        options: Dict[str, Any] = {}
+
+        if self.http_limits is not None:
+            options["limits"] = self.http_limits
+
+        if self.http2:
+            options["http2"] = True
+
+        return options
+
     @property
     def http_client(self):
-        if not self._http_client:
+        """Http client shared by all providers.
+
+        Client created by controller is reused between calls and recreated only after it was closed.
+        """
+        if self._http_client is None or (self._owns_http_client and self._http_client.is_closed):
             self._http_client = self._init_http_client()
 
         return self._http_client
 
+    def _ordered_providers(self) -> List[Type[BaseGaspriceProvider]]:
+        """Get providers in order of fallback chain."""
+        if self.provider_ordering == ProviderOrdering.ADAPTIVE:
+            return self.scheduler.order(self.providers)
+
+        return list(self.providers)
+
+    def _span(self, name: str, **attributes: Any) -> ContextManager:
+        """Trace span of hooks, it does nothing without hooks."""
+        return nullcontext() if self.hooks is None else self.hooks.span(name, attributes)
+
+    def _cache_key(self, method: str, *args: Any) -> Tuple:
+        """Cache key of controller method, it includes chain and return unit, so controllers with different
+        settings can share one cache store.
+
+        :param method: name of controller method, it is the first item of key
+        :param args: arguments of method
+        """
+        return (method, *args, self.chain, self.return_unit)
+
+    def _cache_keys(self) -> List[Tuple]:
+        """Cache keys of all results of controller methods."""
+        keys = [self._cache_key(method) for method in ("gasprices", "gasprice_from_all_sources", "fees")]
+        keys.extend(
+            self._cache_key(method, strategy)
+            for method in ("gasprice_by_strategy", "fees_by_strategy")
+            for strategy in GaspriceStrategy
+        )
+        return keys
+
+    def invalidate_cache(self, stored_before: Optional[float] = None) -> None:
+        """Remove cached results of controller, so the next call fetches them from providers.
+
+        Results of controllers with other chain or return unit sharing cache store are kept.
+
+        :param stored_before: remove only results stored before this time of cache clock
+        """
+        if self.cache is None:
+            return
+
+        for key in self._cache_keys():
+            self.cache.invalidate(key, stored_before=stored_before)
+
+    def _fetched(self, value: Any) -> CacheLookup:
+        """Result fetched from providers by current call, it has age only if it is valid."""
+        return CacheLookup(CacheStatus.MISS, value, 0.0 if self._is_valid_result(value) else None)
+
+    def _on_cache_lookup(self, key: Any, lookup: CacheLookup) -> None:
+        if self.hooks is not None:
+            # age of missing or expired value is not age of returned value
+            self.hooks.on_cache_lookup(key[0], lookup.status, lookup.age if lookup.status != CacheStatus.MISS else None)
+
+    def _on_provider_skipped(self, title: str, reason: RequestOutcome) -> None:
+        if self.hooks is not None:
+            self.hooks.on_provider_skipped(title, reason)
+
+    def _on_fallback(self, fees: bool, depth: int, success: bool) -> None:
+        if self.hooks is not None:
+            self.hooks.on_fallback("fees" if fees else "gasprice", depth, success)
+
+    @property
+    def breaker_states(self) -> Dict[str, CircuitState]:
+        """Circuit breaker states of providers, key is provider title."""
+        return {title: breaker.state for title, breaker in self.circuit_breakers.items()}
+
     def _init_provider(
         self,
         provider: Type[BaseGaspriceProvider],
     ) -> Any:
-        """Initialize provider class with secret (e.g. api key) and client.
+        """Initialize provider class with secret (e.g. api key), client and provider options.
+
+        Provider is initialized once per controller and reused until http client is changed.
 
         :param provider:
         """
-        return provider(secret=self.settings.get(provider.title), client=self.http_client)
+        http_client = self.http_client
+
+        if self._provider_instances_client is not http_client:
+            self._provider_instances = {}
+            self._provider_instances_client = http_client
+
+        provider_instance = self._provider_instances.get(provider)
+
+        if provider_instance is None:
+            provider_instance = provider(
+                secret=self.settings.get(provider.title),
+                client=http_client,
+                chain=self.chain,
+                hooks=self.hooks,
+                **self.provider_options.get(provider.title, {}),
+            )
+            self._provider_instances[provider] = provider_instance
+
+        return provider_instance
+
+    @staticmethod
+    def _is_valid_result(value: Any) -> bool:
+        """Check that controller method result contains any gasprice and can be cached.
+
+        :param value: result of controller method
+        """
+        if value is None:
+            return False
+        elif isinstance(value, Mapping):
+            return any(value.values())
+
+        return True
+
+    @staticmethod
+    def _is_valid_response(
+        response: Tuple[bool, Mapping[GaspriceStrategy, Optional[Number]]],
+        strategy: Optional[Union[GaspriceStrategy, str]] = None,
+    ) -> bool:
+        """Check that provider returned gasprice for chosen strategy or just succeeded if strategy is not passed.
+
+        :param response: status and gasprice data returned by provider
+        :param strategy: strategy class or identifier (str)
+        """
+        status, gasprice_data = response
+
+        if strategy is None:
+            return status
+
+        return status and gasprice_data.get(strategy) is not None
 
     @staticmethod
     def _convert_units(
-        unit_from: EthereumUnit = EthereumUnit.GWEI, unit_to: EthereumUnit = EthereumUnit.WEI, value: int = None
-    ) -> Optional[int]:
+        unit_from: EthereumUnit = EthereumUnit.GWEI,
+        unit_to: EthereumUnit = EthereumUnit.WEI,
+        value: Optional[Number] = None,
+    ) -> Optional[Gasprice]:
         """Convert gasprice from provider to chosen unit.
 
+        Conversion is exact, fractional gwei value is returned as Decimal.
+
         :param unit_from: Origin gasprice unit. Usually it is in gwei
         :param unit_to: Target gasprice unit
         :param value: Gasprice itselt
         """
-        if value is None:
+        return convert(value, unit_from, unit_to)
+
+    def _convert_gasprice_data(self, gasprice_data: Mapping[GaspriceStrategy, Optional[Number]]) -> GaspriceSnapshot:
+        """Convert all gasprices from provider to controller return unit.
+
+        Snapshot is immutable, so it is returned as is when no conversion is needed and can be shared between callers.
+
+        :param gasprice_data: gasprices in gwei, snapshot or dict of custom provider
+        """
+        if not isinstance(gasprice_data, GaspriceSnapshot):
+            gasprice_data = GaspriceSnapshot.from_mapping(gasprice_data)
+
+        return gasprice_data.convert(EthereumUnit.GWEI, self.return_unit)
+
+    def _convert_fee(self, fee: Optional[Eip1559Fee]) -> Optional[Eip1559Fee]:
+        """Convert EIP-1559 fee from provider to controller return unit.
+
+        :param fee: fee in gwei
+        """
+        if fee is None:
             return None
-        elif unit_from == unit_to:
-            return int(value)
-        elif unit_to == EthereumUnit.WEI:
-            return int(to_wei(value, unit_from))
-        else:
-            return int(from_wei(to_wei(value, unit_from), unit_to))
+
+        return Eip1559Fee(*convert_many(fee, EthereumUnit.GWEI, self.return_unit))
+
+    def _convert_fee_data(
+        self, fee_data: Dict[GaspriceStrategy, Optional[Eip1559Fee]]
+    ) -> Dict[GaspriceStrategy, Optional[Eip1559Fee]]:
+        """Convert all EIP-1559 fees from provider to controller return unit.
+
+        :param fee_data: fees in gwei
+        """
+        return {k: self._convert_fee(v) for k, v in fee_data.items()}
 
     @abstractmethod
-    def get_gasprice_by_strategy(self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST) -> Optional[int]:
+    def get_gasprice_by_strategy(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> Optional[Gasprice]:
         """Get gasprice with chosen strategy from first available provider.
 
         :param strategy: strategy class or identifier (str)
         """
 
     @abstractmethod
-    def get_gasprices(self) -> Optional[Dict[GaspriceStrategy, Optional[int]]]:
+    def get_gasprices(self) -> Optional[GaspriceSnapshot]:
         """Get all gasprice strategies values from first available provider."""
 
     @abstractmethod
-    def get_gasprice_from_all_sources(self) -> Dict[str, Dict[str, int]]:
+    def get_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
         """Get all gasprices from all available providers.
 
         It is useful when you don't trust single provider and what to
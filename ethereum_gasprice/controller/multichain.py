@@ -0,0 +1,328 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Type, Union
+
+from httpx import AsyncClient, Client, Limits
+
+from ethereum_gasprice.cache import GaspriceCache
+from ethereum_gasprice.consts import Chain, GaspriceStrategy
+from ethereum_gasprice.controller.async_wrapper import AsyncGaspriceController
+from ethereum_gasprice.controller.base import BaseGaspriceController
+from ethereum_gasprice.controller.sync_wrapper import GaspriceController
+from ethereum_gasprice.fees import Gasprice
+from ethereum_gasprice.logger import logger
+from ethereum_gasprice.providers import (
+    AsyncEtherchainProvider,
+    AsyncEtherscanProvider,
+    AsyncEthGasStationProvider,
+    EtherchainProvider,
+    EtherscanProvider,
+    EthGasStationProvider,
+)
+
+__all__ = ["BaseMultiChainController", "MultiChainGaspriceController", "AsyncMultiChainGaspriceController"]
+
+
+class BaseMultiChainController(ABC):
+    """Gasprices of several chains with one controller per chain and one http connection pool.
+
+    Every chain has its own providers, cache, provider ordering and circuit breakers, options of chain are keyword
+    arguments of its controller. Chain without providers uses default api providers supporting it.
+    """
+
+    controller_class: Type[BaseGaspriceController] = NotImplemented
+    #: api providers used for chains without configured providers
+    default_providers: tuple = ()
+
+    def __init__(
+        self,
+        chains: Mapping[Union[Chain, str], Mapping[str, Any]],
+        *,
+        cache_factory: Optional[Callable[[Chain], GaspriceCache]] = None,
+        http_client: Optional[Union[Client, AsyncClient]] = None,
+        http_limits: Optional[Limits] = None,
+        http2: bool = False,
+        **options: Any,
+    ):
+        """
+        :param chains: controller options of every chain, e.g. providers, settings, cache, provider_ordering
+        :param cache_factory: function creating cache of chain without configured cache, caches of chains must be
+            separate objects, they can share one store
+        :param http_client: externally owned http client, it is not closed by controller
+        :param http_limits: connection pool limits of http client created by controller, shared by all chains
+        :param http2: enable HTTP/2 in http client created by controller
+        :param options: controller options common for all chains, e.g. return_unit
+        """
+        if not chains:
+            raise ValueError("chains are empty")
+
+        self.http_limits: Optional[Limits] = http_limits
+        self.http2: bool = http2
+        self._http_client: Optional[Union[Client, AsyncClient]] = http_client
+        self._owns_http_client: bool = http_client is None
+
+        self.controllers: Dict[Chain, Any] = {}
+        caches = set()
+
+        for chain, chain_options in chains.items():
+            chain = Chain(chain)
+            kwargs = {**options, **chain_options}
+
+            if "providers" not in kwargs:
+                kwargs["providers"] = self._default_providers(chain)
+
+            if "cache" not in kwargs and cache_factory is not None:
+                kwargs["cache"] = cache_factory(chain)
+
+            if kwargs.get("cache") is not None:
+                if id(kwargs["cache"]) in caches:
+                    raise ValueError("every chain must have its own cache")
+                caches.add(id(kwargs["cache"]))
+
+            self.controllers[chain] = self.controller_class(chain=chain, http_client=self.http_client, **kwargs)
+
+    def _default_providers(self, chain: Chain) -> tuple:
+        providers = tuple(provider for provider in self.default_providers if provider.supports_chain(chain))
+
+        if not providers:
+            raise ValueError(f"there are no default providers of {chain.value} chain, pass providers of chain")
+
+        return providers
+
+    @abstractmethod
+    def _init_http_client(self) -> Union[Client, AsyncClient]:
+        pass
+
+    def _http_client_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {}
+
+        if self.http_limits is not None:
+            options["limits"] = self.http_limits
+
+        if self.http2:
+            options["http2"] = True
+
+        return options
+
+    @property
+    def http_client(self) -> Union[Client, AsyncClient]:
+        """Http client shared by controllers of all chains."""
+        if self._http_client is None:
+            self._http_client = self._init_http_client()
+
+        return self._http_client
+
+    @property
+    def chains(self) -> List[Chain]:
+        """Configured chains."""
+        return list(self.controllers)
+
+    def __getitem__(self, chain: Union[Chain, str]) -> Any:
+        """Get controller of chain."""
+        return self.controllers[Chain(chain)]
+
+    def _chains(self, chains: Optional[Iterable[Union[Chain, str]]]) -> Dict[Chain, Any]:
+        if chains is None:
+            return self.controllers
+
+        return {Chain(chain): self[chain] for chain in chains}
+
+    @abstractmethod
+    def _call(self, chains: Optional[Iterable[Union[Chain, str]]], method: str, *args: Any) -> Any:
+        """Call controller method of every chain concurrently. Result of failed chain is None.
+
+        :param chains: chains to request, all configured chains by default
+        :param method: name of controller method
+        :param args: arguments of method
+        """
+
+
+class MultiChainGaspriceController(BaseMultiChainController):
+    """Sync multi-chain controller, chains are requested concurrently in thread pool."""
+
+    controller_class = GaspriceController
+    default_providers = (EtherscanProvider, EthGasStationProvider, EtherchainProvider)
+
+    def __init__(self, chains: Mapping[Union[Chain, str], Mapping[str, Any]], **kwargs: Any):
+        """
+        :param chains: controller options of every chain
+        :param kwargs: see BaseMultiChainController
+        """
+        super().__init__(chains, **kwargs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _init_http_client(self) -> Client:
+        return Client(**self._http_client_options())
+
+    def close(self) -> None:
+        """Close controllers of chains, thread pool and http client created by controller."""
+        for controller in self.controllers.values():
+            controller.close()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        if self._owns_http_client and self._http_client is not None:
+            self._http_client.close()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for concurrent requests of chains."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self.controllers), thread_name_prefix="ethereum-gasprice-chain"
+            )
+
+        return self._executor
+
+    def _call(self, chains: Optional[Iterable[Union[Chain, str]]], method: str, *args: Any) -> Dict[Chain, Any]:
+        controllers = self._chains(chains)
+        futures = {
+            chain: self.executor.submit(getattr(controller, method), *args) for chain, controller in controllers.items()
+        }
+        results = {}
+
+        for chain, future in futures.items():
+            try:
+                results[chain] = future.result()
+            except Exception:
+                logger.exception("%s of %s chain failed", method, chain.value)
+                results[chain] = None
+
+        return results
+
+    def get_gasprice_by_strategy(
+        self,
+        strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST,
+        chains: Optional[Iterable[Union[Chain, str]]] = None,
+    ) -> Dict[Chain, Optional[Gasprice]]:
+        """Get gasprice of chosen strategy of every chain.
+
+        :param strategy: gasprice strategy
+        :param chains: chains to request, all configured chains by default
+        """
+        return self._call(chains, "get_gasprice_by_strategy", strategy)
+
+    def get_gasprices(self, chains: Optional[Iterable[Union[Chain, str]]] = None) -> Dict[Chain, Optional[Dict]]:
+        """Get gasprices of all strategies of every chain.
+
+        :param chains: chains to request, all configured chains by default
+        """
+        return self._call(chains, "get_gasprices")
+
+    def get_gasprice_from_all_sources(self, chains: Optional[Iterable[Union[Chain, str]]] = None) -> Dict[Chain, Dict]:
+        """Get gasprices from all providers of every chain.
+
+        :param chains: chains to request, all configured chains by default
+        """
+        return self._call(chains, "get_gasprice_from_all_sources")
+
+    def get_fees_by_strategy(
+        self,
+        strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST,
+        chains: Optional[Iterable[Union[Chain, str]]] = None,
+    ) -> Dict[Chain, Any]:
+        """Get EIP-1559 fee of chosen strategy of every chain.
+
+        :param strategy: gasprice strategy
+        :param chains: chains to request, all configured chains by default
+        """
+        return self._call(chains, "get_fees_by_strategy", strategy)
+
+    def get_fees(self, chains: Optional[Iterable[Union[Chain, str]]] = None) -> Dict[Chain, Optional[Dict]]:
+        """Get EIP-1559 fees of all strategies of every chain.
+
+        :param chains: chains to request, all configured chains by default
+        """
+        return self._call(chains, "get_fees")
+
+
+class AsyncMultiChainGaspriceController(BaseMultiChainController):
+    """Async multi-chain controller, chains are requested concurrently in one event loop."""
+
+    controller_class = AsyncGaspriceController
+    default_providers = (AsyncEtherscanProvider, AsyncEthGasStationProvider, AsyncEtherchainProvider)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    def _init_http_client(self) -> AsyncClient:
+        return AsyncClient(**self._http_client_options())
+
+    async def aclose(self) -> None:
+        """Close controllers of chains and http client created by controller."""
+        for controller in self.controllers.values():
+            await controller.aclose()
+
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+
+    async def _call(self, chains: Optional[Iterable[Union[Chain, str]]], method: str, *args: Any) -> Dict[Chain, Any]:
+        controllers = self._chains(chains)
+        results = await asyncio.gather(
+            *(getattr(controller, method)(*args) for controller in controllers.values()), return_exceptions=True
+        )
+
+        for chain, result in zip(controllers, results):
+            if isinstance(result, Exception):
+                logger.error("%s of %s chain failed", method, chain.value, exc_info=result)
+
+        return {chain: None if isinstance(result, Exception) else result for chain, result in zip(controllers, results)}
+
+    async def get_gasprice_by_strategy(
+        self,
+        strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST,
+        chains: Optional[Iterable[Union[Chain, str]]] = None,
+    ) -> Dict[Chain, Optional[Gasprice]]:
+        """Get gasprice of chosen strategy of every chain.
+
+        :param strategy: gasprice strategy
+        :param chains: chains to request, all configured chains by default
+        """
+        return await self._call(chains, "get_gasprice_by_strategy", strategy)
+
+    async def get_gasprices(self, chains: Optional[Iterable[Union[Chain, str]]] = None) -> Dict[Chain, Optional[Dict]]:
+        """Get gasprices of all strategies of every chain.
+
+        :param chains: chains to request, all configured chains by default
+        """
+        return await self._call(chains, "get_gasprices")
+
+    async def get_gasprice_from_all_sources(
+        self, chains: Optional[Iterable[Union[Chain, str]]] = None
+    ) -> Dict[Chain, Dict]:
+        """Get gasprices from all providers of every chain.
+
+        :param chains: chains to request, all configured chains by default
+        """
+        return await self._call(chains, "get_gasprice_from_all_sources")
+
+    async def get_fees_by_strategy(
+        self,
+        strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST,
+        chains: Optional[Iterable[Union[Chain, str]]] = None,
+    ) -> Dict[Chain, Any]:
+        """Get EIP-1559 fee of chosen strategy of every chain.
+
+        :param strategy: gasprice strategy
+        :param chains: chains to request, all configured chains by default
+        """
+        return await self._call(chains, "get_fees_by_strategy", strategy)
+
+    async def get_fees(self, chains: Optional[Iterable[Union[Chain, str]]] = None) -> Dict[Chain, Optional[Dict]]:
+        """Get EIP-1559 fees of all strategies of every chain.
+
+        :param chains: chains to request, all configured chains by default
+        """
+        return await self._call(chains, "get_fees")
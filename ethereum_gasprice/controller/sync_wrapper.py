@@ -1,10 +1,29 @@
-from typing import Dict, Literal, Optional, Sequence, Type, Union
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Literal, Mapping, Optional, Sequence, Tuple, Type, Union
 
-from httpx import Client
+from httpx import Client, Limits
 
-from ethereum_gasprice.consts import EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.aggregation import AggregatedGasprice, GaspriceAggregator
+from ethereum_gasprice.cache import CacheLookup, GaspriceCache
+from ethereum_gasprice.consts import (
+    CacheStatus,
+    Chain,
+    EthereumUnit,
+    FallbackMode,
+    FanOutMode,
+    GaspriceStrategy,
+    ProviderOrdering,
+    RequestOutcome,
+)
+from ethereum_gasprice.fees import Eip1559Fee, Gasprice
+from ethereum_gasprice.hooks import GaspriceHooks
 from ethereum_gasprice.providers import EtherchainProvider, EtherscanProvider, EthGasStationProvider
-from ethereum_gasprice.providers.base import BaseGaspriceProvider
+from ethereum_gasprice.providers.base import BaseGaspriceProvider, BaseSyncAPIGaspriceProvider
+from ethereum_gasprice.scheduling import ProviderScheduler
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 from .base import BaseGaspriceController
 
@@ -18,85 +37,459 @@ class GaspriceController(BaseGaspriceController):
         self,
         *,
         return_unit: Literal[EthereumUnit.WEI, EthereumUnit.GWEI] = EthereumUnit.WEI,
+        chain: Chain = Chain.ETHEREUM,
         providers: Sequence[Type[BaseGaspriceProvider]] = (
             EtherscanProvider,
             EthGasStationProvider,
             EtherchainProvider,
         ),
-        settings: Optional[Dict[str, Optional[str]]] = None
+        settings: Optional[Dict[str, Optional[str]]] = None,
+        cache: Optional[GaspriceCache] = None,
+        fallback_mode: FallbackMode = FallbackMode.SEQUENTIAL,
+        hedge_delay: float = 0.5,
+        provider_ordering: ProviderOrdering = ProviderOrdering.FIXED,
+        scheduler: Optional[ProviderScheduler] = None,
+        max_workers: Optional[int] = None,
+        fan_out_mode: FanOutMode = FanOutMode.SEQUENTIAL,
+        fan_out_timeout: Optional[float] = None,
+        provider_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        breaker_failure_threshold: int = 5,
+        breaker_recovery_timeout: float = 30.0,
+        http_client: Optional[Client] = None,
+        http_limits: Optional[Limits] = None,
+        http2: bool = False,
+        hooks: Optional[GaspriceHooks] = None
     ):
         """
         :param return_unit: type of return value
+        :param chain: chain of gasprices, all providers must support it
         :param providers: gasprice provider class
         :param settings: controller settings
+        :param cache: cache for controller results
+        :param fallback_mode: sequential or race provider fallback
+        :param hedge_delay: delay in seconds before requesting next provider in race mode
+        :param provider_ordering: fixed order of providers or adaptive order by their latency and success rate
+        :param scheduler: latency and success rate statistics of providers used in adaptive order
+        :param max_workers: size of thread pool used for concurrent requests to providers
+        :param fan_out_mode: request all providers one by one or concurrently in thread pool
+        :param fan_out_timeout: deadline in seconds of concurrent request to all providers, providers which have not
+            answered in time are returned with empty data
+        :param provider_options: extra options for providers (e.g. timeout, retries), key is provider title
+        :param breaker_failure_threshold: number of consecutive provider failures to skip provider
+        :param breaker_recovery_timeout: time in seconds after which skipped provider is probed again
+        :param http_client: externally owned http client, it is not closed by controller
+        :param http_limits: connection pool limits and keep-alive settings of http client created by controller
+        :param http2: enable HTTP/2 in http client created by controller
+        :param hooks: instrumentation hooks (metrics, tracing) of controller and its providers
         """
-        super().__init__(return_unit=return_unit, providers=providers, settings=settings)
+        super().__init__(
+            return_unit=return_unit,
+            chain=chain,
+            providers=providers,
+            settings=settings,
+            cache=cache,
+            fallback_mode=fallback_mode,
+            hedge_delay=hedge_delay,
+            provider_ordering=provider_ordering,
+            scheduler=scheduler,
+            provider_options=provider_options,
+            breaker_failure_threshold=breaker_failure_threshold,
+            breaker_recovery_timeout=breaker_recovery_timeout,
+            http_client=http_client,
+            http_limits=http_limits,
+            http2=http2,
+            hooks=hooks,
+        )
+
+        self.max_workers: int = max_workers or len(self.providers)
+        self.fan_out_mode: FanOutMode = FanOutMode(fan_out_mode)
+        self.fan_out_timeout: Optional[float] = fan_out_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def __enter__(self):
         """Init http client and return self."""
-        self._http_client = self._init_http_client()
+        self.http_client
         return self
 
     def __exit__(self, *args):
-        if not self._http_client.is_closed:
+        self.close()
+
+    def close(self) -> None:
+        """Close http client created by controller and thread pool."""
+        if self._owns_http_client and self._http_client is not None and not self._http_client.is_closed:
             self._http_client.close()
 
-    @staticmethod
-    def _init_http_client() -> Client:
-        return Client()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
-    # TODO follow DRY, unify functions
-    def get_gasprice_by_strategy(self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST) -> Optional[int]:
-        """Get gasprice with chosen strategy from first available provider.
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for concurrent requests to providers."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ethereum-gasprice")
 
-        :param strategy: strategy class or identifier (str)
+        return self._executor
+
+    def _init_http_client(self) -> Client:
+        return Client(**self._http_client_options())
+
+    def _call_provider(self, provider_instance: BaseSyncAPIGaspriceProvider, fees: bool = False) -> Tuple[bool, Dict]:
+        """Get gasprice or EIP-1559 fees from provider, unless its circuit breaker is open or quota is exhausted.
+
+        :param provider_instance: initialized provider
+        :param fees: get EIP-1559 fees instead of legacy gasprice
         """
-        for provider in self.providers:
-            provider_instance = self._init_provider(provider)
-            status, gasprice_data = provider_instance.get_gasprice()
-            if not status or gasprice_data.get(strategy) is None:
-                continue
-            else:
-                return self._convert_units(EthereumUnit.GWEI, self.return_unit, gasprice_data[strategy])
+        if fees and not provider_instance.supports_eip1559:
+            return False, provider_instance._fee_template
 
-        return None
+        breaker = self.circuit_breakers[provider_instance.title]
 
-    def get_gasprices(self) -> Optional[Dict[GaspriceStrategy, Optional[int]]]:
-        """Get all gasprice strategies values from first available provider."""
-        for provider in self.providers:
-            provider_instance = self._init_provider(provider)
-            status, gasprice_data = provider_instance.get_gasprice()
+        # skip provider instead of sending request, which would be rejected, next provider or cache is used
+        if provider_instance.is_rate_limited():
+            self._on_provider_skipped(provider_instance.title, RequestOutcome.RATE_LIMITED)
+            return False, provider_instance._fee_template if fees else provider_instance._data_template
 
-            if not status:
-                return gasprice_data
+        if not breaker.allow_request():
+            self._on_provider_skipped(provider_instance.title, RequestOutcome.CIRCUIT_OPEN)
+            return False, provider_instance._fee_template if fees else provider_instance._data_template
 
-            for k, v in gasprice_data.items():
-                gasprice_data[k] = self._convert_units(EthereumUnit.GWEI, self.return_unit, v)
+        started_at = time.perf_counter()
 
-            return gasprice_data
+        with self._span("ethereum_gasprice.provider", provider=provider_instance.title, fees=fees):
+            response = provider_instance.get_fees() if fees else provider_instance.get_gasprice()
 
-        return None
+        breaker.record(response[0])
+        self.scheduler.record(provider_instance.title, time.perf_counter() - started_at, response[0])
+        return response
+
+    def _request_provider(
+        self, provider_instance: BaseSyncAPIGaspriceProvider, fees: bool = False
+    ) -> Tuple[bool, Dict]:
+        """Get gasprice or EIP-1559 fees from provider.
+
+        :param provider_instance: initialized provider
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        return self._call_provider(provider_instance, fees)
+
+    def _refresh_cache(self, key: Hashable, fetch: Callable[[], Any]) -> None:
+        try:
+            # value could be refreshed by another process sharing cache
+            if self.cache.shared and self.cache.peek(key).status == CacheStatus.HIT:
+                return
+
+            value = fetch()
+            if self._is_valid_result(value):
+                self.cache.set(key, value)
+        finally:
+            self.cache.release_refresh(key)
+
+    def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Any]) -> CacheLookup:
+        value = fetch()
+
+        if self._is_valid_result(value):
+            self.cache.set(key, value)
+            return self._fetched(value)
+
+        stale = self.cache.get_stale(key)
+
+        if stale is None:
+            return self._fetched(value)
+
+        self._on_cache_lookup(key, stale)
+        return stale
+
+    def _fetch_as_leader(self, key: Hashable, fetch: Callable[[], Any]) -> CacheLookup:
+        """Fetch value holding refresh lock of shared cache or wait for value fetched by another process.
+
+        Value is fetched without lock, if lock holder has not stored it in lock_timeout seconds.
+
+        :param key: cache key
+        :param fetch: function fetching result from providers
+        """
+        deadline = time.monotonic() + self.cache.lock_timeout
+
+        while not self.cache.claim_refresh(key):
+            if time.monotonic() >= deadline:
+                return self._fetch_and_store(key, fetch)
+
+            time.sleep(self.cache.poll_interval)
+            lookup = self.cache.peek(key)
+
+            if lookup.status != CacheStatus.MISS:
+                return lookup
 
-    def get_gasprice_from_all_sources(self) -> Dict[str, Dict[str, int]]:
+        try:
+            lookup = self.cache.peek(key)
+
+            if lookup.status == CacheStatus.HIT:
+                return lookup
+
+            return self._fetch_and_store(key, fetch)
+        finally:
+            self.cache.release_refresh(key)
+
+    def _cached(self, key: Hashable, fetch: Callable[[], Any]) -> CacheLookup:
+        """Return result from cache or fetch it from providers.
+
+        Stale value is returned immediately, while it is refreshed in background thread.
+
+        :param key: cache key
+        :param fetch: function fetching result from providers
+        """
+        if self.cache is None:
+            return self._fetched(fetch())
+
+        lookup = self.cache.lookup(key)
+        self._on_cache_lookup(key, lookup)
+
+        if lookup.status == CacheStatus.HIT:
+            return lookup
+        elif lookup.status == CacheStatus.STALE:
+            if self.cache.claim_refresh(key):
+                threading.Thread(target=self._refresh_cache, args=(key, fetch), daemon=True).start()
+            return lookup
+
+        if self.cache.shared:
+            return self._fetch_as_leader(key, fetch)
+
+        return self._fetch_and_store(key, fetch)
+
+    def get_gasprice_by_strategy(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> Optional[Gasprice]:
+        """Get gasprice with chosen strategy from first available provider.
+
+        :param strategy: strategy class or identifier (str)
+        """
+        return (self.get_gasprice_by_strategy_with_age(strategy)).value
+
+    def get_gasprice_by_strategy_with_age(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> CacheLookup:
+        """Get result of get_gasprice_by_strategy() with cache status and age in seconds of returned value.
+
+        :param strategy: strategy class or identifier (str)
+        """
+        return self._cached(
+            self._cache_key("gasprice_by_strategy", strategy), lambda: self._fetch_gasprice_by_strategy(strategy)
+        )
+
+    def get_gasprices(self) -> Optional[GaspriceSnapshot]:
+        """Get all gasprice strategies values from first available provider."""
+        return (self.get_gasprices_with_age()).value
+
+    def get_gasprices_with_age(self) -> CacheLookup:
+        """Get result of get_gasprices() with cache status and age in seconds of returned value."""
+        return self._cached(self._cache_key("gasprices"), self._fetch_gasprices)
+
+    def get_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
         """Get all gasprices from all available providers.
 
+        Providers are requested concurrently in thread pool with FanOutMode.CONCURRENT.
+
         It is useful when you don't trust single provider and what to
         verify gasprice with other providers. It is a good pratice to
         calculate an average gasprice for every strategy and take the
         average gasprice value.
         """
-        data: Dict[str, Dict[str, int]] = {}
+        return (self.get_gasprice_from_all_sources_with_age()).value
+
+    def get_gasprice_from_all_sources_with_age(self) -> CacheLookup:
+        """Get result of get_gasprice_from_all_sources() with cache status and age in seconds of returned value."""
+        return self._cached(self._cache_key("gasprice_from_all_sources"), self._fetch_gasprice_from_all_sources)
+
+    def get_fees_by_strategy(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> Optional[Eip1559Fee]:
+        """Get EIP-1559 fee suggestion with chosen strategy from first available provider supporting EIP-1559.
+
+        :param strategy: strategy class or identifier (str)
+        """
+        return (self.get_fees_by_strategy_with_age(strategy)).value
+
+    def get_fees_by_strategy_with_age(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST
+    ) -> CacheLookup:
+        """Get result of get_fees_by_strategy() with cache status and age in seconds of returned value.
+
+        :param strategy: strategy class or identifier (str)
+        """
+        return self._cached(
+            self._cache_key("fees_by_strategy", strategy), lambda: self._fetch_fees_by_strategy(strategy)
+        )
+
+    def get_fees(self) -> Optional[Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions for all strategies from first available provider supporting EIP-1559."""
+        return (self.get_fees_with_age()).value
+
+    def get_fees_with_age(self) -> CacheLookup:
+        """Get result of get_fees() with cache status and age in seconds of returned value."""
+        return self._cached(self._cache_key("fees"), self._fetch_fees)
+
+    def get_aggregated_gasprices(self, aggregator: Optional[GaspriceAggregator] = None) -> AggregatedGasprice:
+        """Get consensus gasprices from all available providers.
+
+        :param aggregator: aggregation settings, median without outliers is used by default
+        """
+        return (aggregator or GaspriceAggregator()).aggregate(self.get_gasprice_from_all_sources(), self.return_unit)
+
+    def refresh_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
+        """Get all gasprices from all available providers bypassing cache and store them in cache.
+
+        With shared cache gasprices are fetched only if they are not fresh and no other process is fetching them,
+        otherwise value from cache is returned.
+        """
+        key = self._cache_key("gasprice_from_all_sources")
+
+        if self.cache is not None and self.cache.shared:
+            return (self._fetch_as_leader(key, self._fetch_gasprice_from_all_sources)).value
+
+        data = self._fetch_gasprice_from_all_sources()
+
+        if self.cache is not None and self._is_valid_result(data):
+            self.cache.set(key, data)
+
+        return data
+
+    def _race_providers(
+        self, strategy: Optional[Union[GaspriceStrategy, str]] = None, fees: bool = False
+    ) -> Optional[Dict]:
+        """Request providers in parallel threads and return data from first valid response.
+
+        Next provider is requested when previous failed or has not answered in hedge_delay seconds.
+        Requests of losers can't be interrupted in thread, so their results are just ignored.
+
+        :param strategy: strategy class or identifier (str), which must be present in valid response
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        provider_instances = [self._init_provider(provider) for provider in self._ordered_providers()]
+        pending: Dict[Future, int] = {}
+        next_index = 0
+
+        try:
+            while pending or next_index < len(provider_instances):
+                if next_index < len(provider_instances):
+                    future = self.executor.submit(
+                        contextvars.copy_context().run, self._request_provider, provider_instances[next_index], fees
+                    )
+                    pending[future] = next_index
+                    next_index += 1
+
+                    if self.hedge_delay == 0:
+                        continue
+
+                timeout = self.hedge_delay if next_index < len(provider_instances) else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in sorted(done, key=pending.__getitem__):
+                    depth = pending.pop(future)
+                    response = future.result()
+                    if self._is_valid_response(response, strategy):
+                        self._on_fallback(fees, depth, True)
+                        return response[1]
+        finally:
+            for future in pending:
+                future.cancel()
+
+        self._on_fallback(fees, len(provider_instances), False)
+        return None
+
+    def _get_first_valid_gasprice_data(
+        self, strategy: Optional[Union[GaspriceStrategy, str]] = None, fees: bool = False
+    ) -> Optional[Dict]:
+        """Get gasprice or EIP-1559 fees data from first provider with valid response.
+
+        :param strategy: strategy class or identifier (str), which must be present in valid response
+        :param fees: get EIP-1559 fees instead of legacy gasprice
+        """
+        if self.fallback_mode == FallbackMode.RACE:
+            with self._span("ethereum_gasprice.race", fees=fees):
+                return self._race_providers(strategy, fees)
+
+        with self._span("ethereum_gasprice.fallback", fees=fees):
+            for depth, provider in enumerate(self._ordered_providers()):
+                provider_instance = self._init_provider(provider)
+                response = self._request_provider(provider_instance, fees)
+                if self._is_valid_response(response, strategy):
+                    self._on_fallback(fees, depth, True)
+                    return response[1]
+
+            self._on_fallback(fees, len(self.providers), False)
+
+        return None
+
+    def _fetch_gasprice_by_strategy(self, strategy: Union[GaspriceStrategy, str]) -> Optional[Gasprice]:
+        gasprice_data = self._get_first_valid_gasprice_data(strategy)
+
+        if gasprice_data is None:
+            return None
+
+        return self._convert_units(EthereumUnit.GWEI, self.return_unit, gasprice_data[strategy])
+
+    def _fetch_gasprices(self) -> Optional[GaspriceSnapshot]:
+        gasprice_data = self._get_first_valid_gasprice_data()
+
+        if gasprice_data is None:
+            return None
+
+        return self._convert_gasprice_data(gasprice_data)
+
+    def _fetch_fees_by_strategy(self, strategy: Union[GaspriceStrategy, str]) -> Optional[Eip1559Fee]:
+        fee_data = self._get_first_valid_gasprice_data(strategy, fees=True)
+
+        if fee_data is None:
+            return None
+
+        return self._convert_fee(fee_data[strategy])
+
+    def _fetch_fees(self) -> Optional[Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        fee_data = self._get_first_valid_gasprice_data(fees=True)
+
+        if fee_data is None:
+            return None
+
+        return self._convert_fee_data(fee_data)
+
+    def _request_all_providers(
+        self, provider_instances: Sequence[BaseSyncAPIGaspriceProvider]
+    ) -> Sequence[Tuple[bool, Dict]]:
+        """Request all providers in thread pool.
+
+        Providers which have not answered before fan_out_timeout are considered failed, their threads are not
+        interrupted and results are ignored.
+
+        :param provider_instances: initialized providers
+        """
+        # copy context, so trace spans of providers are children of current span
+        futures = [
+            self.executor.submit(contextvars.copy_context().run, self._request_provider, instance)
+            for instance in provider_instances
+        ]
+        wait(futures, timeout=self.fan_out_timeout)
+
+        responses = []
+
+        for future, instance in zip(futures, provider_instances):
+            if future.done() and not future.cancelled() and future.exception() is None:
+                responses.append(future.result())
+            else:
+                future.cancel()
+                responses.append((False, instance._data_template))
+
+        return responses
 
-        for provider in self.providers:
-            data[provider.title] = {}
-            provider_instance = self._init_provider(provider)
-            status, gasprice_data = provider_instance.get_gasprice()
-            if not status:
-                continue
+    def _fetch_gasprice_from_all_sources(self) -> Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]:
+        data: Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]] = {}
+        provider_instances = [self._init_provider(provider) for provider in self.providers]
 
-            for k, v in gasprice_data.items():
-                gasprice_data[k] = self._convert_units(EthereumUnit.GWEI, self.return_unit, v)
+        if self.fan_out_mode == FanOutMode.CONCURRENT:
+            responses = self._request_all_providers(provider_instances)
+        else:
+            responses = [self._request_provider(provider_instance) for provider_instance in provider_instances]
 
-            data[provider.title] = gasprice_data
+        for provider_instance, (status, gasprice_data) in zip(provider_instances, responses):
+            data[provider_instance.title] = self._convert_gasprice_data(gasprice_data) if status else {}
 
         return data
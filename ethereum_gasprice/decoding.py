@@ -0,0 +1,100 @@
+import json
+import threading
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from ethereum_gasprice.consts import JsonBackend
+
+__all__ = ["JsonScalar", "available_backends", "ResponseDecoder", "get_decoder"]
+
+#: type of gasprice field in api response: number, numeric string or null
+JsonScalar = Optional[Union[int, float, str]]
+
+ResponseSchema = Mapping[str, Any]
+
+
+def available_backends() -> Tuple[JsonBackend, ...]:
+    """Get installed json backends, the fastest first. Backends are not imported."""
+    return tuple(
+        backend for backend in JsonBackend if backend == JsonBackend.STDLIB or find_spec(backend.value) is not None
+    )
+
+
+class ResponseDecoder:
+    """Decoder of json body of api response.
+
+    With msgspec body is decoded into struct of schema fields: other fields, e.g. ``gasPriceRange`` table of
+    EthGasStation, are skipped by parser without creating python objects, and types of fields are validated.
+    orjson and stdlib json decode whole body. Invalid body raises ValueError with every backend.
+    """
+
+    def __init__(self, schema: Optional[ResponseSchema] = None, backend: Optional[JsonBackend] = None):
+        """
+        :param schema: types of top-level fields used by provider, all fields are decoded if it is not passed
+        :param backend: json backend, the fastest installed by default
+        """
+        self.schema: Optional[Dict[str, Any]] = dict(schema) if schema else None
+        self.backend: JsonBackend = JsonBackend(backend) if backend is not None else available_backends()[0]
+        self._decode: Callable[[bytes], Any] = self._init_decode()
+
+    def __repr__(self):
+        fields = ", ".join(self.schema) if self.schema else "*"
+        return f"<ResponseDecoder backend={self.backend.value} fields={fields}>"
+
+    def _init_decode(self) -> Callable[[bytes], Any]:
+        if self.backend == JsonBackend.STDLIB:
+            return json.loads
+        elif self.backend == JsonBackend.ORJSON:
+            return import_module("orjson").loads
+
+        msgspec = import_module("msgspec")
+
+        if self.schema is None:
+            decoder = msgspec.json.Decoder()
+            fields: Tuple[str, ...] = ()
+        else:
+            # missing fields are None, as with dict.get of fully decoded body
+            struct = msgspec.defstruct(
+                "ResponseFields", [(field, field_type, None) for field, field_type in self.schema.items()]
+            )
+            decoder = msgspec.json.Decoder(struct)
+            fields = tuple(self.schema)
+
+        def decode(content: bytes) -> Any:
+            try:
+                data = decoder.decode(content)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+            return {field: getattr(data, field) for field in fields} if fields else data
+
+        return decode
+
+    def decode(self, content: Union[bytes, str]) -> Any:
+        """Decode response body.
+
+        :param content: raw body of response
+        """
+        return self._decode(content)
+
+
+_decoders: Dict[Tuple[Optional[Tuple[Tuple[str, Any], ...]], Optional[JsonBackend]], ResponseDecoder] = {}
+_decoders_lock = threading.Lock()
+
+
+def get_decoder(schema: Optional[ResponseSchema] = None, backend: Optional[JsonBackend] = None) -> ResponseDecoder:
+    """Get decoder shared by all providers with the same response schema in current process.
+
+    :param schema: types of top-level fields used by provider
+    :param backend: json backend, the fastest installed by default
+    """
+    key = (tuple(schema.items()) if schema else None, JsonBackend(backend) if backend is not None else None)
+
+    with _decoders_lock:
+        decoder = _decoders.get(key)
+
+        if decoder is None:
+            decoder = _decoders[key] = ResponseDecoder(schema, backend)
+
+        return decoder
@@ -0,0 +1,147 @@
+from collections import deque
+from decimal import Decimal
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence
+
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.fees import Eip1559Fee
+
+__all__ = ["FeeHistoryEstimator"]
+
+#: function making JSON-RPC request, e.g. ``web3.provider.make_request``, may be coroutine function
+MakeRequest = Callable[[str, List[Any]], Any]
+
+GWEI = Decimal(10**9)
+
+
+class FeeHistoryEstimator:
+    """Fee estimator based on ``eth_feeHistory`` of own node.
+
+    Estimator keeps priority fee percentiles of last ``block_count`` blocks. On every update only blocks mined since
+    previous update are requested, old blocks are dropped from the window with their contribution to running sums,
+    so estimate is recalculated in constant time.
+    """
+
+    def __init__(
+        self,
+        make_request: MakeRequest,
+        *,
+        block_count: int = 20,
+        percentiles: Optional[Mapping[GaspriceStrategy, float]] = None,
+        base_fee_multiplier: int = 2,
+    ):
+        """
+        :param make_request: function making JSON-RPC request to node
+        :param block_count: number of blocks in window
+        :param percentiles: priority fee percentile of every strategy
+        :param base_fee_multiplier: multiplier of base fee in max fee
+        """
+        if not 1 <= block_count <= 1024:
+            raise ValueError("block count must be in [1, 1024]")
+
+        self.make_request: MakeRequest = make_request
+        self.block_count: int = block_count
+        self.percentiles: Mapping[GaspriceStrategy, float] = percentiles or {
+            GaspriceStrategy.SLOW: 10,
+            GaspriceStrategy.REGULAR: 30,
+            GaspriceStrategy.FAST: 60,
+            GaspriceStrategy.FASTEST: 90,
+        }
+        self.base_fee_multiplier: int = base_fee_multiplier
+
+        self.last_block: Optional[int] = None
+        self.next_base_fee: Optional[int] = None
+
+        # node requires percentiles in increasing order, rewards are returned in the same order
+        self._strategies: Sequence[GaspriceStrategy] = tuple(sorted(self.percentiles, key=self.percentiles.__getitem__))
+        self._rewards: Deque[List[int]] = deque()
+        self._reward_sums: List[int] = [0] * len(self._strategies)
+
+    @staticmethod
+    def _result(method: str, response: Mapping[str, Any]) -> Any:
+        if response.get("error") or "result" not in response:
+            raise ValueError(f"{method} failed: {response.get('error')}")
+
+        return response["result"]
+
+    def _call(self, method: str, params: List[Any]) -> Any:
+        return self._result(method, self.make_request(method, params))
+
+    async def _acall(self, method: str, params: List[Any]) -> Any:
+        return self._result(method, await self.make_request(method, params))
+
+    def reset(self) -> None:
+        """Drop window, next update fetches full history."""
+        self.last_block = None
+        self.next_base_fee = None
+        self._rewards.clear()
+        self._reward_sums = [0] * len(self._strategies)
+
+    def _push(self, rewards: List[int]) -> None:
+        self._rewards.append(rewards)
+        self._reward_sums = [total + reward for total, reward in zip(self._reward_sums, rewards)]
+
+        if len(self._rewards) > self.block_count:
+            dropped = self._rewards.popleft()
+            self._reward_sums = [total - reward for total, reward in zip(self._reward_sums, dropped)]
+
+    def _history_params(self, latest: int) -> Optional[List[Any]]:
+        """Get ``eth_feeHistory`` params for blocks mined since previous update, None if there are no new blocks.
+
+        :param latest: number of latest block
+        """
+        if self.last_block is not None and latest < self.last_block:
+            # node switched to another chain head, window is not valid anymore
+            self.reset()
+
+        if self.last_block == latest:
+            return None
+
+        count = self.block_count if self.last_block is None else min(latest - self.last_block, self.block_count)
+        return [hex(count), hex(latest), [self.percentiles[s] for s in self._strategies]]
+
+    def _apply(self, latest: int, history: Mapping[str, Any]) -> None:
+        for block_rewards in history.get("reward") or []:
+            self._push([int(reward, 16) for reward in block_rewards])
+
+        # base fee list contains one more item - base fee of next block
+        self.next_base_fee = int(history["baseFeePerGas"][-1], 16)
+        self.last_block = latest
+
+    def update(self) -> bool:
+        """Fetch blocks mined since previous update. Returns True if window was changed."""
+        latest = int(self._call("eth_blockNumber", []), 16)
+        params = self._history_params(latest)
+
+        if params is None:
+            return False
+
+        self._apply(latest, self._call("eth_feeHistory", params))
+        return True
+
+    async def aupdate(self) -> bool:
+        """Async version of update, ``make_request`` must be coroutine function."""
+        latest = int(await self._acall("eth_blockNumber", []), 16)
+        params = self._history_params(latest)
+
+        if params is None:
+            return False
+
+        self._apply(latest, await self._acall("eth_feeHistory", params))
+        return True
+
+    def estimate(self) -> Dict[GaspriceStrategy, Optional[Eip1559Fee]]:
+        """Get EIP-1559 fee suggestions in gwei from current window.
+
+        Priority fee of strategy is an average of its percentile over blocks in window.
+        """
+        if self.next_base_fee is None or not self._rewards:
+            return {strategy: None for strategy in GaspriceStrategy}
+
+        base_fee = self.next_base_fee / GWEI
+        size = len(self._rewards)
+        fees: Dict[GaspriceStrategy, Optional[Eip1559Fee]] = {strategy: None for strategy in GaspriceStrategy}
+
+        for strategy, total in zip(self._strategies, self._reward_sums):
+            fees[strategy] = Eip1559Fee.from_base_fee(base_fee, Decimal(total) / size / GWEI, self.base_fee_multiplier)
+
+        return fees
@@ -0,0 +1,47 @@
+from decimal import Decimal
+from typing import NamedTuple, Optional, Union
+
+__all__ = ["Eip1559Fee"]
+
+Number = Union[int, float, str, Decimal]
+#: gasprice in return unit of controller, fractional gwei is exact Decimal
+Gasprice = Union[int, Decimal]
+
+
+class Eip1559Fee(NamedTuple):
+    """EIP-1559 fee suggestion. Providers return fees in gwei, controllers convert them to return unit.
+
+    Transaction pays ``min(max_fee_per_gas, base_fee_per_gas + max_priority_fee_per_gas)`` per gas, so max fee is
+    only an upper bound protecting transaction from base fee growth while it is pending.
+    """
+
+    max_fee_per_gas: Gasprice
+    max_priority_fee_per_gas: Gasprice
+    base_fee_per_gas: Optional[Gasprice] = None
+
+    @classmethod
+    def from_base_fee(cls, base_fee: Number, priority_fee: Number, base_fee_multiplier: Number = 2) -> "Eip1559Fee":
+        """Build fee suggestion from base fee and priority fee.
+
+        Base fee can grow by 12.5% per block, so default multiplier 2 keeps transaction valid for 6 full blocks.
+
+        :param base_fee: base fee per gas of pending block
+        :param priority_fee: priority fee (tip) per gas
+        :param base_fee_multiplier: multiplier of base fee in max fee
+        """
+        base_fee, priority_fee = Decimal(str(base_fee)), max(Decimal(str(priority_fee)), Decimal(0))
+        return cls(
+            max_fee_per_gas=Decimal(str(base_fee_multiplier)) * base_fee + priority_fee,
+            max_priority_fee_per_gas=priority_fee,
+            base_fee_per_gas=base_fee,
+        )
+
+    @classmethod
+    def from_gasprice(cls, base_fee: Number, gasprice: Number, base_fee_multiplier: Number = 2) -> "Eip1559Fee":
+        """Build fee suggestion from base fee and legacy gasprice, which includes base fee.
+
+        :param base_fee: base fee per gas of pending block
+        :param gasprice: legacy gasprice suggestion
+        :param base_fee_multiplier: multiplier of base fee in max fee
+        """
+        return cls.from_base_fee(base_fee, Decimal(str(gasprice)) - Decimal(str(base_fee)), base_fee_multiplier)
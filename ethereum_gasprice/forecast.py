@@ -0,0 +1,241 @@
+import math
+import threading
+import time
+from statistics import median
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple, Union
+
+from ethereum_gasprice.aggregation import GaspriceAggregator
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.fees import Number
+
+__all__ = ["GaspriceForecast", "GaspriceForecaster"]
+
+
+class GaspriceForecast(NamedTuple):
+    strategy: GaspriceStrategy
+    #: number of blocks after the last sample
+    blocks: int
+    value: float
+    lower: float
+    upper: float
+
+
+class _ForecastState(NamedTuple):
+    level: float
+    #: change of gasprice per block
+    trend: float
+    timestamp: float
+    #: exponentially weighted mean of absolute relative error per block
+    error: float
+    lower_error: float
+    upper_error: float
+    samples: int
+
+
+class GaspriceForecaster:
+    """Short-horizon gasprice forecast with damped Holt smoothing and percentile bands.
+
+    Every sample updates level and per-block trend of each strategy in O(1), samples may be irregular, time between
+    them is converted to blocks with ``block_time``. Bands are quantiles of relative one-block forecast error,
+    tracked incrementally with stochastic approximation, and widened with square root of horizon.
+
+    State is replaced as a whole on every update, so forecasts can be read from any thread without locks.
+    """
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 0.3,
+        beta: float = 0.1,
+        damping: float = 0.9,
+        block_time: float = 12.0,
+        horizon: int = 5,
+        quantiles: Tuple[float, float] = (0.1, 0.9),
+        band_alpha: float = 0.05,
+        aggregator: Optional[GaspriceAggregator] = None,
+    ):
+        """
+        :param alpha: weight of new sample in level
+        :param beta: weight of new sample in trend
+        :param damping: trend damping per block, 1 is linear trend
+        :param block_time: average time between blocks in seconds
+        :param horizon: maximal number of blocks to forecast
+        :param quantiles: quantiles of forecast error used as lower and upper bands
+        :param band_alpha: weight of new sample in error estimate, it also scales quantile updates
+        :param aggregator: aggregator of gasprices from all sources, median of providers by default
+        """
+        if not 0 < alpha <= 1 or not 0 <= beta <= 1:
+            raise ValueError("alpha must be in (0, 1] and beta in [0, 1]")
+
+        if not 0 < damping <= 1:
+            raise ValueError("damping must be in (0, 1]")
+
+        if not 0 < quantiles[0] < quantiles[1] < 1:
+            raise ValueError("quantiles must satisfy 0 < lower < upper < 1")
+
+        if horizon < 1 or block_time <= 0:
+            raise ValueError("horizon and block_time must be positive")
+
+        self.alpha: float = alpha
+        self.beta: float = beta
+        self.damping: float = damping
+        self.block_time: float = block_time
+        self.horizon: int = horizon
+        self.quantiles: Tuple[float, float] = quantiles
+        self.band_alpha: float = band_alpha
+        self.aggregator: Optional[GaspriceAggregator] = aggregator
+
+        self._states: Dict[GaspriceStrategy, _ForecastState] = {}
+        self._lock = threading.Lock()
+
+    def _combine(
+        self, data: Mapping[str, Mapping[GaspriceStrategy, Optional[Number]]]
+    ) -> Dict[GaspriceStrategy, Optional[float]]:
+        """Get one gasprice per strategy from gasprices of all sources."""
+        if self.aggregator is not None:
+            aggregated = self.aggregator.aggregate(data).values
+            return {strategy: None if value is None else float(value) for strategy, value in aggregated.items()}
+
+        values = {}
+
+        for strategy in GaspriceStrategy:
+            present = [gasprices.get(strategy) for gasprices in data.values() if gasprices]
+            # fractional gwei is Decimal, the model works with floats
+            present = [float(value) for value in present if value is not None]
+            values[strategy] = median(present) if present else None
+
+        return values
+
+    def _trend_factor(self, blocks: float) -> float:
+        """Sum of damped trend multipliers for given number of blocks."""
+        if self.damping == 1:
+            return blocks
+
+        return self.damping * (1 - self.damping**blocks) / (1 - self.damping)
+
+    def _update_state(self, state: Optional[_ForecastState], value: float, timestamp: float) -> _ForecastState:
+        if state is None:
+            return _ForecastState(value, 0.0, timestamp, 0.0, 0.0, 0.0, 1)
+
+        blocks = max(0.0, (timestamp - state.timestamp) / self.block_time)
+        predicted = max(0.0, state.level + state.trend * self._trend_factor(blocks))
+        level = self.alpha * value + (1 - self.alpha) * predicted
+        trend = state.trend
+
+        # gasprice changes once per block, so samples closer than block time are not extrapolated
+        if blocks > 0:
+            trend = (
+                self.beta * (level - state.level) / max(blocks, 1.0) + (1 - self.beta) * self.damping**blocks * trend
+            )
+
+        # error of forecast on sample distance, normalized to one block as in random walk
+        relative_error = (value / predicted - 1 if predicted else 0.0) / math.sqrt(max(blocks, 1.0))
+        error = state.error + self.band_alpha * (abs(relative_error) - state.error)
+
+        # stochastic approximation of quantiles, step is proportional to error scale
+        step = self.band_alpha * max(error, 1e-3)
+        low, high = self.quantiles
+        lower_error = state.lower_error + step * (low - (relative_error < state.lower_error))
+        upper_error = state.upper_error + step * (high - (relative_error < state.upper_error))
+
+        return _ForecastState(level, trend, timestamp, error, lower_error, upper_error, state.samples + 1)
+
+    def update(
+        self,
+        data: Mapping[str, Mapping[GaspriceStrategy, Optional[Number]]],
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Add sample of gasprices from all sources.
+
+        :param data: result of get_gasprice_from_all_sources
+        :param timestamp: unix time of sample, current time by default
+        """
+        self.update_values(self._combine(data), timestamp)
+
+    def update_values(
+        self, values: Mapping[GaspriceStrategy, Optional[Number]], timestamp: Optional[float] = None
+    ) -> None:
+        """Add sample of gasprices, one value per strategy.
+
+        :param values: gasprices, strategies without value are not updated
+        :param timestamp: unix time of sample, current time by default
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            states = dict(self._states)
+
+            for strategy, value in values.items():
+                if value is None:
+                    continue
+
+                strategy = GaspriceStrategy(strategy)
+                state = states.get(strategy)
+
+                if state is not None and timestamp < state.timestamp:
+                    continue
+
+                states[strategy] = self._update_state(state, float(value), timestamp)
+
+            self._states = states
+
+    def update_from_history(
+        self, records: Iterable[Tuple[float, str, Mapping[GaspriceStrategy, Optional[float]]]]
+    ) -> None:
+        """Warm up forecaster with recorded history, e.g. ``GaspriceRecorder.query()``.
+
+        Records with the same timestamp are combined into one sample.
+
+        :param records: records of timestamp, provider title and gasprices in time order
+        """
+        timestamp: Optional[float] = None
+        data: Dict[str, Mapping[GaspriceStrategy, Optional[float]]] = {}
+
+        for record_timestamp, provider, gasprices in records:
+            if record_timestamp != timestamp and data:
+                self.update(data, timestamp)
+                data = {}
+
+            timestamp = record_timestamp
+            data[provider] = gasprices
+
+        if data:
+            self.update(data, timestamp)
+
+    def forecast(
+        self, strategy: Union[GaspriceStrategy, str] = GaspriceStrategy.FAST, blocks: int = 1
+    ) -> Optional[GaspriceForecast]:
+        """Get forecast of gasprice after given number of blocks since the last sample.
+
+        Returns None if there are no samples of strategy.
+
+        :param strategy: gasprice strategy
+        :param blocks: number of blocks, from 1 to horizon
+        """
+        if not 1 <= blocks <= self.horizon:
+            raise ValueError(f"blocks must be in [1, {self.horizon}]")
+
+        strategy = GaspriceStrategy(strategy)
+        state = self._states.get(strategy)
+
+        return self._forecast(strategy, state, blocks) if state is not None else None
+
+    def _forecast(self, strategy: GaspriceStrategy, state: _ForecastState, blocks: int) -> GaspriceForecast:
+        value = max(0.0, state.level + state.trend * self._trend_factor(blocks))
+        scale = math.sqrt(blocks)
+
+        return GaspriceForecast(
+            strategy=strategy,
+            blocks=blocks,
+            value=value,
+            lower=max(0.0, min(value, value * (1 + state.lower_error * scale))),
+            upper=max(value, value * (1 + state.upper_error * scale)),
+        )
+
+    def forecasts(self) -> Dict[GaspriceStrategy, Tuple[GaspriceForecast, ...]]:
+        """Get forecasts of all strategies for every block up to horizon."""
+        return {
+            strategy: tuple(self._forecast(strategy, state, blocks) for blocks in range(1, self.horizon + 1))
+            for strategy, state in self._states.items()
+        }
@@ -0,0 +1,381 @@
+import bisect
+import calendar
+import json
+import math
+import mmap
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.poller import GaspriceData, PollerSnapshot
+
+__all__ = ["HistoryRecord", "OhlcBar", "GaspriceRecorder"]
+
+_PARTITION_FORMAT = "%Y-%m-%d"
+_PARTITION_SECONDS = 86400
+_PROVIDERS_FILE = "providers.json"
+
+# column name and array typecode, gasprices are float64 with NaN for missing value
+_COLUMNS: Tuple[Tuple[str, str], ...] = (("timestamp", "d"), ("provider", "H")) + tuple(
+    (strategy.value, "d") for strategy in GaspriceStrategy
+)
+
+
+class HistoryRecord(NamedTuple):
+    timestamp: float
+    provider: str
+    gasprices: Dict[GaspriceStrategy, Optional[float]]
+
+
+class OhlcBar(NamedTuple):
+    #: start of interval
+    timestamp: float
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int
+
+
+class GaspriceRecorder:
+    """Append-only history of gasprices in columnar files.
+
+    Every record is a row of timestamp, provider and one column per strategy. Each column is a file of fixed-size
+    binary values, history is partitioned by UTC day: ``<path>/<YYYY-MM-DD>/<column>.bin``. Queries memory-map only
+    partitions overlapping requested time range and find its bounds with binary search over timestamps, so months of
+    per-second samples are never loaded into memory. Records must be appended in time order.
+
+    Recorder can be subscribed to poller to record every gasprices change::
+
+        recorder = GaspriceRecorder("history")
+        poller.subscribe(recorder.record_snapshot)
+    """
+
+    def __init__(self, path: str, *, buffer_size: int = 1024):
+        """
+        :param path: directory of history files, it is created if it does not exist
+        :param buffer_size: number of rows buffered in memory before they are written to files
+        """
+        self.path: str = path
+        self.buffer_size: int = buffer_size
+
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._providers: List[str] = self._load_providers()
+        self._provider_ids: Dict[str, int] = {title: i for i, title in enumerate(self._providers)}
+
+        self._buffer: Dict[str, array] = {column: array(typecode) for column, typecode in _COLUMNS}
+        self._partition: Optional[str] = None
+        self._files: Dict[str, IO[bytes]] = {}
+        self._last_timestamp: float = self._repair_last_partition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def providers(self) -> List[str]:
+        """Titles of recorded providers."""
+        return list(self._providers)
+
+    def _load_providers(self) -> List[str]:
+        try:
+            with open(os.path.join(self.path, _PROVIDERS_FILE)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return []
+
+    def _provider_id(self, title: str) -> int:
+        provider_id = self._provider_ids.get(title)
+
+        if provider_id is None:
+            provider_id = self._provider_ids[title] = len(self._providers)
+            self._providers.append(title)
+
+            path = os.path.join(self.path, _PROVIDERS_FILE)
+            with open(path + ".tmp", "w") as file:
+                json.dump(self._providers, file)
+            os.replace(path + ".tmp", path)
+
+        return provider_id
+
+    def _reload_providers(self) -> None:
+        """Read providers added by writer in another process."""
+        with self._lock:
+            self._providers = self._load_providers()
+            self._provider_ids = {title: i for i, title in enumerate(self._providers)}
+
+    def _provider_title(self, provider_id: int) -> str:
+        if provider_id >= len(self._providers):
+            self._reload_providers()
+
+        return self._providers[provider_id]
+
+    def _find_provider_id(self, title: str) -> Optional[int]:
+        """Get id of recorded provider, None if it was never recorded."""
+        if title not in self._provider_ids:
+            self._reload_providers()
+
+        return self._provider_ids.get(title)
+
+    def _partitions(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.path) if os.path.isdir(os.path.join(self.path, name)))
+
+    def _column_path(self, partition: str, column: str) -> str:
+        return os.path.join(self.path, partition, column + ".bin")
+
+    def _repair_last_partition(self) -> float:
+        """Truncate columns of last partition to the same number of rows after interrupted write.
+
+        Returns timestamp of the last record.
+        """
+        partitions = self._partitions()
+
+        if not partitions:
+            return -math.inf
+
+        partition = partitions[-1]
+        sizes = {}
+
+        for column, typecode in _COLUMNS:
+            path = self._column_path(partition, column)
+            sizes[column] = os.path.getsize(path) // array(typecode).itemsize if os.path.exists(path) else 0
+
+        rows = min(sizes.values())
+
+        for column, typecode in _COLUMNS:
+            path = self._column_path(partition, column)
+            if sizes[column] != rows or not os.path.exists(path):
+                with open(path, "ab") as file:
+                    file.truncate(rows * array(typecode).itemsize)
+
+        with self._open_partition(partition) as (columns, rows):
+            return columns["timestamp"][rows - 1] if rows else -math.inf
+
+    def _switch_partition(self, partition: str) -> None:
+        self._close_files()
+        os.makedirs(os.path.join(self.path, partition), exist_ok=True)
+
+        self._files = {column: open(self._column_path(partition, column), "ab") for column, _ in _COLUMNS}
+        self._partition = partition
+
+    def _close_files(self) -> None:
+        for file in self._files.values():
+            file.close()
+
+        self._files = {}
+        self._partition = None
+
+    def record(self, data: GaspriceData, timestamp: Optional[float] = None) -> None:
+        """Append gasprices of all providers, providers without gasprices are skipped.
+
+        :param data: gasprices by provider title, e.g. result of controller ``get_gasprice_from_all_sources``
+        :param timestamp: unix time of gasprices, current time by default
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            if timestamp < self._last_timestamp:
+                raise ValueError("records must be appended in time order")
+
+            partition = time.strftime(_PARTITION_FORMAT, time.gmtime(timestamp))
+
+            if partition != self._partition:
+                self.flush()
+                self._switch_partition(partition)
+
+            for title, gasprices in data.items():
+                if not gasprices or all(value is None for value in gasprices.values()):
+                    continue
+
+                self._buffer["timestamp"].append(timestamp)
+                self._buffer["provider"].append(self._provider_id(title))
+
+                for strategy in GaspriceStrategy:
+                    value = gasprices.get(strategy)
+                    self._buffer[strategy.value].append(math.nan if value is None else float(value))
+
+            self._last_timestamp = timestamp
+
+            if len(self._buffer["timestamp"]) >= self.buffer_size:
+                self.flush()
+
+    def record_snapshot(self, snapshot: PollerSnapshot) -> None:
+        """Append poller snapshot, can be used as poller subscriber.
+
+        :param snapshot: gasprices of all providers
+        """
+        self.record(snapshot.data, snapshot.timestamp)
+
+    def flush(self) -> None:
+        """Write buffered rows to files."""
+        with self._lock:
+            if not self._buffer["timestamp"]:
+                return
+
+            for column, values in self._buffer.items():
+                file = self._files[column]
+                values.tofile(file)
+                file.flush()
+                del values[:]
+
+    def close(self) -> None:
+        """Write buffered rows and close files."""
+        with self._lock:
+            self.flush()
+            self._close_files()
+
+    @contextmanager
+    def _open_partition(self, partition: str) -> Iterator[Tuple[Dict[str, memoryview], int]]:
+        """Memory-map columns of partition. Yields typed views of columns and number of complete rows.
+
+        Views are released when context exits, so values must be copied out of them.
+        """
+        maps: List[mmap.mmap] = []
+        views: Dict[str, memoryview] = {}
+
+        try:
+            for column, typecode in _COLUMNS:
+                itemsize = array(typecode).itemsize
+                path = self._column_path(partition, column)
+                size = os.path.getsize(path) // itemsize * itemsize if os.path.exists(path) else 0
+
+                if not size:
+                    break
+
+                with open(path, "rb") as file:
+                    maps.append(mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ))
+
+                views[column] = memoryview(maps[-1]).cast(typecode)
+
+            rows = min(len(view) for view in views.values()) if len(views) == len(_COLUMNS) else 0
+            yield views, rows
+        finally:
+            for view in views.values():
+                view.release()
+
+            for mapped in maps:
+                mapped.close()
+
+    def _ranges(self, start: Optional[float], end: Optional[float]) -> Iterator[Tuple[Dict[str, memoryview], int, int]]:
+        """Yield views of partitions overlapping time range with bounds of rows in range."""
+        self.flush()
+
+        for partition in self._partitions():
+            partition_start = calendar.timegm(time.strptime(partition, _PARTITION_FORMAT))
+
+            if start is not None and partition_start + _PARTITION_SECONDS <= start:
+                continue
+
+            if end is not None and partition_start >= end:
+                break
+
+            with self._open_partition(partition) as (columns, rows):
+                timestamps = columns.get("timestamp")
+                low = bisect.bisect_left(timestamps, start, 0, rows) if start is not None and rows else 0
+                high = bisect.bisect_left(timestamps, end, 0, rows) if end is not None and rows else rows
+
+                if low < high:
+                    yield columns, low, high
+
+    def query(
+        self, start: Optional[float] = None, end: Optional[float] = None, provider: Optional[str] = None
+    ) -> Iterator[HistoryRecord]:
+        """Iterate over records in time range in time order.
+
+        :param start: unix time of the first record, inclusive
+        :param end: unix time of the last record, exclusive
+        :param provider: title of provider, records of all providers by default
+        """
+        provider_id = self._find_provider_id(provider) if provider is not None else None
+
+        if provider is not None and provider_id is None:
+            return
+
+        for columns, low, high in self._ranges(start, end):
+            providers = columns["provider"]
+
+            for i in range(low, high):
+                if provider_id is not None and providers[i] != provider_id:
+                    continue
+
+                gasprices = {}
+                for strategy in GaspriceStrategy:
+                    value = columns[strategy.value][i]
+                    gasprices[strategy] = None if math.isnan(value) else value
+
+                yield HistoryRecord(
+                    timestamp=columns["timestamp"][i], provider=self._provider_title(providers[i]), gasprices=gasprices
+                )
+
+    def downsample(
+        self,
+        interval: float,
+        strategy: GaspriceStrategy = GaspriceStrategy.FAST,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        provider: Optional[str] = None,
+    ) -> Iterator[OhlcBar]:
+        """Iterate over open, high, low and close gasprices per interval, e.g. 60 for minute bars.
+
+        Intervals are aligned to unix epoch, intervals without gasprices are skipped.
+
+        :param interval: length of interval in seconds
+        :param strategy: gasprice strategy
+        :param start: unix time of the first record, inclusive
+        :param end: unix time of the last record, exclusive
+        :param provider: title of provider, gasprices of all providers by default
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        strategy = GaspriceStrategy(strategy)
+        provider_id = self._find_provider_id(provider) if provider is not None else None
+
+        if provider is not None and provider_id is None:
+            return
+
+        bar: Optional[List] = None
+
+        for columns, low, high in self._ranges(start, end):
+            timestamps, providers, values = columns["timestamp"], columns["provider"], columns[strategy.value]
+
+            # rows of interval are found with binary search and copied out as one slice
+            while low < high:
+                bucket = timestamps[low] // interval * interval
+                bucket_end = bisect.bisect_left(timestamps, bucket + interval, low, high)
+                chunk = values[low:bucket_end].tolist()
+
+                if provider_id is not None:
+                    ids = providers[low:bucket_end].tolist()
+                    chunk = [value for value, i in zip(chunk, ids) if i == provider_id and not math.isnan(value)]
+                else:
+                    chunk = [value for value in chunk if not math.isnan(value)]
+
+                low = bucket_end
+
+                if not chunk:
+                    continue
+
+                if bar is not None and bar[0] == bucket:
+                    bar[2] = max(bar[2], max(chunk))
+                    bar[3] = min(bar[3], min(chunk))
+                    bar[4] = chunk[-1]
+                    bar[5] += len(chunk)
+                    continue
+
+                if bar is not None:
+                    yield OhlcBar(*bar)
+
+                bar = [bucket, chunk[0], max(chunk), min(chunk), chunk[-1], len(chunk)]
+
+        if bar is not None:
+            yield OhlcBar(*bar)
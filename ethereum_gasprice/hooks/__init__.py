@@ -0,0 +1 @@
+from .base import CompositeHooks, GaspriceHooks
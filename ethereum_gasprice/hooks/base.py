@@ -0,0 +1,93 @@
+from contextlib import ExitStack, contextmanager
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+from ethereum_gasprice.consts import CacheStatus, RequestOutcome
+
+__all__ = ["GaspriceHooks", "CompositeHooks"]
+
+
+class GaspriceHooks:
+    """Instrumentation hooks of controllers and providers.
+
+    All methods do nothing, subclass overrides only events it needs. Hooks are called only when they are passed
+    to controller, so disabled instrumentation costs one attribute check per event.
+    """
+
+    def on_request(self, provider: str, outcome: RequestOutcome, latency: Optional[float], attempt: int) -> None:
+        """Request to provider api finished.
+
+        :param provider: provider title
+        :param outcome: result of request
+        :param latency: request duration in seconds, None if request was not sent
+        :param attempt: number of attempt, starting from 0
+        """
+
+    def on_provider_skipped(self, provider: str, reason: RequestOutcome) -> None:
+        """Controller skipped provider without request.
+
+        :param provider: provider title
+        :param reason: RequestOutcome.RATE_LIMITED or RequestOutcome.CIRCUIT_OPEN
+        """
+
+    def on_cache_lookup(self, method: str, status: CacheStatus, age: Optional[float] = None) -> None:
+        """Controller looked up result in cache. It is also called with STALE status when stale value is returned
+        because providers failed.
+
+        :param method: controller method, e.g. "gasprices"
+        :param status: cache lookup status
+        :param age: age in seconds of cached value returned to caller, None if there is no value
+        """
+
+    def on_fallback(self, kind: str, depth: int, success: bool) -> None:
+        """Controller finished fallback chain.
+
+        :param kind: "gasprice" or "fees"
+        :param depth: number of providers tried before valid response, or all tried providers if there is no one
+        :param success: some provider returned valid response
+        """
+
+    def span(self, name: str, attributes: Dict[str, Any]) -> ContextManager:
+        """Trace span around fetch from providers.
+
+        :param name: span name
+        :param attributes: span attributes
+        """
+        return _null_span()
+
+
+@contextmanager
+def _null_span() -> Iterator[None]:
+    yield
+
+
+class CompositeHooks(GaspriceHooks):
+    """Pass events to several hooks, e.g. metrics and tracing."""
+
+    def __init__(self, *hooks: GaspriceHooks):
+        """
+        :param hooks: hooks receiving events
+        """
+        self.hooks = hooks
+
+    def on_request(self, provider: str, outcome: RequestOutcome, latency: Optional[float], attempt: int) -> None:
+        for hooks in self.hooks:
+            hooks.on_request(provider, outcome, latency, attempt)
+
+    def on_provider_skipped(self, provider: str, reason: RequestOutcome) -> None:
+        for hooks in self.hooks:
+            hooks.on_provider_skipped(provider, reason)
+
+    def on_cache_lookup(self, method: str, status: CacheStatus, age: Optional[float] = None) -> None:
+        for hooks in self.hooks:
+            hooks.on_cache_lookup(method, status, age)
+
+    def on_fallback(self, kind: str, depth: int, success: bool) -> None:
+        for hooks in self.hooks:
+            hooks.on_fallback(kind, depth, success)
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[None]:
+        with ExitStack() as stack:
+            for hooks in self.hooks:
+                stack.enter_context(hooks.span(name, attributes))
+            yield
@@ -0,0 +1,48 @@
+from typing import Any, ContextManager, Dict, Optional
+
+from opentelemetry import trace
+
+from ethereum_gasprice.consts import CacheStatus, RequestOutcome
+from ethereum_gasprice.hooks.base import GaspriceHooks
+
+__all__ = ["OpenTelemetryHooks"]
+
+
+class OpenTelemetryHooks(GaspriceHooks):
+    """Trace fetches from providers with OpenTelemetry spans, requires opentelemetry-api.
+
+    Requests to provider api, skipped providers and cache lookups are added as events of current span.
+    """
+
+    def __init__(self, tracer: Optional[trace.Tracer] = None):
+        """
+        :param tracer: tracer of spans, tracer of global tracer provider is used if it is not passed
+        """
+        self.tracer: trace.Tracer = tracer or trace.get_tracer("ethereum_gasprice")
+
+    def span(self, name: str, attributes: Dict[str, Any]) -> ContextManager:
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def on_request(self, provider: str, outcome: RequestOutcome, latency: Optional[float], attempt: int) -> None:
+        attributes: Dict[str, Any] = {"provider": provider, "outcome": outcome.value, "attempt": attempt}
+
+        if latency is not None:
+            attributes["latency"] = latency
+
+        trace.get_current_span().add_event("provider_request", attributes)
+
+    def on_provider_skipped(self, provider: str, reason: RequestOutcome) -> None:
+        trace.get_current_span().add_event("provider_skipped", {"provider": provider, "reason": reason.value})
+
+    def on_cache_lookup(self, method: str, status: CacheStatus, age: Optional[float] = None) -> None:
+        attributes: Dict[str, Any] = {"method": method, "status": status.value}
+
+        if age is not None:
+            attributes["age"] = age
+
+        trace.get_current_span().add_event("cache_lookup", attributes)
+
+    def on_fallback(self, kind: str, depth: int, success: bool) -> None:
+        span = trace.get_current_span()
+        span.set_attribute("fallback_depth", depth)
+        span.set_attribute("fallback_success", success)
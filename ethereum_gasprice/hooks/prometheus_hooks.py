@@ -0,0 +1,71 @@
+from typing import Any, Optional
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram
+
+from ethereum_gasprice.consts import CacheStatus, RequestOutcome
+from ethereum_gasprice.hooks.base import GaspriceHooks
+
+__all__ = ["PrometheusHooks"]
+
+
+class PrometheusHooks(GaspriceHooks):
+    """Export controller and provider events as Prometheus metrics, requires prometheus_client."""
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None, namespace: str = "ethereum_gasprice"):
+        """
+        :param registry: registry of metrics, default registry of prometheus_client is used if it is not passed
+        :param namespace: prefix of metric names
+        """
+        registry = registry if registry is not None else REGISTRY
+        options: Any = {"namespace": namespace, "registry": registry}
+
+        self.requests = Counter(
+            "provider_requests_total", "Requests to provider api by outcome", ["provider", "outcome"], **options
+        )
+        self.request_latency = Histogram(
+            "provider_request_seconds", "Duration of requests to provider api", ["provider"], **options
+        )
+        self.skipped = Counter(
+            "provider_skipped_total", "Providers skipped without request", ["provider", "reason"], **options
+        )
+        self.cache_lookups = Counter(
+            "cache_lookups_total", "Cache lookups of controller methods", ["method", "status"], **options
+        )
+        self.cache_age = Histogram(
+            "cache_value_age_seconds",
+            "Age of cached values returned by controller methods",
+            ["method"],
+            buckets=(1, 3, 6, 12, 24, 60, 120, 300),
+            **options,
+        )
+        self.fallback_depth = Histogram(
+            "fallback_depth",
+            "Number of providers tried before valid response",
+            ["kind"],
+            buckets=(0, 1, 2, 3, 4, 5, 10),
+            **options,
+        )
+        self.fallback_failures = Counter(
+            "fallback_failures_total", "Fallback chains without valid response", ["kind"], **options
+        )
+
+    def on_request(self, provider: str, outcome: RequestOutcome, latency: Optional[float], attempt: int) -> None:
+        self.requests.labels(provider, outcome.value).inc()
+
+        if latency is not None:
+            self.request_latency.labels(provider).observe(latency)
+
+    def on_provider_skipped(self, provider: str, reason: RequestOutcome) -> None:
+        self.skipped.labels(provider, reason.value).inc()
+
+    def on_cache_lookup(self, method: str, status: CacheStatus, age: Optional[float] = None) -> None:
+        self.cache_lookups.labels(method, status.value).inc()
+
+        if age is not None and status != CacheStatus.MISS:
+            self.cache_age.labels(method).observe(age)
+
+    def on_fallback(self, kind: str, depth: int, success: bool) -> None:
+        if success:
+            self.fallback_depth.labels(kind).observe(depth)
+        else:
+            self.fallback_failures.labels(kind).inc()
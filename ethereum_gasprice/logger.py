@@ -1,5 +1,5 @@
 import logging
 
-logging.basicConfig(format="%(name)s - %(levelname)s: %(message)s", level=logging.INFO)
-
 logger = logging.getLogger("ethereum-gasprice")
+# logging is configured by application, records are dropped if it is not configured
+logger.addHandler(logging.NullHandler())
@@ -0,0 +1,222 @@
+import asyncio
+import json
+from os import getenv
+from typing import Any, AsyncIterator, Dict, NamedTuple, Optional, Union
+
+import websockets
+
+from ethereum_gasprice.controller import AsyncGaspriceController, GaspriceController
+from ethereum_gasprice.logger import logger
+from ethereum_gasprice.poller import AsyncGaspricePoller, GaspricePoller
+
+__all__ = ["BlockHead", "NewHeadsSubscriber", "NewBlockRefresher"]
+
+RefreshTarget = Union[AsyncGaspricePoller, GaspricePoller, AsyncGaspriceController, GaspriceController]
+
+
+class BlockHead(NamedTuple):
+    number: int
+    hash: str
+    base_fee_per_gas: Optional[int] = None
+
+
+class NewHeadsSubscriber:
+    """Subscription to new blocks of node over websocket (``eth_subscribe`` to ``newHeads``).
+
+    Subscription is restored after connection errors with exponential backoff. Head which was already yielded
+    (e.g. it is sent again after reconnect) is skipped.
+    """
+
+    #: the same env variable as for Web3Provider
+    secret_env_var_title: str = "ETHGASPRICE_WEB3_SECRET"
+
+    def __init__(self, uri: Optional[str] = None, *, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        """
+        :param uri: websocket uri of node, by default it is taken from ETHGASPRICE_WEB3_SECRET env variable
+        :param reconnect_delay: initial delay in seconds before reconnect
+        :param max_reconnect_delay: maximal delay in seconds before reconnect
+        """
+        self.uri: Optional[str] = uri or getenv(self.secret_env_var_title)
+
+        if not self.uri or not self.uri.startswith("ws"):
+            raise ValueError("websocket node uri is required")
+
+        self.reconnect_delay: float = reconnect_delay
+        self.max_reconnect_delay: float = max_reconnect_delay
+        self.last_head: Optional[BlockHead] = None
+
+    @staticmethod
+    def _parse_head(message: Dict[str, Any], subscription: str) -> Optional[BlockHead]:
+        params = message.get("params") or {}
+
+        if message.get("method") != "eth_subscription" or params.get("subscription") != subscription:
+            return None
+
+        header = params.get("result") or {}
+        base_fee = header.get("baseFeePerGas")
+
+        return BlockHead(
+            number=int(header["number"], 16),
+            hash=header["hash"],
+            base_fee_per_gas=int(base_fee, 16) if base_fee is not None else None,
+        )
+
+    async def _subscribe(self, websocket: Any) -> str:
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+
+        while True:
+            message = json.loads(await websocket.recv())
+
+            if message.get("id") != 1:
+                continue
+
+            if message.get("error") or not message.get("result"):
+                raise ValueError(f"eth_subscribe failed: {message.get('error')}")
+
+            return message["result"]
+
+    async def heads(self) -> AsyncIterator[BlockHead]:
+        """Iterate over new blocks of node forever."""
+        delay = self.reconnect_delay
+
+        while True:
+            try:
+                async with websockets.connect(self.uri) as websocket:
+                    subscription = await self._subscribe(websocket)
+                    delay = self.reconnect_delay
+
+                    async for raw_message in websocket:
+                        head = self._parse_head(json.loads(raw_message), subscription)
+
+                        if head is None or (self.last_head is not None and head.hash == self.last_head.hash):
+                            continue
+
+                        self.last_head = head
+                        yield head
+            except (OSError, ValueError, KeyError, websockets.WebSocketException) as e:
+                logger.warning("newHeads subscription failed: %r, reconnecting in %ss", e, delay)
+
+            await asyncio.sleep(delay)
+            delay = min(self.max_reconnect_delay, delay * 2)
+
+
+class NewBlockRefresher:
+    """Refresh gasprices on every new block instead of timer.
+
+    Poller target is refreshed, controller target gets its cached results invalidated, so the next call fetches
+    gasprices. Only results stored before the block was received are invalidated, so workers sharing cache store
+    don't remove results already fetched by each other for the same block.
+    When blocks arrive faster than refresh finishes, intermediate blocks are skipped and only latest one triggers
+    next refresh, so every block causes at most one upstream fetch.
+    """
+
+    def __init__(self, target: RefreshTarget, subscriber: NewHeadsSubscriber):
+        """
+        :param target: poller or controller with cache
+        :param subscriber: newHeads subscription
+        """
+        if isinstance(target, (AsyncGaspriceController, GaspriceController)) and target.cache is None:
+            raise ValueError("controller without cache can't be refreshed on new blocks")
+
+        self.target: RefreshTarget = target
+        self.subscriber: NewHeadsSubscriber = subscriber
+        self.refreshes: int = 0
+
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    def _clock(self) -> Optional[float]:
+        """Time of block receipt in clock of controller cache, None for poller target."""
+        if isinstance(self.target, (AsyncGaspriceController, GaspriceController)):
+            return self.target.cache.clock()
+
+        return None
+
+    async def _refresh(self, head: BlockHead, received_at: Optional[float] = None) -> None:
+        target = self.target
+
+        if isinstance(target, AsyncGaspricePoller):
+            await target.refresh()
+        elif isinstance(target, GaspricePoller):
+            await asyncio.get_running_loop().run_in_executor(None, target.refresh)
+        elif target.cache.shared:
+            # store of shared cache makes network or file I/O
+            await asyncio.get_running_loop().run_in_executor(None, target.invalidate_cache, received_at)
+        else:
+            target.invalidate_cache(stored_before=received_at)
+
+        self.refreshes += 1
+        logger.debug("gasprices refreshed on block %s", head.number)
+
+    async def run(self) -> None:
+        """Read new blocks and refresh target until cancelled.
+
+        Subscription is restarted after reconnect delay of subscriber, if reader of blocks fails with unexpected error.
+        """
+        latest: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def read() -> None:
+            async for head in self.subscriber.heads():
+                # keep only latest block while refresh is running
+                if latest.full():
+                    latest.get_nowait()
+                latest.put_nowait((head, self._clock()))
+
+        reader = asyncio.ensure_future(read())
+        getter: Optional[asyncio.Future] = None
+
+        try:
+            while True:
+                getter = asyncio.ensure_future(latest.get())
+                await asyncio.wait((getter, reader), return_when=asyncio.FIRST_COMPLETED)
+
+                if not getter.done():
+                    getter.cancel()
+                    error = reader.exception()
+                    logger.error(
+                        "newHeads reader stopped, restarting in %ss",
+                        self.subscriber.reconnect_delay,
+                        exc_info=error,
+                    )
+                    await asyncio.sleep(self.subscriber.reconnect_delay)
+                    reader = asyncio.ensure_future(read())
+                    continue
+
+                head, received_at = getter.result()
+
+                try:
+                    await self._refresh(head, received_at)
+                except Exception:
+                    logger.exception("gasprice refresh on new block failed")
+        finally:
+            reader.cancel()
+
+            if getter is not None:
+                getter.cancel()
+
+    def start(self) -> None:
+        """Start refreshing in background task."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        """Stop refreshing."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
@@ -0,0 +1,323 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from ethereum_gasprice.aggregation import AggregatedGasprice, GaspriceAggregator
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.controller import AsyncGaspriceController, GaspriceController
+from ethereum_gasprice.fees import Gasprice
+from ethereum_gasprice.forecast import GaspriceForecast, GaspriceForecaster
+from ethereum_gasprice.logger import logger
+
+__all__ = ["PollerSnapshot", "BaseGaspricePoller", "GaspricePoller", "AsyncGaspricePoller"]
+
+GaspriceData = Dict[str, Mapping[GaspriceStrategy, Optional[Gasprice]]]
+
+
+class PollerSnapshot(NamedTuple):
+    data: GaspriceData
+    timestamp: float
+    version: int
+    aggregated: Optional[AggregatedGasprice] = None
+    forecasts: Optional[Dict[GaspriceStrategy, Tuple[GaspriceForecast, ...]]] = None
+
+
+class BaseGaspricePoller:
+    """Base class of background poller refreshing gasprices from all providers of controller.
+
+    Poll interval is adaptive: it is divided by ``backoff`` when any gasprice changed more than
+    ``change_threshold`` since previous poll and multiplied by it when gasprices are flat.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 15.0,
+        min_interval: float = 3.0,
+        max_interval: float = 60.0,
+        change_threshold: float = 0.05,
+        backoff: float = 1.5,
+        aggregator: Optional[GaspriceAggregator] = None,
+        forecaster: Optional[GaspriceForecaster] = None,
+    ):
+        """
+        :param interval: initial poll interval in seconds
+        :param min_interval: minimal poll interval in seconds
+        :param max_interval: maximal poll interval in seconds
+        :param change_threshold: relative gasprice change, which is considered as moving price
+        :param backoff: multiplier of poll interval
+        :param aggregator: if passed, consensus gasprices are calculated for every changed snapshot, they are None
+            if aggregation failed
+        :param forecaster: if passed, it is updated with every poll and its forecasts are added to snapshot
+        """
+        if not 0 < min_interval <= interval <= max_interval:
+            raise ValueError("poll intervals must satisfy 0 < min_interval <= interval <= max_interval")
+
+        if backoff < 1:
+            raise ValueError("backoff must be greater or equal to 1")
+
+        self.interval: float = interval
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.change_threshold: float = change_threshold
+        self.backoff: float = backoff
+        self.aggregator: Optional[GaspriceAggregator] = aggregator
+        self.forecaster: Optional[GaspriceForecaster] = forecaster
+
+        self._snapshot: Optional[PollerSnapshot] = None
+        self._callbacks: List[Callable[[PollerSnapshot], None]] = []
+
+    @property
+    def snapshot(self) -> Optional[PollerSnapshot]:
+        """Latest gasprices snapshot, None if nothing was fetched yet.
+
+        Snapshot is replaced as a whole, so it can be read from any thread without locks.
+        """
+        return self._snapshot
+
+    def subscribe(self, callback: Callable[[PollerSnapshot], None]) -> Callable[[], None]:
+        """Call function on every gasprices change. Returns function which cancels subscription.
+
+        :param callback: function receiving new snapshot
+        """
+        # copy on write, so publishing thread iterates over consistent list without locks
+        self._callbacks = self._callbacks + [callback]
+
+        def unsubscribe() -> None:
+            self._callbacks = [c for c in self._callbacks if c is not callback]
+
+        return unsubscribe
+
+    def _max_change(self, previous: GaspriceData, current: GaspriceData) -> float:
+        """Get maximal relative change of gasprice between two polls."""
+        max_change = 0.0
+
+        for title, gasprices in current.items():
+            previous_gasprices = previous.get(title) or {}
+
+            for strategy, value in gasprices.items():
+                previous_value = previous_gasprices.get(strategy)
+
+                if value is None or not previous_value:
+                    continue
+
+                max_change = max(max_change, float(abs(value - previous_value) / previous_value))
+
+        return max_change
+
+    def _next_interval(self, previous: Optional[GaspriceData], current: GaspriceData) -> float:
+        if previous is None:
+            return self.interval
+        elif self._max_change(previous, current) > self.change_threshold:
+            self.interval = max(self.min_interval, self.interval / self.backoff)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+        return self.interval
+
+    def _publish(self, data: GaspriceData) -> Optional[PollerSnapshot]:
+        """Store new snapshot and notify subscribers if gasprices changed.
+
+        Returns new snapshot if data changed and None otherwise.
+
+        :param data: gasprices from all sources
+        """
+        previous = self._snapshot
+        timestamp = time.time()
+        forecasts = None
+
+        # unchanged gasprices are samples of forecaster too
+        if self.forecaster is not None:
+            try:
+                self.forecaster.update(data, timestamp)
+                forecasts = self.forecaster.forecasts()
+            except Exception:
+                logger.exception("gasprice forecast failed")
+
+        if previous is not None and previous.data == data:
+            self._snapshot = previous._replace(timestamp=timestamp, forecasts=forecasts)
+            return None
+
+        aggregated = None
+
+        # raw gasprices are published even if consensus can't be calculated
+        if self.aggregator is not None:
+            try:
+                aggregated = self.aggregator.aggregate(data, self.controller.return_unit)
+            except Exception:
+                logger.exception("gasprice aggregation failed")
+
+        self._snapshot = snapshot = PollerSnapshot(
+            data=data,
+            timestamp=timestamp,
+            version=1 if previous is None else previous.version + 1,
+            aggregated=aggregated,
+            forecasts=forecasts,
+        )
+
+        for callback in self._callbacks:
+            try:
+                callback(snapshot)
+            except Exception:
+                logger.exception("gasprice subscriber failed")
+
+        return snapshot
+
+
+class GaspricePoller(BaseGaspricePoller):
+    """Poller refreshing gasprices of sync controller in background thread."""
+
+    def __init__(self, controller: GaspriceController, **kwargs):
+        """
+        :param controller: sync controller
+        :param kwargs: poll interval settings, see BaseGaspricePoller
+        """
+        super().__init__(**kwargs)
+        self.controller: GaspriceController = controller
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._refresh_lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def refresh(self) -> Optional[PollerSnapshot]:
+        """Fetch gasprices right now. Returns new snapshot if gasprices changed."""
+        with self._refresh_lock:
+            previous = self._snapshot
+            data = self.controller.refresh_gasprice_from_all_sources()
+
+            if not self.controller._is_valid_result(data):
+                return None
+
+            self._next_interval(previous.data if previous else None, data)
+            return self._publish(data)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("gasprice poll failed")
+
+            self._stop_event.wait(self.interval)
+
+    def start(self) -> None:
+        """Start polling in background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ethereum-gasprice-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling and wait for background thread.
+
+        :param timeout: time in seconds to wait for thread
+        """
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class AsyncGaspricePoller(BaseGaspricePoller):
+    """Poller refreshing gasprices of async controller in background task."""
+
+    def __init__(self, controller: AsyncGaspriceController, **kwargs):
+        """
+        :param controller: async controller
+        :param kwargs: poll interval settings, see BaseGaspricePoller
+        """
+        super().__init__(**kwargs)
+        self.controller: AsyncGaspriceController = controller
+
+        self._task: Optional[asyncio.Task] = None
+        self._queues: List[asyncio.Queue] = []
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    def _publish(self, data: GaspriceData) -> Optional[PollerSnapshot]:
+        snapshot = super()._publish(data)
+
+        if snapshot is not None:
+            for queue in self._queues:
+                # keep only latest snapshot for slow consumers
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(snapshot)
+
+        return snapshot
+
+    async def refresh(self) -> Optional[PollerSnapshot]:
+        """Fetch gasprices right now. Returns new snapshot if gasprices changed."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            previous = self._snapshot
+            data = await self.controller.refresh_gasprice_from_all_sources()
+
+            if not self.controller._is_valid_result(data):
+                return None
+
+            self._next_interval(previous.data if previous else None, data)
+            return self._publish(data)
+
+    async def updates(self) -> AsyncIterator[PollerSnapshot]:
+        """Iterate over gasprices changes.
+
+        Slow consumer receives only latest snapshot, intermediate ones are dropped.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._queues.append(queue)
+
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.remove(queue)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("gasprice poll failed")
+
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start polling in background task."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
@@ -1,5 +1,28 @@
-from .base import BaseGaspriceProvider
-from .etherchain_provider import AsyncEtherchainProvider, EtherchainProvider
-from .etherscan_provider import AsyncEtherscanProvider, EtherscanProvider
-from .ethgasstation_provider import AsyncEthGasStationProvider, EthGasStationProvider
-from .poa_provider import AsyncPoaProvider, PoaProvider
+from typing import TYPE_CHECKING
+
+from .. import _lazy
+
+if TYPE_CHECKING:
+    from .base import BaseAsyncGaspriceProvider, BaseGaspriceProvider
+    from .etherchain_provider import AsyncEtherchainProvider, EtherchainProvider
+    from .etherscan_provider import AsyncEtherscanProvider, EtherscanProvider
+    from .ethgasstation_provider import AsyncEthGasStationProvider, EthGasStationProvider
+    from .poa_provider import AsyncPoaProvider, PoaProvider
+
+# every provider module is imported on first access to one of its providers
+_LAZY_IMPORTS = {
+    "BaseAsyncGaspriceProvider": ".base",
+    "BaseGaspriceProvider": ".base",
+    "AsyncEtherchainProvider": ".etherchain_provider",
+    "EtherchainProvider": ".etherchain_provider",
+    "AsyncEtherscanProvider": ".etherscan_provider",
+    "EtherscanProvider": ".etherscan_provider",
+    "AsyncEthGasStationProvider": ".ethgasstation_provider",
+    "EthGasStationProvider": ".ethgasstation_provider",
+    "AsyncPoaProvider": ".poa_provider",
+    "PoaProvider": ".poa_provider",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
@@ -1,13 +1,23 @@
+import asyncio
+import random
+import time
 from abc import ABC, abstractmethod
 from os import getenv
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
 
-from httpx import AsyncClient, Client
+from httpx import AsyncClient, Client, HTTPError, Response, Timeout, TimeoutException
 
-from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.consts import Chain, GaspriceStrategy, JsonBackend, RequestOutcome
+from ethereum_gasprice.decoding import ResponseDecoder, get_decoder
+from ethereum_gasprice.fees import Eip1559Fee
+from ethereum_gasprice.hooks.base import GaspriceHooks
+from ethereum_gasprice.logger import logger
+from ethereum_gasprice.rate_limit import TokenBucket, get_rate_limiter
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 __all__ = [
     "BaseGaspriceProvider",
+    "BaseAsyncGaspriceProvider",
     "BaseAPIGaspriceProvider",
     "BaseSyncAPIGaspriceProvider",
     "BaseAsyncAPIGaspriceProvider",
@@ -17,15 +27,47 @@ __all__ = [
 class BaseGaspriceProvider(ABC):
     title: str = NotImplemented
     secret_env_var_title: str = NotImplemented
+    #: provider returns EIP-1559 fee suggestions
+    supports_eip1559: bool = False
+    #: chains supported by provider, None if provider works with any chain
+    chains: Optional[Tuple[Chain, ...]] = (Chain.ETHEREUM,)
+
+    def __init__(self, secret: Optional[str] = None, *args, chain: Chain = Chain.ETHEREUM, **kwargs):
+        if not self.supports_chain(chain):
+            raise ValueError(f"{self.title} provider does not support {Chain(chain).value} chain")
 
-    def __init__(self, secret: Optional[str] = None, *args, **kwargs):
         self.secret: Optional[str] = secret
+        self.chain: Chain = Chain(chain)
+
+    @classmethod
+    def supports_chain(cls, chain: Chain) -> bool:
+        return cls.chains is None or Chain(chain) in cls.chains
 
     def get_secret(self) -> Optional[str]:
-        return self.secret or getenv(self.secret_env_var_title)
+        """Get secret passed to provider or from environment variable.
+
+        Name of environment variable of chain other than Ethereum has chain suffix, e.g.
+        ``ETHGASPRICE_ETHERSCAN_SECRET_POLYGON``.
+        """
+        if self.secret:
+            return self.secret
+
+        if self.chain == Chain.ETHEREUM:
+            return getenv(self.secret_env_var_title)
+
+        return getenv(f"{self.secret_env_var_title}_{self.chain.name}")
+
+    def is_rate_limited(self) -> bool:
+        """Check if request quota of provider is exhausted, so request would be rejected."""
+        return False
+
+    @property
+    def _data_template(self) -> GaspriceSnapshot:
+        """Snapshot without gasprices, snapshots are immutable, so it is not copied by providers."""
+        return GaspriceSnapshot(source=self.title)
 
     @property
-    def _data_template(self) -> Dict[GaspriceStrategy, Optional[int]]:
+    def _fee_template(self) -> Dict[GaspriceStrategy, Optional[Eip1559Fee]]:
         return {
             GaspriceStrategy.SLOW: None,
             GaspriceStrategy.REGULAR: None,
@@ -34,12 +76,183 @@ class BaseGaspriceProvider(ABC):
         }
 
     @abstractmethod
-    def get_gasprice(self) -> Tuple[bool, Dict[str, int]]:
+    def get_gasprice(self) -> Tuple[bool, GaspriceSnapshot]:
         pass
 
+    def get_fees(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions in gwei. Provider without EIP-1559 support returns empty data."""
+        return False, self._fee_template
+
+
+class BaseAsyncGaspriceProvider(BaseGaspriceProvider, ABC):
+    """Base class of providers with async methods, only they can be used in async controller."""
+
+    @abstractmethod
+    async def get_gasprice(self) -> Tuple[bool, GaspriceSnapshot]:
+        pass
+
+    async def get_fees(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions in gwei. Provider without EIP-1559 support returns empty data."""
+        return False, self._fee_template
+
 
 class BaseAPIGaspriceProvider(BaseGaspriceProvider, ABC):
     api_url: str = NotImplemented
+    #: api urls of chains other than Ethereum, api_url is used for Ethereum
+    chain_api_urls: Dict[Chain, str] = {}
+
+    #: default timeout of request to api in seconds, can be overridden with httpx.Timeout for connect/read timeouts
+    timeout: Union[float, Timeout] = 5.0
+    #: response status codes after which request is retried
+    retry_status_codes: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    #: default request quota of api in requests per second, None means no limit
+    rate_limit: Optional[float] = None
+    #: types of top-level response fields used by provider, only they are decoded with msgspec, None decodes all
+    response_schema: Optional[Dict[str, Any]] = None
+    #: json backend decoding responses, the fastest installed by default
+    json_backend: Optional[JsonBackend] = None
+
+    def __init__(
+        self,
+        *,
+        secret: Optional[str] = None,
+        timeout: Optional[Union[float, Timeout]] = None,
+        retries: int = 0,
+        backoff_factor: float = 0.1,
+        rate_limit: Optional[float] = None,
+        rate_limit_burst: Optional[float] = None,
+        rate_limit_wait: float = 0.0,
+        hooks: Optional[GaspriceHooks] = None,
+        json_backend: Optional[JsonBackend] = None,
+        **kwargs,
+    ):
+        """
+        :param secret: api key
+        :param timeout: request timeout in seconds or httpx.Timeout with separate connect/read timeouts
+        :param retries: number of retries after network errors and retryable response status codes
+        :param backoff_factor: base of exponential backoff between retries in seconds, delay is jittered
+        :param rate_limit: request quota in requests per second, it is shared by providers with the same api key
+        :param rate_limit_burst: maximal burst of requests, equals to rate limit by default
+        :param rate_limit_wait: maximal time in seconds to wait for quota, request is not sent if it is exceeded
+        :param hooks: instrumentation hooks receiving outcome and latency of every request
+        :param json_backend: json backend decoding responses, e.g. JsonBackend.STDLIB
+        """
+        super().__init__(secret=secret, **kwargs)
+
+        if retries < 0:
+            raise ValueError("retries must be non-negative")
+
+        if timeout is not None:
+            self.timeout = timeout
+
+        if rate_limit is not None:
+            self.rate_limit = rate_limit
+
+        if json_backend is not None:
+            self.json_backend = json_backend
+
+        self.retries: int = retries
+        self.backoff_factor: float = backoff_factor
+        self.rate_limit_burst: Optional[float] = rate_limit_burst
+        self.rate_limit_wait: float = rate_limit_wait
+        self.hooks: Optional[GaspriceHooks] = hooks
+        self.decoder: ResponseDecoder = get_decoder(self.response_schema, self.json_backend)
+
+        if self.chain != Chain.ETHEREUM:
+            self.api_url = self.chain_api_urls[self.chain]
+
+    @property
+    def rate_limiter(self) -> Optional[TokenBucket]:
+        """Rate limiter shared by providers with the same api key and chain, None if api has no quota."""
+        if not self.rate_limit:
+            return None
+
+        # apis of other chains are separate services with their own quotas
+        title = self.title if self.chain == Chain.ETHEREUM else f"{self.title}:{self.chain.value}"
+        return get_rate_limiter(title, self.get_secret(), self.rate_limit, self.rate_limit_burst)
+
+    def is_rate_limited(self) -> bool:
+        """Check if request quota is exhausted for longer than rate_limit_wait."""
+        rate_limiter = self.rate_limiter
+        return rate_limiter is not None and rate_limiter.time_until_available() > self.rate_limit_wait
+
+    def _rate_limit_delay(self) -> Optional[float]:
+        """Take token of rate limiter. Returns time in seconds to wait before request or None if quota is exhausted."""
+        rate_limiter = self.rate_limiter
+        return 0.0 if rate_limiter is None else rate_limiter.reserve(self.rate_limit_wait)
+
+    def _is_rate_limited_response_data(self, response_data: dict) -> bool:
+        """Check if api rejected request because quota is exceeded, for apis returning it with status 200.
+
+        :param response_data: decoded response body
+        """
+        return False
+
+    def _on_request(self, outcome: RequestOutcome, started_at: Optional[float], attempt: int) -> None:
+        """Report outcome of request attempt to log and hooks.
+
+        :param outcome: result of request
+        :param started_at: time of request start (``time.perf_counter``), None if request was not sent
+        :param attempt: number of attempt, starting from 0
+        """
+        # only api rejection means that local quota is out of sync with api, exhausted local quota is already empty
+        if outcome == RequestOutcome.RATE_LIMITED and started_at is not None and self.rate_limiter is not None:
+            self.rate_limiter.drain()
+
+        if outcome != RequestOutcome.SUCCESS:
+            logger.debug("%s request attempt %s failed: %s", self.title, attempt, outcome.value)
+
+        if self.hooks is not None:
+            latency = None if started_at is None else time.perf_counter() - started_at
+            self.hooks.on_request(self.title, outcome, latency, attempt)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Get delay before retry with "full jitter" exponential backoff.
+
+        :param attempt: number of retry, starting from 1
+        """
+        return random.uniform(0, self.backoff_factor * 2 ** (attempt - 1))  # nosec
+
+    def _request_params(self) -> Dict[str, Any]:
+        """Get url and query params of request to api."""
+        return {"url": self.api_url}
+
+    def _is_valid_response_data(self, response_data: dict) -> bool:
+        """Check response data status returned by api.
+
+        :param response_data: decoded response body
+        """
+        return True
+
+    def _check_response(self, response: Response) -> Tuple[RequestOutcome, dict]:
+        """Decode and validate response. Returns outcome of request and response data.
+
+        :param response: response from api
+        """
+        if response.status_code == 429:
+            return RequestOutcome.RATE_LIMITED, {}
+        elif response.status_code != 200:
+            return RequestOutcome.BAD_STATUS, {}
+
+        try:
+            response_data = self.decoder.decode(response.content)
+        except ValueError:
+            return RequestOutcome.JSON_ERROR, {}
+
+        if self._is_valid_response_data(response_data):
+            return RequestOutcome.SUCCESS, response_data
+        elif self._is_rate_limited_response_data(response_data):
+            return RequestOutcome.RATE_LIMITED, {}
+
+        return RequestOutcome.INVALID_RESPONSE, {}
+
+    def _proceed_response(self, response: Response) -> Tuple[bool, dict]:
+        """Decode and validate response.
+
+        :param response: response from api
+        """
+        outcome, response_data = self._check_response(response)
+        return outcome == RequestOutcome.SUCCESS, response_data
 
     @abstractmethod
     def request(self):
@@ -49,24 +262,137 @@ class BaseAPIGaspriceProvider(BaseGaspriceProvider, ABC):
     def _proceed_response_data(self, *args, **kwargs):
         pass
 
+    def _proceed_fee_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[Eip1559Fee]]:
+        """Get EIP-1559 fee suggestions from response.
+
+        :param response_data: decoded response body
+        """
+        return self._fee_template
+
+    def _proceed_fee_response(
+        self, success: bool, response_data: dict
+    ) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        data = self._proceed_fee_data(response_data) if success else self._fee_template
+        return success and any(fee is not None for fee in data.values()), data
+
 
 class BaseSyncAPIGaspriceProvider(BaseAPIGaspriceProvider, ABC):
     def __init__(self, *, secret: Optional[str] = None, client: Optional[Client] = None, **kwargs):
         super().__init__(secret=secret, **kwargs)
         self.client: Optional[Client] = client
 
-    def get_gasprice(self) -> Tuple[bool, Dict[GaspriceStrategy, Dict[str, int]]]:
+    def request(self) -> Tuple[bool, dict]:
+        """Make request to API.
+
+        Request is retried after network errors and retryable status codes. Every attempt takes request quota,
+        request is not sent if quota is exhausted.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self._retry_delay(attempt))
+
+            delay = self._rate_limit_delay()
+
+            if delay is None:
+                self._on_request(RequestOutcome.RATE_LIMITED, None, attempt)
+                break
+            elif delay:
+                time.sleep(delay)
+
+            started_at = time.perf_counter()
+
+            try:
+                response = self.client.get(timeout=self.timeout, **self._request_params())
+            except TimeoutException:
+                self._on_request(RequestOutcome.TIMEOUT, started_at, attempt)
+                continue
+            except HTTPError:
+                self._on_request(RequestOutcome.HTTP_ERROR, started_at, attempt)
+                continue
+            except Exception:
+                logger.warning("%s request failed", self.title, exc_info=True)
+                self._on_request(RequestOutcome.ERROR, started_at, attempt)
+                break
+
+            outcome, response_data = self._check_response(response)
+            self._on_request(outcome, started_at, attempt)
+
+            if response.status_code in self.retry_status_codes:
+                continue
+
+            return outcome == RequestOutcome.SUCCESS, response_data
+
+        return False, {}
+
+    def get_gasprice(self) -> Tuple[bool, GaspriceSnapshot]:
         """Get gasprice from provider and prepare data."""
         success, response_data = self.request()
         return success, self._proceed_response_data(response_data)
 
+    def get_fees(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions from provider and prepare data."""
+        if not self.supports_eip1559:
+            return False, self._fee_template
+
+        return self._proceed_fee_response(*self.request())
 
-class BaseAsyncAPIGaspriceProvider(BaseAPIGaspriceProvider, ABC):
+
+class BaseAsyncAPIGaspriceProvider(BaseAPIGaspriceProvider, BaseAsyncGaspriceProvider, ABC):
     def __init__(self, *, secret: Optional[str] = None, client: Optional[AsyncClient] = None, **kwargs):
         super().__init__(secret=secret, **kwargs)
         self.client: Optional[AsyncClient] = client
 
-    async def get_gasprice(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[int]]]:
+    async def request(self) -> Tuple[bool, dict]:
+        """Make request to API.
+
+        Request is retried after network errors and retryable status codes. Every attempt takes request quota,
+        request is not sent if quota is exhausted.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self._retry_delay(attempt))
+
+            delay = self._rate_limit_delay()
+
+            if delay is None:
+                self._on_request(RequestOutcome.RATE_LIMITED, None, attempt)
+                break
+            elif delay:
+                await asyncio.sleep(delay)
+
+            started_at = time.perf_counter()
+
+            try:
+                response = await self.client.get(timeout=self.timeout, **self._request_params())
+            except TimeoutException:
+                self._on_request(RequestOutcome.TIMEOUT, started_at, attempt)
+                continue
+            except HTTPError:
+                self._on_request(RequestOutcome.HTTP_ERROR, started_at, attempt)
+                continue
+            except Exception:
+                logger.warning("%s request failed", self.title, exc_info=True)
+                self._on_request(RequestOutcome.ERROR, started_at, attempt)
+                break
+
+            outcome, response_data = self._check_response(response)
+            self._on_request(outcome, started_at, attempt)
+
+            if response.status_code in self.retry_status_codes:
+                continue
+
+            return outcome == RequestOutcome.SUCCESS, response_data
+
+        return False, {}
+
+    async def get_gasprice(self) -> Tuple[bool, GaspriceSnapshot]:
         """Get gasprice from provider and prepare data."""
         success, response_data = await self.request()
         return success, self._proceed_response_data(response_data)
+
+    async def get_fees(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions from provider and prepare data."""
+        if not self.supports_eip1559:
+            return False, self._fee_template
+
+        return self._proceed_fee_response(*await self.request())
@@ -1,60 +1,76 @@
-from typing import Dict, Optional, Tuple
+from decimal import Decimal
+from typing import Any, Dict, Optional
 
 from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.decoding import JsonScalar
+from ethereum_gasprice.fees import Eip1559Fee
 from ethereum_gasprice.providers.base import BaseAsyncAPIGaspriceProvider, BaseSyncAPIGaspriceProvider
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 __all__ = ["EtherchainProvider", "AsyncEtherchainProvider"]
 
 
 class EtherchainProvider(BaseSyncAPIGaspriceProvider):
-    """Provider for Etherscan Gas Tracker (https://etherscan.io/gasTracker)"""
+    """Provider for Etherchain Gasprice Oracle (https://www.etherchain.org/tools/gasPriceOracle)
+
+    Since London fork oracle returns priority fees with current and recommended base fees.
+    """
 
     title: str = "etherchain"
     api_url: str = "https://www.etherchain.org/api/gasPriceOracle"
+    supports_eip1559: bool = True
+
+    _strategy_fields = {
+        GaspriceStrategy.SLOW: "safeLow",
+        GaspriceStrategy.REGULAR: "standard",
+        GaspriceStrategy.FAST: "fast",
+        GaspriceStrategy.FASTEST: "fastest",
+    }
+    response_schema: Optional[Dict[str, Any]] = {
+        **{field: JsonScalar for field in _strategy_fields.values()},
+        "currentBaseFee": JsonScalar,
+        "recommendedBaseFee": JsonScalar,
+    }
+
+    def _proceed_response_data(self, response_data: dict) -> GaspriceSnapshot:
+        """Unify data from response."""
+        if not response_data:
+            return self._data_template
 
-    def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = self.client.get(url=self.api_url)
-            response_data = response.json()
+        base_fee = response_data.get("currentBaseFee")
+        values = [response_data.get(field) for field in self._strategy_fields.values()]
 
-            if response.status_code == 200:
-                return True, response_data
+        # legacy gasprice is base fee plus priority fee
+        if base_fee is not None:
+            values = [None if value is None else Decimal(str(base_fee)) + Decimal(str(value)) for value in values]
 
-        except Exception:
-            pass
+        return GaspriceSnapshot(*values, source=self.title)
 
-        return False, {}
+    def _proceed_fee_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[Eip1559Fee]]:
+        """Get EIP-1559 fees from response."""
+        data = self._fee_template
 
-    def _proceed_response_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[int]]:
-        """Unify data from response."""
-        data = self._data_template.copy()
-
-        if not response_data:
+        if not response_data or response_data.get("currentBaseFee") is None:
             return data
 
-        data.update(
-            {
-                GaspriceStrategy.SLOW: response_data.get("safeLow"),
-                GaspriceStrategy.REGULAR: response_data.get("standard"),
-                GaspriceStrategy.FAST: response_data.get("fast"),
-                GaspriceStrategy.FASTEST: response_data.get("fastest"),
-            }
-        )
-        return data
+        base_fee = response_data["currentBaseFee"]
+        max_base_fee = response_data.get("recommendedBaseFee")
 
+        for strategy, field in self._strategy_fields.items():
+            priority_fee = response_data.get(field)
 
-class AsyncEtherchainProvider(BaseAsyncAPIGaspriceProvider, EtherchainProvider):
-    async def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = await self.client.get(url=self.api_url)
-            response_data = response.json()
+            if priority_fee is None:
+                continue
+
+            fee = Eip1559Fee.from_base_fee(base_fee, priority_fee)
+
+            if max_base_fee is not None:
+                fee = fee._replace(max_fee_per_gas=Decimal(str(max_base_fee)) + fee.max_priority_fee_per_gas)
 
-            if response.status_code == 200:
-                return True, response_data
+            data[strategy] = fee
+
+        return data
 
-        except Exception:
-            pass
 
-        return False, {}
+class AsyncEtherchainProvider(BaseAsyncAPIGaspriceProvider, EtherchainProvider):
+    """Async version of provider, uses httpx.AsyncClient."""
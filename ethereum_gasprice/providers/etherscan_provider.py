@@ -1,7 +1,10 @@
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
 
-from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.consts import Chain, GaspriceStrategy
+from ethereum_gasprice.decoding import JsonScalar
+from ethereum_gasprice.fees import Eip1559Fee
 from ethereum_gasprice.providers.base import BaseAsyncAPIGaspriceProvider, BaseSyncAPIGaspriceProvider
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 __all__ = ["EtherscanProvider", "AsyncEtherscanProvider"]
 
@@ -12,53 +15,68 @@ class EtherscanProvider(BaseSyncAPIGaspriceProvider):
     title: str = "etherscan"
     api_url: str = "https://api.etherscan.io/api/"
     secret_env_var_title: str = "ETHGASPRICE_ETHERSCAN_SECRET"
+    supports_eip1559: bool = True
+    #: quota of free api plan
+    rate_limit: Optional[float] = 5.0
+    #: result is gas oracle object or error message
+    response_schema: Optional[Dict[str, Any]] = {
+        "status": Optional[str],
+        "result": Optional[Union[Dict[str, JsonScalar], str]],
+    }
+    chains: Optional[Tuple[Chain, ...]] = (Chain.ETHEREUM, Chain.POLYGON, Chain.BSC)
+    #: explorers of Etherscan family with the same gas tracker api
+    chain_api_urls: Dict[Chain, str] = {
+        Chain.POLYGON: "https://api.polygonscan.com/api",
+        Chain.BSC: "https://api.bscscan.com/api",
+    }
+
+    def _request_params(self) -> Dict[str, Any]:
+        """Get url and query params of request to api."""
+        return {
+            "url": self.api_url,
+            "params": {"module": "gastracker", "action": "gasoracle", "apikey": self.get_secret()},
+        }
+
+    def _is_valid_response_data(self, response_data: dict) -> bool:
+        """Check response data status returned by api."""
+        return response_data.get("status") == "1"
+
+    def _is_rate_limited_response_data(self, response_data: dict) -> bool:
+        """Etherscan rejects requests over quota with status 0 and "Max rate limit reached" result."""
+        return response_data.get("status") == "0" and "rate limit" in str(response_data.get("result", "")).lower()
+
+    def _proceed_response_data(self, response_data: dict) -> GaspriceSnapshot:
+        """Unify data from response."""
+        if not response_data:
+            return self._data_template
+
+        result = response_data["result"]
+        return GaspriceSnapshot(
+            regular=result.get("SafeGasPrice"),
+            fast=result.get("ProposeGasPrice"),
+            fastest=result.get("FastGasPrice"),
+            source=self.title,
+        )
 
-    def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = self.client.get(
-                url=self.api_url, params={"module": "gastracker", "action": "gasoracle", "apikey": self.get_secret()}
-            )
-            response_data = response.json()
-
-            if response.status_code == 200 and response_data.get("status") == "1":
-                return True, response_data
-
-        except Exception:
-            pass
+    def _proceed_fee_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[Eip1559Fee]]:
+        """Get EIP-1559 fees from response.
 
-        return False, {}
+        Gasprices of Etherscan include base fee, so priority fee is a difference between gasprice and
+        suggested base fee.
+        """
+        data = self._fee_template
 
-    def _proceed_response_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[int]]:
-        """Unify data from response."""
-        data = self._data_template.copy()
+        base_fee = response_data.get("result", {}).get("suggestBaseFee") if response_data else None
 
-        if not response_data:
+        if base_fee is None:
             return data
 
-        data.update(
-            {
-                GaspriceStrategy.REGULAR: response_data["result"].get("SafeGasPrice"),
-                GaspriceStrategy.FAST: response_data["result"].get("ProposeGasPrice"),
-                GaspriceStrategy.FASTEST: response_data["result"].get("FastGasPrice"),
-            }
-        )
+        for strategy, gasprice in self._proceed_response_data(response_data).items():
+            if gasprice is not None:
+                data[strategy] = Eip1559Fee.from_gasprice(base_fee, gasprice)
+
         return data
 
 
 class AsyncEtherscanProvider(BaseAsyncAPIGaspriceProvider, EtherscanProvider):
-    async def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = await self.client.get(
-                url=self.api_url, params={"module": "gastracker", "action": "gasoracle", "apikey": self.get_secret()}
-            )
-            response_data = response.json()
-
-            if response.status_code == 200 and response_data.get("status") == "1":
-                return True, response_data
-
-        except Exception:
-            pass
-
-        return False, {}
+    """Async version of provider, uses httpx.AsyncClient."""
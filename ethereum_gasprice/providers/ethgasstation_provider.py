@@ -1,7 +1,8 @@
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
-from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.decoding import JsonScalar
 from ethereum_gasprice.providers.base import BaseAsyncAPIGaspriceProvider, BaseSyncAPIGaspriceProvider
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 __all__ = ["EthGasStationProvider", "AsyncEthGasStationProvider"]
 
@@ -13,53 +14,22 @@ class EthGasStationProvider(BaseSyncAPIGaspriceProvider):
     api_url: str = "https://ethgasstation.info/api/ethgasAPI.json"
     secret_env_var_title: str = "ETHGASPRICE_ETHGASSTATION_SECRET"
 
-    def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = self.client.get(url=self.api_url, params={"api-key": self.get_secret()})
-            response_data = response.json()
+    def _request_params(self) -> Dict[str, Any]:
+        """Get url and query params of request to api."""
+        return {"url": self.api_url, "params": {"api-key": self.get_secret()}}
 
-            if response.status_code == 200:
-                return True, response_data
-
-        except Exception:
-            pass
-
-        return False, {}
-
-    def _proceed_response_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[int]]:
-        """Unify data from response."""
-        data = self._data_template.copy()
+    _strategy_fields: Tuple[str, ...] = ("safeLow", "average", "fast", "fastest")
+    #: gasPriceRange table and wait times are not decoded
+    response_schema: Optional[Dict[str, Any]] = {field: JsonScalar for field in _strategy_fields}
 
+    def _proceed_response_data(self, response_data: dict) -> GaspriceSnapshot:
+        """Unify data from response. Api returns gasprices in tenths of gwei."""
         if not response_data:
-            return data
-
-        data.update(
-            {
-                GaspriceStrategy.SLOW: response_data.get("safeLow"),
-                GaspriceStrategy.REGULAR: response_data.get("average"),
-                GaspriceStrategy.FAST: response_data.get("fast"),
-                GaspriceStrategy.FASTEST: response_data.get("fastest"),
-            }
-        )
+            return self._data_template
 
-        for k, v in data.items():
-            data[k] = int(v) // 10 if v else None
-
-        return data
+        values = (response_data.get(field) for field in self._strategy_fields)
+        return GaspriceSnapshot(*(int(value) // 10 if value else None for value in values), source=self.title)
 
 
 class AsyncEthGasStationProvider(BaseAsyncAPIGaspriceProvider, EthGasStationProvider):
-    async def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = await self.client.get(url=self.api_url, params={"api-key": self.get_secret()})
-            response_data = response.json()
-
-            if response.status_code == 200:
-                return True, response_data
-
-        except Exception:
-            pass
-
-        return False, {}
+    """Async version of provider, uses httpx.AsyncClient."""
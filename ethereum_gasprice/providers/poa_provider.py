@@ -1,60 +1,39 @@
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional
 
-from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.decoding import JsonScalar
 from ethereum_gasprice.providers.base import BaseAsyncAPIGaspriceProvider, BaseSyncAPIGaspriceProvider
+from ethereum_gasprice.snapshot import GaspriceSnapshot
 
 __all__ = ["PoaProvider", "AsyncPoaProvider"]
 
 
 class PoaProvider(BaseSyncAPIGaspriceProvider):
-    """Provider for Etherscan Gas Tracker (https://etherscan.io/gasTracker)"""
+    """Provider for POA Network gasprice oracle (https://gasprice.poa.network/)"""
 
-    title: str = "etherchain"
+    title: str = "poa"
     api_url: str = "https://gasprice.poa.network/"
+    response_schema: Optional[Dict[str, Any]] = {
+        "health": Optional[bool],
+        **{field: JsonScalar for field in ("slow", "standard", "fast", "instant")},
+    }
 
-    def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = self.client.get(url=self.api_url)
-            response_data = response.json()
+    def _is_valid_response_data(self, response_data: dict) -> bool:
+        """Check response data status returned by api."""
+        return response_data.get("health") is True
 
-            if response.status_code == 200 and response_data.get("health") is True:
-                return True, response_data
-
-        except Exception:
-            pass
-
-        return False, {}
-
-    def _proceed_response_data(self, response_data: dict) -> Dict[GaspriceStrategy, Optional[int]]:
+    def _proceed_response_data(self, response_data: dict) -> GaspriceSnapshot:
         """Unify data from response."""
-        data = self._data_template.copy()
-
         if not response_data:
-            return data
-
-        data.update(
-            {
-                GaspriceStrategy.SLOW: response_data.get("slow"),
-                GaspriceStrategy.REGULAR: response_data.get("standard"),
-                GaspriceStrategy.FAST: response_data.get("fast"),
-                GaspriceStrategy.FASTEST: response_data.get("instant"),
-            }
+            return self._data_template
+
+        return GaspriceSnapshot(
+            slow=response_data.get("slow"),
+            regular=response_data.get("standard"),
+            fast=response_data.get("fast"),
+            fastest=response_data.get("instant"),
+            source=self.title,
         )
-        return data
 
 
 class AsyncPoaProvider(BaseAsyncAPIGaspriceProvider, PoaProvider):
-    async def request(self) -> Tuple[bool, dict]:
-        """Make request to API."""
-        try:
-            response = await self.client.get(url=self.api_url)
-            response_data = response.json()
-
-            if response.status_code == 200 and response_data.get("health") is True:
-                return True, response_data
-
-        except Exception:
-            pass
-
-        return False, {}
+    """Async version of provider, uses httpx.AsyncClient."""
@@ -1,26 +1,57 @@
-from typing import Dict, Optional, Tuple
+import inspect
+import threading
+from decimal import Decimal
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
 
-from eth_utils import currency
-from web3 import HTTPProvider, IPCProvider, Web3, WebsocketProvider
+from ethereum_gasprice.consts import Chain, EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.fee_history import FeeHistoryEstimator
+from ethereum_gasprice.fees import Eip1559Fee
+from ethereum_gasprice.providers.base import BaseAsyncGaspriceProvider, BaseGaspriceProvider
+from ethereum_gasprice.snapshot import GaspriceSnapshot
+from ethereum_gasprice.units import from_wei
 
-from ethereum_gasprice.consts import GaspriceStrategy
-from ethereum_gasprice.providers.base import BaseGaspriceProvider
+if TYPE_CHECKING:
+    from web3 import Web3
 
-__all__ = ["Web3Provider"]
+__all__ = ["Web3Provider", "AsyncWeb3Provider"]
 
 
 class Web3Provider(BaseGaspriceProvider):
-    """Provider for Web3 RPC."""
+    """Provider for Web3 RPC.
+
+    Connection to node is created on first call and reused while it is healthy. After failed call connection is
+    dropped and call is retried once with new connection.
+    """
 
     title = "web3"
     secret_env_var_title: str = "ETHGASPRICE_WEB3_SECRET"
+    supports_eip1559: bool = True
+    #: node of any EVM chain can be used
+    chains: Optional[Tuple[Chain, ...]] = None
 
-    def _init_web3(self) -> Optional["Web3"]:
-        web_provider = self.get_secret()
+    def __init__(self, secret: Optional[str] = None, *, fee_history_blocks: Optional[int] = None, **kwargs):
+        """
+        :param secret: node uri
+        :param fee_history_blocks: if passed, fees of all strategies are estimated locally from ``eth_feeHistory``
+            of this number of latest blocks
+        """
+        if find_spec("web3") is None:
+            raise ImportError("web3 is not installed, install ethereum-gasprice[web3]")
 
-        if not web_provider:
-            return None
-        elif web_provider.startswith("http"):
+        super().__init__(secret=secret, **kwargs)
+        self.fee_history_blocks: Optional[int] = fee_history_blocks
+        self.fee_history: Optional[FeeHistoryEstimator] = None
+
+        self._web3: Any = None
+        self._web3_uri: Optional[str] = None
+        self._web3_lock = threading.Lock()
+
+    def _init_web3(self, web_provider: str) -> Optional["Web3"]:
+        # web3 takes longer to import than the rest of the package, it is imported on first connection
+        from web3 import HTTPProvider, IPCProvider, Web3, WebsocketProvider
+
+        if web_provider.startswith("http"):
             return Web3(HTTPProvider(web_provider))
         elif web_provider.startswith("ws"):
             return Web3(WebsocketProvider(web_provider))
@@ -29,17 +60,220 @@ class Web3Provider(BaseGaspriceProvider):
         else:
             return None
 
-    def get_gasprice(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[int]]]:
+    @staticmethod
+    def _is_connected(web3: Any) -> Any:
+        """Check connection to node, result is awaitable for async web3."""
+        is_connected = getattr(web3, "is_connected", None) or web3.isConnected
+        return is_connected()
+
+    def _get_web3(self) -> Optional["Web3"]:
+        """Get cached connection to node or connect to it."""
+        web_provider = self.get_secret()
+
+        if not web_provider:
+            return None
+
+        with self._web3_lock:
+            if self._web3 is None or self._web3_uri != web_provider:
+                web3 = self._init_web3(web_provider)
+
+                if web3 is None or not self._is_connected(web3):
+                    return None
+
+                self._web3, self._web3_uri = web3, web_provider
+
+            return self._web3
+
+    def _drop_web3(self, web3: Any) -> None:
+        """Forget failed connection, next call creates new one."""
+        with self._web3_lock:
+            if self._web3 is web3:
+                self._web3 = None
+
+    @staticmethod
+    def _gasprice(gasprice: int) -> Union[int, Decimal]:
+        return from_wei(gasprice, EthereumUnit.GWEI)
+
+    def _fee_history_gasprices(
+        self, fees: Dict[GaspriceStrategy, Optional[Eip1559Fee]]
+    ) -> Tuple[bool, GaspriceSnapshot]:
+        """Get legacy gasprices from fee history estimate: base fee of next block plus priority fee."""
+        data = GaspriceSnapshot.from_mapping(
+            {
+                strategy: fee.base_fee_per_gas + fee.max_priority_fee_per_gas
+                for strategy, fee in fees.items()
+                if fee is not None
+            },
+            source=self.title,
+        )
+
+        return any(value is not None for value in data.values()), data
+
+    def _init_fee_history(self, web3: Any) -> FeeHistoryEstimator:
+        if self.fee_history is None:
+            self.fee_history = FeeHistoryEstimator(web3.provider.make_request, block_count=self.fee_history_blocks)
+        else:
+            self.fee_history.make_request = web3.provider.make_request
+
+        return self.fee_history
+
+    def _update_fee_history(self, web3: "Web3") -> Optional[Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Fetch new blocks into fee history window and get estimate. Returns None if estimator is disabled."""
+        if not self.fee_history_blocks:
+            return None
+
+        fee_history = self._init_fee_history(web3)
+        fee_history.update()
+        return fee_history.estimate()
+
+    def _request_gasprice(self, web3: "Web3") -> Tuple[bool, GaspriceSnapshot]:
+        fees = self._update_fee_history(web3)
+
+        if fees is not None:
+            return self._fee_history_gasprices(fees)
+
+        return True, GaspriceSnapshot(regular=self._gasprice(web3.eth.gas_price), source=self.title)
+
+    def _request_fees(self, web3: "Web3") -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        data = self._fee_template
+        fees = self._update_fee_history(web3)
+
+        if fees is not None:
+            return any(fee is not None for fee in fees.values()), fees
+
+        base_fee = web3.eth.get_block("latest").get("baseFeePerGas")
+
+        if base_fee is None:
+            return False, data
+
+        data[GaspriceStrategy.REGULAR] = Eip1559Fee.from_base_fee(
+            from_wei(base_fee, EthereumUnit.GWEI), from_wei(web3.eth.max_priority_fee, EthereumUnit.GWEI)
+        )
+
+        return True, data
+
+    def _call_node(self, request, template: Dict) -> Tuple[bool, Dict]:
+        """Make request with cached connection, reconnect and retry once if it failed."""
+        for _ in range(2):
+            web3 = self._get_web3()
+
+            if web3 is None:
+                break
+
+            try:
+                return request(web3)
+            except Exception:
+                self._drop_web3(web3)
+
+        return False, template
+
+    def get_gasprice(self) -> Tuple[bool, GaspriceSnapshot]:
         """Get gasprice from provider and prepare data."""
-        success = False
-        data = self._data_template.copy()
+        return self._call_node(self._request_gasprice, self._data_template)
+
+    def get_fees(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions.
+
+        Without fee history only regular strategy is filled from base fee of latest block and node priority fee
+        suggestion.
+        """
+        return self._call_node(self._request_fees, self._fee_template)
+
+
+class AsyncWeb3Provider(BaseAsyncGaspriceProvider, Web3Provider):
+    """Async version of provider, uses web3 AsyncHTTPProvider. Only http node uri is supported."""
+
+    def _init_web3(self, web_provider: str) -> Any:
+        if not web_provider.startswith("http"):
+            return None
+
+        from web3 import AsyncHTTPProvider, Web3
+
+        try:
+            from web3 import AsyncWeb3
+        except ImportError:  # web3 < 6
+            from web3.eth import AsyncEth
+        else:
+            return AsyncWeb3(AsyncHTTPProvider(web_provider))
+
+        return Web3(AsyncHTTPProvider(web_provider), modules={"eth": (AsyncEth,)}, middlewares=[])
+
+    async def _get_web3(self) -> Any:
+        web_provider = self.get_secret()
+
+        if not web_provider:
+            return None
+
+        if self._web3 is None or self._web3_uri != web_provider:
+            web3 = self._init_web3(web_provider)
+
+            if web3 is None:
+                return None
+
+            is_connected = self._is_connected(web3)
 
-        web3 = self._init_web3()
+            if inspect.isawaitable(is_connected):
+                is_connected = await is_connected
 
-        if not web3:
-            return success, data
+            if not is_connected:
+                return None
 
-        data[GaspriceStrategy.REGULAR] = int(currency.from_wei(web3.eth.gasPrice, "gwei"))
-        success = True
+            self._web3, self._web3_uri = web3, web_provider
+
+        return self._web3
+
+    async def _update_fee_history(self, web3: Any) -> Optional[Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        if not self.fee_history_blocks:
+            return None
+
+        fee_history = self._init_fee_history(web3)
+        await fee_history.aupdate()
+        return fee_history.estimate()
+
+    async def _request_gasprice(self, web3: Any) -> Tuple[bool, GaspriceSnapshot]:
+        fees = await self._update_fee_history(web3)
+
+        if fees is not None:
+            return self._fee_history_gasprices(fees)
+
+        return True, GaspriceSnapshot(regular=self._gasprice(await web3.eth.gas_price), source=self.title)
+
+    async def _request_fees(self, web3: Any) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        data = self._fee_template
+        fees = await self._update_fee_history(web3)
+
+        if fees is not None:
+            return any(fee is not None for fee in fees.values()), fees
+
+        base_fee = (await web3.eth.get_block("latest")).get("baseFeePerGas")
+
+        if base_fee is None:
+            return False, data
+
+        data[GaspriceStrategy.REGULAR] = Eip1559Fee.from_base_fee(
+            from_wei(base_fee, EthereumUnit.GWEI), from_wei(await web3.eth.max_priority_fee, EthereumUnit.GWEI)
+        )
+
+        return True, data
+
+    async def _call_node(self, request, template: Dict) -> Tuple[bool, Dict]:
+        for _ in range(2):
+            web3 = await self._get_web3()
+
+            if web3 is None:
+                break
+
+            try:
+                return await request(web3)
+            except Exception:
+                self._drop_web3(web3)
+
+        return False, template
+
+    async def get_gasprice(self) -> Tuple[bool, GaspriceSnapshot]:
+        """Get gasprice from provider and prepare data."""
+        return await self._call_node(self._request_gasprice, self._data_template)
 
-        return success, data
+    async def get_fees(self) -> Tuple[bool, Dict[GaspriceStrategy, Optional[Eip1559Fee]]]:
+        """Get EIP-1559 fee suggestions."""
+        return await self._call_node(self._request_fees, self._fee_template)
@@ -0,0 +1,99 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+__all__ = ["TokenBucket", "get_rate_limiter"]
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    Bucket is refilled with ``rate`` tokens per second up to ``capacity``, every request takes one token.
+    It is thread-safe and never blocks, so it is shared by sync and async providers.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        :param rate: number of requests per second
+        :param capacity: maximal burst of requests, equals to rate by default
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate: float = rate
+        self.capacity: float = max(1.0, capacity if capacity is not None else rate)
+        self.tokens: float = self.capacity
+        self.updated_at: float = self._clock()
+
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} rate={self.rate} tokens={self.tokens:.2f}>"
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until_available(self) -> float:
+        """Get time in seconds until request is allowed, 0 if it is allowed right now."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1 - self.tokens) / self.rate)
+
+    def reserve(self, max_wait: float = 0.0) -> Optional[float]:
+        """Take token for request, which can be sent in the future.
+
+        Returns time in seconds to wait before request or None if it is longer than max_wait and token is not taken.
+        Reserved tokens are taken from the future, so concurrent waiting requests are spread within quota.
+
+        :param max_wait: maximal time in seconds to wait for token
+        """
+        with self._lock:
+            self._refill()
+            delay = max(0.0, (1 - self.tokens) / self.rate)
+
+            if delay > max_wait:
+                return None
+
+            self.tokens -= 1
+            return delay
+
+    def try_acquire(self) -> bool:
+        """Take token for request right now. Returns False if bucket is empty."""
+        return self.reserve() is not None
+
+    def drain(self) -> None:
+        """Take all tokens, e.g. after api responded that quota is exceeded."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+_rate_limiters: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(title: str, secret: Optional[str], rate: float, capacity: Optional[float] = None) -> TokenBucket:
+    """Get rate limiter shared by all providers of the same api with the same api key in current process.
+
+    Limiter is created with settings of the first caller.
+
+    :param title: provider title
+    :param secret: api key
+    :param rate: number of requests per second
+    :param capacity: maximal burst of requests
+    """
+    key = (title, secret)
+
+    with _rate_limiters_lock:
+        rate_limiter = _rate_limiters.get(key)
+
+        if rate_limiter is None:
+            rate_limiter = _rate_limiters[key] = TokenBucket(rate, capacity)
+
+        return rate_limiter
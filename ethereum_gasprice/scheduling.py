@@ -0,0 +1,123 @@
+import random
+import threading
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence, Type
+
+from ethereum_gasprice.providers import BaseGaspriceProvider
+
+__all__ = ["ProviderStats", "ProviderScheduler"]
+
+
+class ProviderStats(NamedTuple):
+    requests: int
+    success_rate: float
+    latency: Optional[float]
+    latency_p50: Optional[float]
+    latency_p95: Optional[float]
+
+
+class _ProviderHealth:
+    __slots__ = ("requests", "success_rate", "latency", "latencies")
+
+    def __init__(self, window: int):
+        self.requests: int = 0
+        self.success_rate: float = 1.0
+        self.latency: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+
+class ProviderScheduler:
+    """Order providers by their recent latency and success rate.
+
+    Latency and success rate of every provider are exponentially weighted moving averages, latency percentiles
+    are calculated over sliding window of last requests. Provider score is expected time lost on it: average latency
+    plus failure rate multiplied by ``failure_penalty``. Providers without requests are tried first. With
+    ``exploration`` probability random provider is moved to the front of the chain, so recovered provider gets new
+    measurements and is re-ranked.
+    """
+
+    def __init__(
+        self, *, alpha: float = 0.2, exploration: float = 0.05, window: int = 100, failure_penalty: float = 1.0
+    ):
+        """
+        :param alpha: weight of new request in moving averages
+        :param exploration: probability of trying random provider first
+        :param window: number of last requests to calculate latency percentiles
+        :param failure_penalty: time in seconds, which failed request costs in addition to its latency
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+
+        if not 0 <= exploration <= 1:
+            raise ValueError("exploration must be in [0, 1]")
+
+        self.alpha: float = alpha
+        self.exploration: float = exploration
+        self.window: int = window
+        self.failure_penalty: float = failure_penalty
+
+        self._health: Dict[str, _ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def record(self, title: str, latency: float, success: bool) -> None:
+        """Record result of request to provider.
+
+        :param title: provider title
+        :param latency: request duration in seconds
+        :param success: provider returned valid data
+        """
+        with self._lock:
+            health = self._health.get(title)
+
+            if health is None:
+                health = self._health[title] = _ProviderHealth(self.window)
+
+            health.requests += 1
+            health.success_rate += self.alpha * (success - health.success_rate)
+            health.latency = (
+                latency if health.latency is None else health.latency + self.alpha * (latency - health.latency)
+            )
+            health.latencies.append(latency)
+
+    def _score(self, title: str) -> float:
+        health = self._health.get(title)
+
+        if health is None or health.latency is None:
+            return 0.0
+
+        return health.latency + (1 - health.success_rate) * self.failure_penalty
+
+    def order(self, providers: Sequence[Type[BaseGaspriceProvider]]) -> List[Type[BaseGaspriceProvider]]:
+        """Get providers sorted from the best to the worst, equal providers keep given order.
+
+        :param providers: provider classes in configured order
+        """
+        ordered = sorted(providers, key=lambda provider: self._score(provider.title))
+
+        if len(ordered) > 1 and random.random() < self.exploration:  # nosec
+            ordered.insert(0, ordered.pop(random.randrange(1, len(ordered))))  # nosec
+
+        return ordered
+
+    @staticmethod
+    def _percentile(values: Sequence[float], percentile: float) -> Optional[float]:
+        if not values:
+            return None
+
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+    @property
+    def stats(self) -> Dict[str, ProviderStats]:
+        """Health statistics of providers, key is provider title."""
+        with self._lock:
+            return {
+                title: ProviderStats(
+                    requests=health.requests,
+                    success_rate=health.success_rate,
+                    latency=health.latency,
+                    latency_p50=self._percentile(health.latencies, 0.5),
+                    latency_p95=self._percentile(health.latencies, 0.95),
+                )
+                for title, health in self._health.items()
+            }
@@ -0,0 +1,460 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ethereum_gasprice.aggregation import AggregatedGasprice, GaspriceAggregator
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.logger import logger
+from ethereum_gasprice.poller import AsyncGaspricePoller, PollerSnapshot
+
+__all__ = ["GaspriceServer"]
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+#: maximal size of request body and number of requests in batch
+_MAX_BODY_SIZE = 65536
+_MAX_BATCH_SIZE = 100
+
+
+class _Rendered(NamedTuple):
+    """Json bodies of all resources for one snapshot of poller."""
+
+    version: int
+    etag: str
+    bodies: Dict[str, bytes]
+
+
+class _Response(NamedTuple):
+    status: int
+    body: bytes = b""
+    etag: Optional[str] = None
+
+
+def _dumps(value: Any) -> bytes:
+    # fractional gwei is exact decimal, it is sent as string
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+def _error(status: int, message: str) -> _Response:
+    return _Response(status, _dumps({"error": message}))
+
+
+class GaspriceServer:
+    """Local http api serving gasprices of async poller, so services share one poller and one upstream quota.
+
+    Bodies of all resources are rendered once when poller publishes changed gasprices, reads only send prepared bytes.
+    Every response of resource has ``ETag`` of snapshot version, request with matching ``If-None-Match`` gets 304.
+    Such request with ``wait`` query parameter is long-poll: response is delayed until gasprices change or ``wait``
+    seconds pass. Forecasts are updated on every poll, even if gasprices are the same, so they are rendered once per
+    poll on first read and have ETag of their own version.
+
+    * ``GET /v1/gasprices`` - consensus gasprices of all strategies with providers used for them
+    * ``GET /v1/gasprices/<strategy>`` - consensus gasprice of strategy
+    * ``GET /v1/providers`` - gasprices of every provider, failed provider has empty object
+    * ``GET /v1/providers/<title>`` - gasprices of provider
+    * ``GET /v1/forecasts`` - forecasts of poller forecaster
+    * ``POST /v1/batch`` - several resources of the same snapshot, body is ``{"requests": ["/v1/gasprices", ...]}``
+    * ``GET /health`` - 200 when gasprices are fresh, 503 otherwise
+    """
+
+    def __init__(
+        self,
+        poller: AsyncGaspricePoller,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        unix_path: Optional[str] = None,
+        max_wait: float = 30.0,
+        max_age: Optional[float] = None,
+        keepalive_timeout: float = 75.0,
+    ):
+        """
+        :param poller: async poller, it is started and stopped with server
+        :param host: address to listen on
+        :param port: port to listen on, 0 chooses free port
+        :param unix_path: path of unix socket to listen on instead of tcp port
+        :param max_wait: maximal duration of long-poll in seconds
+        :param max_age: age of gasprices in seconds after which health check fails, 3 max poll intervals by default
+        :param keepalive_timeout: time in seconds after which idle connection is closed
+        """
+        self.poller: AsyncGaspricePoller = poller
+        self.host: str = host
+        self.port: int = port
+        self.unix_path: Optional[str] = unix_path
+        self.max_wait: float = max_wait
+        self.max_age: float = max_age if max_age is not None else 3 * poller.max_interval
+        self.keepalive_timeout: float = keepalive_timeout
+        self.aggregator: GaspriceAggregator = poller.aggregator or GaspriceAggregator()
+
+        # etags of previous server run must not match, version of poller starts from 1 again
+        self._instance_id: str = os.urandom(4).hex()
+        self._rendered: Optional[_Rendered] = None
+        # forecasts of poller snapshot and their rendered body
+        self._forecasts: Optional[Tuple[Any, _Rendered]] = None
+        # created in start, event is bound to loop of server on python < 3.10
+        self._changed: Optional[asyncio.Event] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._idle: Set[asyncio.StreamWriter] = set()
+        self._stopping: bool = False
+        self._unsubscribe = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    def _aggregate(self, snapshot: PollerSnapshot) -> AggregatedGasprice:
+        """Get consensus gasprices of snapshot without them, gasprices of providers are served even if it fails."""
+        try:
+            return self.aggregator.aggregate(snapshot.data, self.poller.controller.return_unit)
+        except Exception:
+            logger.exception("gasprice aggregation failed")
+            return AggregatedGasprice(values={strategy: None for strategy in GaspriceStrategy}, sources={})
+
+    def _render(self, snapshot: PollerSnapshot) -> _Rendered:
+        """Render bodies of all resources of snapshot."""
+        meta = {
+            "version": snapshot.version,
+            "timestamp": snapshot.timestamp,
+            "unit": self.poller.controller.return_unit.value,
+        }
+        aggregated = snapshot.aggregated or self._aggregate(snapshot)
+        bodies = {
+            "/v1/gasprices": _dumps(
+                {
+                    **meta,
+                    "gasprices": {strategy.value: value for strategy, value in aggregated.values.items()},
+                    "sources": {strategy.value: sources for strategy, sources in aggregated.sources.items()},
+                }
+            ),
+        }
+
+        for strategy in GaspriceStrategy:
+            bodies[f"/v1/gasprices/{strategy.value}"] = _dumps(
+                {
+                    **meta,
+                    "strategy": strategy.value,
+                    "gasprice": aggregated.values.get(strategy),
+                    "sources": aggregated.sources.get(strategy, ()),
+                }
+            )
+
+        providers = {
+            title: {strategy.value: value for strategy, value in gasprices.items()} if gasprices else {}
+            for title, gasprices in snapshot.data.items()
+        }
+        bodies["/v1/providers"] = _dumps({**meta, "providers": providers})
+
+        for title, gasprices in providers.items():
+            bodies[f"/v1/providers/{title}"] = _dumps({**meta, "provider": title, "gasprices": gasprices})
+
+        return _Rendered(version=snapshot.version, etag=f'"{self._instance_id}-{snapshot.version}"', bodies=bodies)
+
+    def _render_forecasts(self) -> Optional[_Rendered]:
+        """Render forecasts of the latest poll, previous body is reused until poller publishes new forecasts."""
+        snapshot = self.poller.snapshot
+
+        if snapshot is None or snapshot.forecasts is None:
+            return None
+
+        cached = self._forecasts
+
+        # poller replaces forecasts on every poll, so they are compared by identity
+        if cached is not None and cached[0] is snapshot.forecasts:
+            return cached[1]
+
+        version = 1 if cached is None else cached[1].version + 1
+        meta = {
+            "version": snapshot.version,
+            "timestamp": snapshot.timestamp,
+            "unit": self.poller.controller.return_unit.value,
+        }
+        forecasts = {
+            strategy.value: [forecast._asdict() for forecast in strategy_forecasts]
+            for strategy, strategy_forecasts in snapshot.forecasts.items()
+        }
+        rendered = _Rendered(
+            version=version,
+            etag=f'"{self._instance_id}-f{version}"',
+            bodies={"/v1/forecasts": _dumps({**meta, "forecasts": forecasts})},
+        )
+        self._forecasts = (snapshot.forecasts, rendered)
+
+        return rendered
+
+    def _rendered_for(self, path: str) -> Optional[_Rendered]:
+        """Get rendered bodies with resource of path."""
+        if path == "/v1/forecasts" and self._rendered is not None:
+            return self._render_forecasts() or self._rendered
+
+        return self._rendered
+
+    def _on_snapshot(self, snapshot: PollerSnapshot) -> None:
+        """Render new snapshot and wake up long-polls, called by poller in event loop."""
+        try:
+            self._rendered = self._render(snapshot)
+        except Exception:
+            logger.exception("gasprice snapshot rendering failed")
+            return
+
+        changed, self._changed = self._changed, asyncio.Event()
+
+        if changed is not None:
+            changed.set()
+
+    async def start(self) -> None:
+        """Start poller and listen for connections."""
+        self._changed = asyncio.Event()
+        self._unsubscribe = self.poller.subscribe(self._on_snapshot)
+
+        if self.poller.snapshot is not None:
+            self._on_snapshot(self.poller.snapshot)
+
+        self.poller.start()
+
+        if self.unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+        logger.info("gasprice server listens on %s", self.unix_path or f"{self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        """Start server if it is not started and serve until task is cancelled."""
+        if self._server is None:
+            await self.start()
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop listening, close connections and stop poller."""
+        if self._server is None:
+            return
+
+        self._stopping = True
+        self._server.close()
+
+        # idle connections are closed, long-polls are woken up and answer with current gasprices
+        for writer in list(self._idle):
+            writer.close()
+
+        if self._changed is not None:
+            self._changed.set()
+
+        if self._connections:
+            await asyncio.wait(list(self._connections.values()), timeout=1.0)
+
+        for writer in list(self._connections):
+            writer.close()
+
+        await self._server.wait_closed()
+        self._stopping = False
+        self._server = None
+
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+        await self.poller.stop()
+
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+
+        try:
+            while not self._stopping:
+                self._idle.add(writer)
+
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._serialize(_error(400, "request head is too large"), "GET", False))
+                    break
+                finally:
+                    self._idle.discard(writer)
+
+                request = self._parse_head(head)
+
+                if request is None:
+                    writer.write(self._serialize(_error(400, "malformed request"), "GET", False))
+                    break
+
+                method, target, headers, keep_alive = request
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+
+                if not 0 <= length <= _MAX_BODY_SIZE:
+                    writer.write(self._serialize(_error(413, "request body is too large"), method, False))
+                    break
+
+                body = await reader.readexactly(length) if length else b""
+                response = await self._dispatch(method, target, headers, body)
+                keep_alive = keep_alive and not self._stopping
+
+                writer.write(self._serialize(response, method, keep_alive))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Optional[Tuple[str, str, Dict[str, str], bool]]:
+        """Parse request line and headers. Returns method, target, headers and keep-alive flag."""
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            return None
+
+        headers = {}
+
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        return method, target, headers, keep_alive
+
+    @staticmethod
+    def _serialize(response: _Response, method: str, keep_alive: bool) -> bytes:
+        head = [
+            f"HTTP/1.1 {response.status} {_REASONS[response.status]}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(response.body)}",
+            "Cache-Control: no-cache",
+            "Connection: keep-alive" if keep_alive else "Connection: close",
+        ]
+
+        if response.etag is not None:
+            head.append(f"ETag: {response.etag}")
+
+        head = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
+        return head if method == "HEAD" else head + response.body
+
+    @staticmethod
+    def _parse_etags(value: Optional[str]) -> FrozenSet[str]:
+        if not value:
+            return frozenset()
+
+        # weak comparison, as required for If-None-Match
+        return frozenset(etag.strip().replace("W/", "", 1) for etag in value.split(","))
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> _Response:
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/v1/batch":
+            return self._batch(body) if method == "POST" else _error(405, "batch requires POST")
+        elif method not in ("GET", "HEAD"):
+            return _error(405, f"{method} is not allowed")
+        elif path == "/health":
+            return self._health()
+
+        try:
+            wait = min(float(parse_qs(url.query).get("wait", ["0"])[0]), self.max_wait)
+        except ValueError:
+            return _error(400, "wait must be number of seconds")
+
+        etags = self._parse_etags(headers.get("if-none-match"))
+        rendered, changed = self._rendered_for(path), self._changed
+
+        # long-poll: client has current gasprices or there are none yet, wait for the next ones
+        is_current = rendered is None or bool(etags & {"*", rendered.etag})
+
+        if wait > 0 and is_current and changed is not None and not self._stopping:
+            try:
+                await asyncio.wait_for(changed.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+        rendered = self._rendered_for(path)
+
+        if rendered is None:
+            return _error(503, "gasprices are not fetched yet")
+
+        resource = rendered.bodies.get(path)
+
+        if resource is None:
+            return _error(404, f"{path} is not found")
+        elif "*" in etags or rendered.etag in etags:
+            return _Response(304, etag=rendered.etag)
+
+        return _Response(200, resource, rendered.etag)
+
+    def _batch(self, body: bytes) -> _Response:
+        """Get several resources of the same snapshot in one response."""
+        try:
+            paths = json.loads(body)["requests"]
+        except (ValueError, TypeError, KeyError):
+            return _error(400, 'body must be {"requests": [path, ...]}')
+
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            return _error(400, "requests must be list of paths")
+        elif len(paths) > _MAX_BATCH_SIZE:
+            return _error(413, f"batch is limited to {_MAX_BATCH_SIZE} requests")
+
+        rendered = self._rendered
+
+        if rendered is None:
+            return _error(503, "gasprices are not fetched yet")
+
+        forecasts = self._render_forecasts()
+        bodies = {**rendered.bodies, **forecasts.bodies} if forecasts is not None else rendered.bodies
+        # prepared bodies are embedded into response without decoding
+        responses: List[bytes] = []
+
+        for path in paths:
+            resource = bodies.get(urlsplit(path).path.rstrip("/"))
+            status = 200 if resource is not None else 404
+            responses.append(b'{"path":%s,"status":%d,"body":%s}' % (_dumps(path), status, resource or b"null"))
+
+        return _Response(
+            200, b'{"version":%d,"responses":[%s]}' % (rendered.version, b",".join(responses)), rendered.etag
+        )
+
+    def _health(self) -> _Response:
+        snapshot = self.poller.snapshot
+
+        if snapshot is None:
+            return _Response(503, _dumps({"status": "starting"}))
+
+        # timestamp of poller snapshot is updated on every successful poll, even if gasprices are the same
+        age = time.time() - snapshot.timestamp
+        status = "ok" if age <= self.max_age else "stale"
+
+        return _Response(
+            200 if status == "ok" else 503, _dumps({"status": status, "version": snapshot.version, "age": age})
+        )
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple
+
+__all__ = ["SingleFlightStats", "AsyncSingleFlight"]
+
+
+class SingleFlightStats(NamedTuple):
+    calls: int
+    executions: int
+    coalesced: int
+
+
+class AsyncSingleFlight:
+    """Deduplicate concurrent identical calls.
+
+    While call with some key is in flight, all other calls with the same key wait for it and receive its result
+    instead of making their own request. Call is cancelled when all its waiters are cancelled.
+    """
+
+    def __init__(self):
+        self.calls: int = 0
+        self.executions: int = 0
+        self.coalesced: int = 0
+
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(calls=self.calls, executions=self.executions, coalesced=self.coalesced)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+        # mark exception as retrieved, waiters may be cancelled before they get it
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run coroutine function or join the same call already in flight.
+
+        :param key: call identifier
+        :param func: coroutine function without arguments
+        """
+        self.calls += 1
+        future = self._in_flight.get(key)
+
+        if future is None:
+            self.executions += 1
+            future = asyncio.ensure_future(func())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            self.coalesced += 1
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+
+        try:
+            # shield shared call, so cancellation of one caller does not cancel it for others
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+
+            if not self._waiters[future]:
+                del self._waiters[future]
+
+                # nobody waits for result anymore, e.g. loser of race, so request is aborted
+                if not future.done():
+                    future.cancel()
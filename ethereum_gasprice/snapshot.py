@@ -0,0 +1,177 @@
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from ethereum_gasprice.consts import EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.fees import Number
+from ethereum_gasprice.units import convert_many
+
+__all__ = ["STRATEGIES", "GaspriceSnapshot"]
+
+#: order of gasprices in snapshot
+STRATEGIES: Tuple[GaspriceStrategy, ...] = tuple(GaspriceStrategy)
+
+# strategies are str enums, so values are found by strategy and by its string identifier
+_INDEX: Dict[GaspriceStrategy, int] = {strategy: i for i, strategy in enumerate(STRATEGIES)}
+
+
+class GaspriceSnapshot(Mapping[GaspriceStrategy, Optional[Number]]):
+    """Immutable gasprices of all strategies from one source.
+
+    Gasprices are stored in one tuple in order of ``STRATEGIES`` instead of per-call dict, so snapshot can be cached
+    and shared between threads and callers without copying. Snapshot is read-only mapping of strategy to gasprice,
+    it is equal to dict with the same gasprices, ``to_dict()`` returns mutable copy::
+
+        snapshot = GaspriceSnapshot(regular=20, fast=25, source="etherscan")
+        snapshot[GaspriceStrategy.FAST], snapshot["fast"]  # 25, 25
+    """
+
+    __slots__ = ("_values", "_timestamp", "_source")
+
+    _values: Tuple[Optional[Number], ...]
+    _timestamp: float
+    _source: Optional[str]
+
+    def __init__(
+        self,
+        slow: Optional[Number] = None,
+        regular: Optional[Number] = None,
+        fast: Optional[Number] = None,
+        fastest: Optional[Number] = None,
+        *,
+        timestamp: Optional[float] = None,
+        source: Optional[str] = None,
+    ):
+        """
+        :param slow: gasprice of slow strategy
+        :param regular: gasprice of regular strategy
+        :param fast: gasprice of fast strategy
+        :param fastest: gasprice of fastest strategy
+        :param timestamp: unix time of gasprices, current time by default
+        :param source: title of provider
+        """
+        _set_values(self, (slow, regular, fast, fastest))
+        _set_timestamp(self, time.time() if timestamp is None else timestamp)
+        _set_source(self, source)
+
+    @classmethod
+    def _from_values(
+        cls, values: Tuple[Optional[Number], ...], timestamp: float, source: Optional[str]
+    ) -> "GaspriceSnapshot":
+        snapshot = cls.__new__(cls)
+        _set_values(snapshot, values)
+        _set_timestamp(snapshot, timestamp)
+        _set_source(snapshot, source)
+        return snapshot
+
+    @classmethod
+    def from_mapping(
+        cls,
+        data: Mapping[GaspriceStrategy, Optional[Number]],
+        *,
+        timestamp: Optional[float] = None,
+        source: Optional[str] = None,
+    ) -> "GaspriceSnapshot":
+        """Build snapshot from gasprices by strategy, e.g. dict returned by custom provider.
+
+        :param data: gasprices by strategy, missing strategies have no gasprice
+        :param timestamp: unix time of gasprices, current time by default
+        :param source: title of provider
+        """
+        if isinstance(data, GaspriceSnapshot):
+            values = data._values
+        else:
+            values = tuple(data.get(strategy) for strategy in STRATEGIES)
+
+        return cls._from_values(values, time.time() if timestamp is None else timestamp, source)
+
+    @property
+    def timestamp(self) -> float:
+        """Unix time of gasprices."""
+        return self._timestamp
+
+    @property
+    def source(self) -> Optional[str]:
+        """Title of provider."""
+        return self._source
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, strategy: GaspriceStrategy) -> Optional[Number]:
+        return self._values[_INDEX[strategy]]
+
+    def get(self, strategy: GaspriceStrategy, default: Any = None) -> Any:
+        index = _INDEX.get(strategy)
+        return default if index is None else self._values[index]
+
+    def __contains__(self, strategy: Any) -> bool:
+        try:
+            return strategy in _INDEX
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[GaspriceStrategy]:
+        return iter(STRATEGIES)
+
+    def __len__(self) -> int:
+        return len(STRATEGIES)
+
+    def __eq__(self, other: Any) -> bool:
+        # timestamp and source are metadata, snapshots with the same gasprices are equal
+        if isinstance(other, GaspriceSnapshot):
+            return self._values == other._values
+        elif isinstance(other, Mapping):
+            return dict(zip(STRATEGIES, self._values)) == dict(other.items())
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._values)
+
+    def __repr__(self) -> str:
+        gasprices = ", ".join(f"{strategy.value}={value!r}" for strategy, value in zip(STRATEGIES, self._values))
+        return f"{type(self).__name__}({gasprices}, timestamp={self._timestamp!r}, source={self._source!r})"
+
+    def __reduce__(self):
+        return self._from_values, (self._values, self._timestamp, self._source)
+
+    def __copy__(self) -> "GaspriceSnapshot":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "GaspriceSnapshot":
+        return self
+
+    def values_tuple(self) -> Tuple[Optional[Number], ...]:
+        """Get gasprices in order of ``STRATEGIES`` without building views."""
+        return self._values
+
+    def to_dict(self) -> Dict[GaspriceStrategy, Optional[Number]]:
+        """Get mutable dict of gasprices by strategy."""
+        return dict(zip(STRATEGIES, self._values))
+
+    #: dict of gasprices, as returned by ``copy()`` of gasprice dict before snapshots
+    copy = to_dict
+
+    def convert(
+        self, unit_from: EthereumUnit = EthereumUnit.GWEI, unit_to: EthereumUnit = EthereumUnit.WEI
+    ) -> "GaspriceSnapshot":
+        """Get snapshot with gasprices converted between units, timestamp and source are kept.
+
+        Snapshot of integer gasprices is returned as is, when units are the same.
+
+        :param unit_from: unit of gasprices
+        :param unit_to: target unit
+        """
+        if unit_from == unit_to and all(value is None or type(value) is int for value in self._values):
+            return self
+
+        return self._from_values(tuple(convert_many(self._values, unit_from, unit_to)), self._timestamp, self._source)
+
+
+# slots are written with their descriptors, __setattr__ of snapshot always raises
+_set_values = GaspriceSnapshot._values.__set__  # type: ignore[attr-defined]
+_set_timestamp = GaspriceSnapshot._timestamp.__set__  # type: ignore[attr-defined]
+_set_source = GaspriceSnapshot._source.__set__  # type: ignore[attr-defined]
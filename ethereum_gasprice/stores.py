@@ -0,0 +1,292 @@
+import hashlib
+import mmap
+import os
+import pickle  # nosec
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, NamedTuple, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+__all__ = ["CacheEntry", "BaseSnapshotStore", "MemoryStore", "MmapFileStore", "RedisStore"]
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+
+
+class BaseSnapshotStore(ABC):
+    """Storage of cache entries and refresh locks used by GaspriceCache.
+
+    Shared stores are visible to several processes: only the process holding refresh lock of key fetches it from
+    providers, others read value stored by it. Values of shared stores are pickled, so store must be trusted.
+    """
+
+    #: store is shared between processes
+    shared: bool = True
+
+    @staticmethod
+    def clock() -> float:
+        """Timestamp of entries, wall clock is used to compare it between processes and hosts."""
+        return time.time()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry, expire: Optional[float] = None) -> None:
+        """Store entry.
+
+        :param key: cache key
+        :param entry: value with its timestamp
+        :param expire: time in seconds after which entry can be removed from store
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def acquire_lock(self, key: str, timeout: float) -> bool:
+        """Try to get refresh lock without waiting. Returns False if lock is held by someone else.
+
+        :param key: cache key
+        :param timeout: time in seconds after which lock of crashed holder is released
+        """
+        pass
+
+    @abstractmethod
+    def release_lock(self, key: str) -> None:
+        pass
+
+
+class MemoryStore(BaseSnapshotStore):
+    """Store in memory of current process."""
+
+    shared: bool = False
+
+    def __init__(self):
+        self._entries: Dict[str, CacheEntry] = {}
+        self._locked: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clock() -> float:
+        return time.monotonic()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CacheEntry, expire: Optional[float] = None) -> None:
+        self._entries[key] = entry
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def acquire_lock(self, key: str, timeout: float) -> bool:
+        with self._lock:
+            if key in self._locked:
+                return False
+
+            self._locked.add(key)
+            return True
+
+    def release_lock(self, key: str) -> None:
+        with self._lock:
+            self._locked.discard(key)
+
+
+class MmapFileStore(BaseSnapshotStore):
+    """Store in file shared by processes of one host (e.g. gunicorn workers).
+
+    File is replaced atomically on every write and read through mmap only when it was changed since previous read.
+    Refresh locks are ``flock`` locks, they are released by OS when holder process dies. Works only on unix.
+    Expired entries are not returned and are removed from file on next write.
+    """
+
+    def __init__(self, path: str, *, namespace: str = "ethereum-gasprice"):
+        """
+        :param path: path of snapshot file, lock files are created next to it
+        :param namespace: prefix of keys, stores with different namespaces can share one file
+        """
+        if fcntl is None:
+            raise RuntimeError("file store requires fcntl, it is not available on this platform")
+
+        self.path: str = path
+        self.namespace: str = namespace
+
+        self._entries: Dict[str, Tuple[CacheEntry, Optional[float]]] = {}
+        self._file_id: Optional[Tuple[int, int, int]] = None
+        self._lock_files: Dict[str, IO] = {}
+        self._thread_lock = threading.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _lock_path(self, key: str) -> str:
+        return f"{self.path}.{hashlib.sha1(self._key(key).encode()).hexdigest()[:16]}.lock"  # nosec
+
+    def _load(self) -> Dict[str, Tuple[CacheEntry, Optional[float]]]:
+        """Read entries with their expiration times from file, if it was replaced since previous read."""
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return {}
+
+        with file:
+            stat = os.fstat(file.fileno())
+            file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+            if file_id != self._file_id:
+                if stat.st_size:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        entries = pickle.loads(data)  # nosec
+                else:
+                    entries = {}
+
+                self._entries, self._file_id = entries, file_id
+
+        return self._entries
+
+    def _update(self, key: Optional[str], entry: Optional[CacheEntry] = None, expire: Optional[float] = None) -> None:
+        """Write file with changed entry under exclusive lock of writers, expired entries are dropped.
+
+        :param key: changed key, all entries of namespace are removed if it is None
+        :param entry: new entry, key is removed if it is None
+        :param expire: time in seconds after which new entry expires
+        """
+        with self._thread_lock, open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            now = self.clock()
+            entries = {
+                stored_key: stored
+                for stored_key, stored in self._load().items()
+                if stored[1] is None or stored[1] > now
+            }
+
+            if key is None:
+                prefix = self._key("")
+                entries = {
+                    stored_key: stored for stored_key, stored in entries.items() if not stored_key.startswith(prefix)
+                }
+            elif entry is None:
+                entries.pop(self._key(key), None)
+            else:
+                entries[self._key(key)] = (entry, None if expire is None else now + expire)
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+
+            with open(tmp_path, "wb") as file:
+                pickle.dump(entries, file)
+
+            os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._thread_lock:
+            stored = self._load().get(self._key(key))
+
+        if stored is None or (stored[1] is not None and stored[1] <= self.clock()):
+            return None
+
+        return stored[0]
+
+    def set(self, key: str, entry: CacheEntry, expire: Optional[float] = None) -> None:
+        self._update(key, entry, expire)
+
+    def delete(self, key: str) -> None:
+        self._update(key)
+
+    def clear(self) -> None:
+        self._update(None)
+
+    def acquire_lock(self, key: str, timeout: float) -> bool:
+        lock_file = open(self._lock_path(key), "a")
+
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._lock_files[key] = lock_file
+        return True
+
+    def release_lock(self, key: str) -> None:
+        lock_file = self._lock_files.pop(key, None)
+
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+
+class RedisStore(BaseSnapshotStore):
+    """Store in Redis shared by processes on different hosts.
+
+    Refresh lock is a key with random token and expiration time, it is removed only by its holder.
+    """
+
+    _release_script = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, client: Any, *, namespace: str = "ethereum-gasprice"):
+        """
+        :param client: sync redis client (``redis.Redis``)
+        :param namespace: prefix of keys, stores with different namespaces can share one Redis database
+        """
+        self.client: Any = client
+        self.namespace: str = namespace
+
+        self._tokens: Dict[str, str] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.namespace}-lock:{key}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        data = self.client.get(self._key(key))
+        return None if data is None else CacheEntry(*pickle.loads(data))  # nosec
+
+    def set(self, key: str, entry: CacheEntry, expire: Optional[float] = None) -> None:
+        px = max(1, int(expire * 1000)) if expire is not None else None
+        self.client.set(self._key(key), pickle.dumps(tuple(entry)), px=px)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.namespace}:*"))
+
+        if keys:
+            self.client.delete(*keys)
+
+    def acquire_lock(self, key: str, timeout: float) -> bool:
+        token = uuid.uuid4().hex
+
+        if not self.client.set(self._lock_key(key), token, nx=True, px=max(1, int(timeout * 1000))):
+            return False
+
+        self._tokens[key] = token
+        return True
+
+    def release_lock(self, key: str) -> None:
+        token = self._tokens.pop(key, None)
+
+        if token is not None:
+            self.client.eval(self._release_script, 1, self._lock_key(key), token)
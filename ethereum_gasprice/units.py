@@ -0,0 +1,150 @@
+from decimal import Context, Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, TypeVar
+
+from ethereum_gasprice.consts import EthereumUnit
+from ethereum_gasprice.fees import Gasprice, Number
+
+__all__ = [
+    "UNIT_SCALES",
+    "normalize",
+    "to_wei",
+    "from_wei",
+    "convert",
+    "convert_many",
+    "convert_mapping",
+    "convert_snapshot",
+]
+
+K = TypeVar("K")
+
+#: number of wei in unit
+UNIT_SCALES: Dict[EthereumUnit, int] = {EthereumUnit.WEI: 1, EthereumUnit.GWEI: 10**9}
+
+# enough digits for any uint256 value, so decimal arithmetic below is exact
+_CONTEXT = Context(prec=80)
+
+
+def to_wei(value: Number, unit: EthereumUnit = EthereumUnit.GWEI) -> int:
+    """Convert value to integer wei, fractions of wei are truncated.
+
+    Floats are converted by their shortest repr, so 1.1 gwei is exactly 1100000000 wei.
+
+    :param value: amount in unit
+    :param unit: unit of value
+    """
+    scale = UNIT_SCALES[unit]
+
+    if type(value) is int:
+        return value * scale
+
+    # apis return integer gasprices as strings, e.g. "25"
+    if type(value) is str and value.isdigit():
+        return int(value) * scale
+
+    return int(_CONTEXT.multiply(value if isinstance(value, Decimal) else Decimal(str(value)), scale))
+
+
+def from_wei(wei: int, unit: EthereumUnit = EthereumUnit.GWEI) -> Gasprice:
+    """Convert integer wei to unit without loss of precision.
+
+    Returns int when value is whole number of units and exact Decimal otherwise.
+
+    :param wei: amount in wei
+    :param unit: target unit
+    """
+    scale = UNIT_SCALES[unit]
+    units, remainder = divmod(wei, scale)
+
+    if not remainder:
+        return units
+
+    return _CONTEXT.divide(Decimal(wei), scale)
+
+
+def normalize(value: Optional[Number]) -> Optional[Gasprice]:
+    """Convert value to int or exact Decimal without changing its unit, e.g. "20" to 20 and 18.50 to Decimal("18.5").
+
+    :param value: amount as int, float, Decimal or numeric string, None is returned as is
+    """
+    if value is None or type(value) is int:
+        return value
+
+    if type(value) is str and value.isdigit():
+        return int(value)
+
+    value = value if isinstance(value, Decimal) else Decimal(str(value))
+    integral = value.to_integral_value()
+
+    return int(integral) if value == integral else value
+
+
+def convert(
+    value: Optional[Number], unit_from: EthereumUnit = EthereumUnit.GWEI, unit_to: EthereumUnit = EthereumUnit.WEI
+) -> Optional[Gasprice]:
+    """Convert value between units with exact integer arithmetic.
+
+    :param value: amount in unit_from, None is returned as is
+    :param unit_from: unit of value
+    :param unit_to: target unit
+    """
+    if unit_from == unit_to:
+        return normalize(value)
+
+    if value is None:
+        return None
+
+    return from_wei(to_wei(value, unit_from), unit_to)
+
+
+def convert_many(
+    values: Iterable[Optional[Number]],
+    unit_from: EthereumUnit = EthereumUnit.GWEI,
+    unit_to: EthereumUnit = EthereumUnit.WEI,
+) -> List[Optional[Gasprice]]:
+    """Convert sequence of values, e.g. column of history, between units.
+
+    Scale factor is calculated once and integers are converted with one multiplication or division.
+
+    :param values: amounts in unit_from, None values are kept
+    :param unit_from: unit of values
+    :param unit_to: target unit
+    """
+    scale_from, scale_to = UNIT_SCALES[unit_from], UNIT_SCALES[unit_to]
+
+    if scale_from == scale_to:
+        return [normalize(value) for value in values]
+
+    if scale_from % scale_to == 0:
+        # conversion to smaller unit, integers stay integers
+        factor = scale_from // scale_to
+        return [value * factor if type(value) is int else convert(value, unit_from, unit_to) for value in values]
+
+    return [None if value is None else from_wei(to_wei(value, unit_from), unit_to) for value in values]
+
+
+def convert_mapping(
+    values: Mapping[K, Optional[Number]],
+    unit_from: EthereumUnit = EthereumUnit.GWEI,
+    unit_to: EthereumUnit = EthereumUnit.WEI,
+) -> Dict[K, Optional[Gasprice]]:
+    """Convert all values of mapping, e.g. gasprices by strategy, between units.
+
+    :param values: amounts in unit_from
+    :param unit_from: unit of values
+    :param unit_to: target unit
+    """
+    return dict(zip(values.keys(), convert_many(values.values(), unit_from, unit_to)))
+
+
+def convert_snapshot(
+    data: Mapping[str, Mapping[K, Optional[Number]]],
+    unit_from: EthereumUnit = EthereumUnit.GWEI,
+    unit_to: EthereumUnit = EthereumUnit.WEI,
+) -> Dict[str, Dict[K, Optional[Gasprice]]]:
+    """Convert gasprices of all sources, e.g. result of get_gasprice_from_all_sources, between units.
+
+    :param data: gasprices by provider title
+    :param unit_from: unit of gasprices
+    :param unit_to: target unit
+    """
+    return {title: convert_mapping(values, unit_from, unit_to) for title, values in data.items()}
@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+import pytest
+
+from benchmarks.mock_server import MockOracleServer, mock_providers
+from ethereum_gasprice.aggregation import GaspriceAggregator
+from ethereum_gasprice.consts import AggregationMethod, EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.controller import GaspriceController
+
+
+@pytest.fixture(scope="module")
+def oracle():
+    with MockOracleServer() as server:
+        yield server
+
+
+@pytest.mark.parametrize("method", list(AggregationMethod))
+def test_aggregate_fractional_gwei(method):
+    data = {
+        "a": {GaspriceStrategy.FAST: Decimal("20.5"), GaspriceStrategy.SLOW: 18},
+        "b": {GaspriceStrategy.FAST: 21, GaspriceStrategy.SLOW: Decimal("18.25")},
+        "c": {GaspriceStrategy.FAST: 20.75, GaspriceStrategy.SLOW: Decimal("18.5")},
+    }
+
+    aggregated = GaspriceAggregator(method).aggregate(data, EthereumUnit.GWEI)
+
+    assert aggregated.values[GaspriceStrategy.FAST] == Decimal("20.75")
+    assert aggregated.values[GaspriceStrategy.SLOW] == Decimal("18.25")
+    assert aggregated.sources[GaspriceStrategy.FAST] == ("a", "b", "c")
+
+
+def test_aggregate_rounds_to_whole_wei():
+    data = {"a": {GaspriceStrategy.FAST: 20}, "b": {GaspriceStrategy.FAST: 23}}
+
+    assert GaspriceAggregator().aggregate(data, EthereumUnit.WEI).values[GaspriceStrategy.FAST] == 22
+    assert GaspriceAggregator().aggregate(data, EthereumUnit.GWEI).values[GaspriceStrategy.FAST] == Decimal("21.5")
+
+    data = {"a": {GaspriceStrategy.FAST: Decimal("0.1")}, "b": {GaspriceStrategy.FAST: Decimal("0.2000000003")}}
+    assert GaspriceAggregator().aggregate(data, EthereumUnit.GWEI).values[GaspriceStrategy.FAST] == Decimal("0.15")
+
+
+def test_aggregated_gasprices_in_gwei(oracle):
+    with GaspriceController(return_unit=EthereumUnit.GWEI, providers=mock_providers(oracle)) as controller:
+        data = controller.get_gasprice_from_all_sources()
+        aggregated = controller.get_aggregated_gasprices()
+
+    # Etherchain returns fractional gwei with base fee
+    assert isinstance(data["etherchain"][GaspriceStrategy.FAST], Decimal)
+    assert aggregated.values == {
+        GaspriceStrategy.SLOW: 18,
+        GaspriceStrategy.REGULAR: 21,
+        GaspriceStrategy.FAST: 26,
+        GaspriceStrategy.FASTEST: 30,
+    }
+
+    with GaspriceController(return_unit=EthereumUnit.WEI, providers=mock_providers(oracle)) as controller:
+        wei = controller.get_aggregated_gasprices()
+
+    assert wei.values == {strategy: value * 10**9 for strategy, value in aggregated.values.items()}
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+import pytest
+
+from benchmarks.mock_server import MockOracleServer, mock_providers
+from ethereum_gasprice.cache import GaspriceCache
+from ethereum_gasprice.consts import CacheStatus, EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.controller import AsyncGaspriceController, GaspriceController
+from ethereum_gasprice.hooks import GaspriceHooks
+from ethereum_gasprice.stores import CacheEntry, MmapFileStore
+
+
+class LookupRecorder(GaspriceHooks):
+    def __init__(self):
+        self.lookups: List[Tuple[str, CacheStatus, Optional[float]]] = []
+
+    def on_cache_lookup(self, method, status, age=None):
+        self.lookups.append((method, status, age))
+
+
+@pytest.fixture(scope="module")
+def oracle():
+    with MockOracleServer() as server:
+        yield server
+
+
+def test_cache_lookup_age_is_passed_per_call(oracle):
+    hooks = LookupRecorder()
+    cache = GaspriceCache(ttl=60)
+
+    with GaspriceController(providers=mock_providers(oracle), cache=cache, hooks=hooks) as controller:
+        controller.get_gasprices()
+        controller.get_gasprices()
+
+    (_, miss, miss_age), (method, hit, hit_age) = hooks.lookups
+    assert (miss, miss_age) == (CacheStatus.MISS, None)
+    assert method == "gasprices" and hit == CacheStatus.HIT and 0 <= hit_age < 60
+    assert not hasattr(cache, "last_lookup")
+
+
+def test_lookup_returns_age():
+    cache = GaspriceCache(ttl=60)
+    cache.set(("gasprices",), {"fast": 1})
+
+    lookup = cache.lookup(("gasprices",))
+    assert lookup.status == CacheStatus.HIT and lookup.value == {"fast": 1} and 0 <= lookup.age < 60
+
+
+def test_controllers_with_different_units_share_store(oracle, tmp_path):
+    store = MmapFileStore(str(tmp_path / "gasprice.bin"))
+    wei_cache, gwei_cache = GaspriceCache(ttl=60, store=store), GaspriceCache(ttl=60, store=store)
+
+    with GaspriceController(providers=mock_providers(oracle), cache=wei_cache) as controller:
+        wei = controller.get_gasprice_by_strategy(GaspriceStrategy.FAST)
+    with GaspriceController(
+        return_unit=EthereumUnit.GWEI, providers=mock_providers(oracle), cache=gwei_cache
+    ) as controller:
+        gwei = controller.get_gasprice_by_strategy(GaspriceStrategy.FAST)
+
+    assert (wei, gwei) == (25 * 10**9, 25)
+    assert gwei_cache.stats.misses == 1 and gwei_cache.stats.hits == 0
+
+
+def test_mmap_store_expire_and_namespace(tmp_path):
+    path = str(tmp_path / "gasprice.bin")
+    store, other = MmapFileStore(path), MmapFileStore(path, namespace="other")
+    store.set("gasprices", CacheEntry(value=1, stored_at=store.clock()), expire=0.05)
+    other.set("gasprices", CacheEntry(value=2, stored_at=other.clock()))
+
+    assert store.get("gasprices").value == 1 and other.get("gasprices").value == 2
+
+    time.sleep(0.1)
+    assert store.get("gasprices") is None
+
+    store.clear()
+    assert other.get("gasprices").value == 2
+
+
+def test_results_with_age(oracle):
+    cache = GaspriceCache(ttl=0.1, stale_while_revalidate=60)
+
+    with GaspriceController(providers=mock_providers(oracle), cache=cache) as controller:
+        fetched = controller.get_gasprices_with_age()
+        hit = controller.get_gasprices_with_age()
+        time.sleep(0.15)
+        stale = controller.get_gasprices_with_age()
+
+    assert fetched == (CacheStatus.MISS, hit.value, 0.0)
+    assert hit.status == CacheStatus.HIT and 0 < hit.age <= 0.1
+    assert stale.status == CacheStatus.STALE and stale.age > 0.1 and stale.value == hit.value
+
+
+def test_results_with_age_without_cache(oracle):
+    async def get_fees():
+        providers = mock_providers(oracle, asynchronous=True)
+
+        async with AsyncGaspriceController(providers=providers) as controller:
+            return await controller.get_fees_with_age()
+
+    lookup = asyncio.run(get_fees())
+    assert lookup.status == CacheStatus.MISS and lookup.age == 0.0 and lookup.value[GaspriceStrategy.FAST] is not None
@@ -0,0 +1,64 @@
+import time
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.circuit_breaker import CircuitBreaker
+from ethereum_gasprice.consts import CircuitState, GaspriceStrategy
+from ethereum_gasprice.controller import GaspriceController
+from ethereum_gasprice.providers import EtherscanProvider, EthGasStationProvider
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    breaker.record(False)
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == CircuitState.CLOSED and breaker.allow_request()
+
+    breaker.record(False)
+    assert breaker.state == CircuitState.OPEN and not breaker.allow_request()
+
+
+def test_half_open_breaker_allows_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record(False)
+
+    time.sleep(0.06)
+    assert breaker.allow_request() and breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    # failed probe opens circuit for another recovery timeout
+    breaker.record(False)
+    assert breaker.state == CircuitState.OPEN and not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record(True)
+    assert breaker.state == CircuitState.CLOSED and breaker.failures == 0
+
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker(failure_threshold=0)
+
+    for _ in range(10):
+        breaker.record(False)
+
+    assert breaker.state == CircuitState.CLOSED and breaker.allow_request()
+
+
+def test_controller_skips_provider_with_open_circuit():
+    failing = EndpointConfig(error_rate=1, error_status=503)
+
+    with MockOracleServer(endpoints={EtherscanProvider.title: failing}) as oracle:
+        providers = mock_providers(oracle, providers=(EtherscanProvider, EthGasStationProvider))
+
+        with GaspriceController(
+            providers=providers, breaker_failure_threshold=2, breaker_recovery_timeout=60
+        ) as controller:
+            gasprices = [controller.get_gasprice_by_strategy(GaspriceStrategy.FAST) for _ in range(4)]
+
+        requests, errors = oracle.stats[EtherscanProvider.title]
+
+    assert gasprices == [26 * 10**9] * 4
+    assert requests == errors == 2
+    assert controller.breaker_states[EtherscanProvider.title] == CircuitState.OPEN
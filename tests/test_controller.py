@@ -0,0 +1,11 @@
+import pytest
+
+from ethereum_gasprice.consts import FanOutMode
+from ethereum_gasprice.controller import GaspriceController
+
+
+def test_fan_out_mode_is_normalized():
+    assert GaspriceController(fan_out_mode="concurrent").fan_out_mode is FanOutMode.CONCURRENT
+
+    with pytest.raises(ValueError):
+        GaspriceController(fan_out_mode="parallel")
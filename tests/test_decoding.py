@@ -0,0 +1,83 @@
+import sys
+
+import pytest
+
+from benchmarks.bench_decoding import PROVIDERS, load_payloads
+from ethereum_gasprice import decoding
+from ethereum_gasprice.consts import JsonBackend
+from ethereum_gasprice.decoding import ResponseDecoder, available_backends, get_decoder
+
+BACKENDS = tuple(JsonBackend)
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    return load_payloads()
+
+
+@pytest.fixture
+def clean_decoders(monkeypatch):
+    # decoders of default backend are shared, so fallback is checked with empty registry
+    monkeypatch.setattr(decoding, "_decoders", {})
+
+
+def test_all_backends_are_installed():
+    assert available_backends() == BACKENDS
+
+
+@pytest.mark.parametrize("provider", PROVIDERS, ids=lambda provider: provider.title)
+def test_backends_return_same_gasprices(provider, payloads):
+    results = {}
+
+    for backend in BACKENDS:
+        instance = provider(json_backend=backend)
+        data = instance.decoder.decode(payloads[provider.title])
+
+        assert instance.decoder.backend == backend
+        assert instance._is_valid_response_data(data)
+        results[backend] = instance._proceed_response_data(data)
+
+    assert results[JsonBackend.MSGSPEC] == results[JsonBackend.ORJSON] == results[JsonBackend.STDLIB]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_decode_schema_fields(backend):
+    decoder = ResponseDecoder({"fast": decoding.JsonScalar, "slow": decoding.JsonScalar}, backend)
+
+    assert decoder.decode(b'{"fast": "25", "slow": 10.5}') == {"fast": "25", "slow": 10.5}
+    # missing fields are None with msgspec, other backends return body as is
+    assert decoder.decode(b'{"fast": 25}').get("slow") is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_raise_value_error(backend):
+    decoder = ResponseDecoder({"fast": decoding.JsonScalar}, backend)
+
+    with pytest.raises(ValueError):
+        decoder.decode(b"<html>Bad gateway</html>")
+
+
+def test_fallback_without_msgspec(monkeypatch, clean_decoders):
+    # module is not found by import system, as if it was not installed
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    assert available_backends() == (JsonBackend.ORJSON, JsonBackend.STDLIB)
+    assert get_decoder({"fast": decoding.JsonScalar}).backend == JsonBackend.ORJSON
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    assert available_backends() == (JsonBackend.STDLIB,)
+    assert get_decoder().backend == JsonBackend.STDLIB
+
+
+def test_fallback_returns_same_gasprices(monkeypatch, clean_decoders, payloads):
+    expected = {provider.title: provider(json_backend=JsonBackend.MSGSPEC) for provider in PROVIDERS}
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    for provider in PROVIDERS:
+        instance = provider()
+        data = instance.decoder.decode(payloads[provider.title])
+        expected_data = expected[provider.title].decoder.decode(payloads[provider.title])
+
+        assert instance.decoder.backend != JsonBackend.MSGSPEC
+        assert instance._proceed_response_data(data) == expected[provider.title]._proceed_response_data(expected_data)
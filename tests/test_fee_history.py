@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+import pytest
+
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.fee_history import FeeHistoryEstimator
+
+GWEI = 10**9
+
+
+class NodeStub:
+    """JSON-RPC node whose block ``n`` has base fee ``n`` gwei and priority fee ``n * percentile / 10`` gwei."""
+
+    def __init__(self, latest):
+        self.latest = latest
+        self.requests = []
+
+    def make_request(self, method, params):
+        self.requests.append((method, params))
+
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(self.latest)}
+
+        count, newest, percentiles = int(params[0], 16), int(params[1], 16), params[2]
+        if percentiles != sorted(percentiles):
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "invalid reward percentiles"}}
+
+        blocks = range(newest - count + 1, newest + 1)
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {
+                "oldestBlock": hex(blocks[0]),
+                "baseFeePerGas": [hex(block * GWEI) for block in [*blocks, newest + 1]],
+                "reward": [[hex(block * GWEI * percentile // 10) for percentile in percentiles] for block in blocks],
+            },
+        }
+
+    @property
+    def history_requests(self):
+        return [params for method, params in self.requests if method == "eth_feeHistory"]
+
+
+def _priority_fee(estimator, strategy):
+    return estimator.estimate()[strategy].max_priority_fee_per_gas
+
+
+def test_percentiles_are_requested_in_increasing_order():
+    node = NodeStub(latest=10)
+    estimator = FeeHistoryEstimator(
+        node.make_request, block_count=2, percentiles={GaspriceStrategy.FAST: 90, GaspriceStrategy.SLOW: 10}
+    )
+
+    assert estimator.update()
+    assert node.history_requests[0][2] == [10, 90]
+    # average over blocks 9 and 10
+    assert _priority_fee(estimator, GaspriceStrategy.SLOW) == Decimal("9.5")
+    assert _priority_fee(estimator, GaspriceStrategy.FAST) == Decimal("85.5")
+    assert estimator.estimate()[GaspriceStrategy.REGULAR] is None
+
+
+def test_window_is_updated_incrementally():
+    node = NodeStub(latest=10)
+    estimator = FeeHistoryEstimator(node.make_request, block_count=4)
+
+    assert estimator.update()
+    assert not estimator.update()
+
+    node.latest = 12
+    assert estimator.update()
+
+    assert [params[:2] for params in node.history_requests] == [[hex(4), hex(10)], [hex(2), hex(12)]]
+    # blocks 9-12, base fee of next block 13
+    assert _priority_fee(estimator, GaspriceStrategy.SLOW) == Decimal("10.5")
+    assert estimator.next_base_fee == 13 * GWEI
+
+
+@pytest.mark.parametrize("latest", [11, 100])
+def test_reorg_and_gap_refetch_window(latest):
+    node = NodeStub(latest=12)
+    estimator = FeeHistoryEstimator(node.make_request, block_count=4)
+    estimator.update()
+
+    # node switched to shorter chain or was away for longer than window
+    node.latest = latest
+    assert estimator.update()
+
+    assert node.history_requests[-1][:2] == [hex(4), hex(latest)]
+    assert _priority_fee(estimator, GaspriceStrategy.SLOW) == Decimal(latest) - Decimal("1.5")
+    assert estimator.last_block == latest
+
+
+def test_node_error_is_raised():
+    estimator = FeeHistoryEstimator(lambda method, params: {"error": {"message": "unavailable"}})
+
+    with pytest.raises(ValueError):
+        estimator.update()
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.forecast import GaspriceForecaster
+
+FAST = GaspriceStrategy.FAST
+
+
+def test_holt_update():
+    forecaster = GaspriceForecaster(alpha=0.5, beta=0.5, damping=1, block_time=12)
+    forecaster.update_values({FAST: 100}, timestamp=0)
+    forecaster.update_values({FAST: 112}, timestamp=12)
+
+    # level 0.5 * 112 + 0.5 * 100, trend 0.5 * (106 - 100) per block
+    assert forecaster.forecast(FAST, 1).value == pytest.approx(109)
+    assert forecaster.forecast(FAST, 2).value == pytest.approx(112)
+
+
+def test_damped_trend():
+    forecaster = GaspriceForecaster(alpha=0.5, beta=0.5, damping=0.5, block_time=12)
+    forecaster.update_values({FAST: 100}, timestamp=0)
+    forecaster.update_values({FAST: 112}, timestamp=12)
+
+    # level is 106, trend is 0.5 * 6 + 0.5 * 0.5 * 0, damped sum for 2 blocks is 0.5 + 0.25
+    assert forecaster.forecast(FAST, 2).value == pytest.approx(106 + 3 * 0.75)
+
+
+def test_linear_trend_is_followed():
+    forecaster = GaspriceForecaster(alpha=0.5, beta=0.3, damping=1, block_time=12)
+
+    for block in range(100):
+        forecaster.update_values({FAST: 100 + 2 * block}, timestamp=block * 12)
+
+    assert forecaster.forecast(FAST, 1).value == pytest.approx(300, rel=0.01)
+    assert forecaster.forecast(FAST, 5).value == pytest.approx(308, rel=0.01)
+
+
+def test_samples_within_block_are_not_extrapolated():
+    forecaster = GaspriceForecaster(alpha=0.5, beta=0.5, damping=1, block_time=12)
+    forecaster.update_values({FAST: 100}, timestamp=0)
+    forecaster.update_values({FAST: 120}, timestamp=1)
+
+    # level is 110, change of level is counted as change per one block, not per 1/12 of block
+    assert forecaster.forecast(FAST, 1).value == pytest.approx(115)
+
+
+def test_old_and_missing_samples_are_skipped():
+    forecaster = GaspriceForecaster(alpha=0.5, beta=0.5)
+    forecaster.update({"etherscan": {FAST: 100}, "poa": {FAST: 110}, "etherchain": {FAST: 300}}, timestamp=24)
+    forecaster.update({"etherscan": {FAST: 500}}, timestamp=12)
+    forecaster.update({"etherscan": {FAST: None}}, timestamp=36)
+
+    # median of providers, older sample is ignored
+    assert forecaster.forecast(FAST, 1).value == 110
+    assert forecaster.forecast(GaspriceStrategy.SLOW) is None
+
+
+def test_bands_cover_quantiles_of_error():
+    rng = random.Random(1)
+    forecaster = GaspriceForecaster(alpha=0.05, beta=0, quantiles=(0.1, 0.9), band_alpha=0.02)
+    covered = 0
+
+    for block in range(6000):
+        value = 100 * (1 + rng.uniform(-0.1, 0.1))
+
+        if block >= 4000:
+            band = forecaster.forecast(FAST, 1)
+            covered += band.lower <= value <= band.upper
+
+        forecaster.update_values({FAST: value}, timestamp=block * 12)
+
+    one_block, four_blocks = forecaster.forecast(FAST, 1), forecaster.forecast(FAST, 4)
+
+    # 10% and 90% quantiles of uniform noise are -8% and +8%
+    assert 0.7 <= covered / 2000 <= 0.9
+    assert one_block.lower / one_block.value == pytest.approx(0.92, abs=0.02)
+    assert one_block.upper / one_block.value == pytest.approx(1.08, abs=0.02)
+    # band is widened with square root of horizon
+    assert four_blocks.upper - four_blocks.value == pytest.approx(2 * (one_block.upper - one_block.value), rel=0.01)
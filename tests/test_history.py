@@ -0,0 +1,93 @@
+import calendar
+import os
+
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.history import GaspriceRecorder, OhlcBar
+
+DAY = calendar.timegm((2024, 1, 2, 0, 0, 0))
+
+
+def _gasprices(fast, slow=None):
+    return {GaspriceStrategy.FAST: fast, GaspriceStrategy.SLOW: slow}
+
+
+def test_records_are_split_by_day(tmp_path):
+    with GaspriceRecorder(str(tmp_path)) as recorder:
+        recorder.record({"etherscan": _gasprices(10)}, DAY - 1)
+        recorder.record({"etherscan": _gasprices(20), "poa": _gasprices(21, 15)}, DAY + 1)
+        recorder.record({"etherscan": _gasprices(30)}, DAY + 86400)
+
+        records = list(recorder.query())
+        second_day = list(recorder.query(start=DAY, end=DAY + 86400))
+
+    assert sorted(os.listdir(tmp_path)) == ["2024-01-01", "2024-01-02", "2024-01-03", "providers.json"]
+    assert [(record.timestamp, record.provider) for record in records] == [
+        (DAY - 1, "etherscan"),
+        (DAY + 1, "etherscan"),
+        (DAY + 1, "poa"),
+        (DAY + 86400, "etherscan"),
+    ]
+    assert [record.gasprices[GaspriceStrategy.SLOW] for record in second_day] == [None, 15]
+    assert records[2].gasprices[GaspriceStrategy.REGULAR] is None
+
+
+def test_reader_sees_providers_added_after_it_was_opened(tmp_path):
+    with GaspriceRecorder(str(tmp_path)) as writer:
+        writer.record({"etherscan": _gasprices(10)}, DAY)
+        writer.flush()
+
+        reader = GaspriceRecorder(str(tmp_path))
+
+        writer.record({"poa": _gasprices(20)}, DAY + 1)
+        writer.flush()
+
+        assert [record.gasprices[GaspriceStrategy.FAST] for record in reader.query(provider="poa")] == [20]
+        assert [bar.close for bar in reader.downsample(60, provider="poa")] == [20]
+        assert list(reader.query(provider="unknown")) == []
+
+
+def test_interrupted_write_is_repaired(tmp_path):
+    with GaspriceRecorder(str(tmp_path)) as recorder:
+        recorder.record({"etherscan": _gasprices(10)}, DAY)
+        recorder.record({"etherscan": _gasprices(11)}, DAY + 1)
+
+    # process died in the middle of writing the next row
+    partition = tmp_path / "2024-01-02"
+    with open(partition / "timestamp.bin", "ab") as file:
+        file.write(b"\x00" * 11)
+    with open(partition / "provider.bin", "ab") as file:
+        file.write(b"\x00\x00")
+
+    with GaspriceRecorder(str(tmp_path)) as recorder:
+        sizes = {name: os.path.getsize(partition / name) for name in ("timestamp.bin", "provider.bin", "fast.bin")}
+        recorder.record({"etherscan": _gasprices(12)}, DAY + 2)
+        records = list(recorder.query())
+
+    assert sizes == {"timestamp.bin": 16, "provider.bin": 4, "fast.bin": 16}
+    assert [(record.timestamp, record.gasprices[GaspriceStrategy.FAST]) for record in records] == [
+        (DAY, 10),
+        (DAY + 1, 11),
+        (DAY + 2, 12),
+    ]
+
+
+def test_ohlc_bars(tmp_path):
+    with GaspriceRecorder(str(tmp_path), buffer_size=2) as recorder:
+        for second, (etherscan, poa) in enumerate([(10, 100), (14, 100), (8, None), (12, 100)]):
+            recorder.record({"etherscan": _gasprices(etherscan), "poa": _gasprices(poa)}, DAY + second * 20)
+
+        # the last minute of day and the first minute of next day are separate bars
+        recorder.record({"etherscan": _gasprices(30)}, DAY + 86400 - 1)
+        recorder.record({"etherscan": _gasprices(40)}, DAY + 86400)
+
+        bars = list(recorder.downsample(60, provider="etherscan"))
+        all_providers = list(recorder.downsample(60, end=DAY + 60))
+
+    assert bars == [
+        OhlcBar(timestamp=DAY, open=10, high=14, low=8, close=8, count=3),
+        OhlcBar(timestamp=DAY + 60, open=12, high=12, low=12, close=12, count=1),
+        OhlcBar(timestamp=DAY + 86400 - 60, open=30, high=30, low=30, close=30, count=1),
+        OhlcBar(timestamp=DAY + 86400, open=40, high=40, low=40, close=40, count=1),
+    ]
+    # missing gasprices are skipped
+    assert all_providers == [OhlcBar(timestamp=DAY, open=10, high=100, low=8, close=8, count=5)]
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from benchmarks.mock_server import MockOracleServer, mock_providers
+from ethereum_gasprice.consts import Chain, GaspriceStrategy
+from ethereum_gasprice.controller import AsyncMultiChainGaspriceController, MultiChainGaspriceController
+from ethereum_gasprice.controller.multichain import BaseMultiChainController
+
+
+@pytest.fixture(scope="module")
+def oracle():
+    with MockOracleServer() as server:
+        yield server
+
+
+def test_base_is_abstract():
+    with pytest.raises(TypeError):
+        BaseMultiChainController({Chain.ETHEREUM: {}})
+
+
+def test_async_controller_has_only_async_lifecycle():
+    controller = AsyncMultiChainGaspriceController({Chain.ETHEREUM: {}})
+
+    assert not isinstance(controller, MultiChainGaspriceController)
+    assert not any(hasattr(controller, name) for name in ("close", "executor", "__enter__", "__exit__"))
+    asyncio.run(controller.aclose())
+
+
+def test_sync_and_async_controllers(oracle):
+    with MultiChainGaspriceController({Chain.ETHEREUM: {"providers": mock_providers(oracle)}}) as controller:
+        sync_result = controller.get_gasprice_by_strategy(GaspriceStrategy.FAST)
+
+    async def get_async_result():
+        providers = mock_providers(oracle, asynchronous=True)
+
+        async with AsyncMultiChainGaspriceController({Chain.ETHEREUM: {"providers": providers}}) as controller:
+            return await controller.get_gasprice_by_strategy(GaspriceStrategy.FAST)
+
+    assert sync_result == asyncio.run(get_async_result()) == {Chain.ETHEREUM: 25 * 10**9}
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import time
+
+import websockets
+
+from ethereum_gasprice.cache import GaspriceCache
+from ethereum_gasprice.consts import CacheStatus, EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.controller import AsyncGaspriceController
+from ethereum_gasprice.newheads import BlockHead, NewBlockRefresher, NewHeadsSubscriber
+from ethereum_gasprice.poller import AsyncGaspricePoller
+from ethereum_gasprice.stores import MemoryStore
+
+
+class FlakySubscriber(NewHeadsSubscriber):
+    """Subscriber which fails with unexpected error after the first block."""
+
+    def __init__(self):
+        super().__init__("ws://localhost:8546", reconnect_delay=0.01)
+        self.attempts = 0
+
+    async def heads(self):
+        self.attempts += 1
+        yield BlockHead(number=self.attempts, hash=hex(self.attempts))
+        raise TypeError("unexpected header")
+
+
+async def _refresh_on_flaky_subscription():
+    subscriber = FlakySubscriber()
+    refresher = NewBlockRefresher(AsyncGaspriceController(cache=GaspriceCache(ttl=10)), subscriber)
+
+    async with refresher:
+        await asyncio.sleep(0.2)
+
+    return subscriber.attempts, refresher.refreshes
+
+
+def test_reader_is_restarted_after_unexpected_error(caplog):
+    with caplog.at_level(logging.ERROR, logger="ethereum-gasprice"):
+        attempts, refreshes = asyncio.run(_refresh_on_flaky_subscription())
+
+    assert attempts > 1 and refreshes >= attempts - 1
+    assert "newHeads reader stopped" in caplog.text and "unexpected header" in caplog.text
+
+
+class OneBlockSubscriber(NewHeadsSubscriber):
+    def __init__(self):
+        super().__init__("ws://localhost:8546")
+
+    async def heads(self):
+        yield BlockHead(number=1, hash="0x1")
+        await asyncio.Event().wait()
+
+
+async def _invalidate_on_block(controller):
+    refresher = NewBlockRefresher(controller, OneBlockSubscriber())
+
+    async with refresher:
+        while not refresher.refreshes:
+            await asyncio.sleep(0.01)
+
+
+def test_only_controller_results_are_invalidated():
+    store = MemoryStore()
+    wei = AsyncGaspriceController(cache=GaspriceCache(ttl=60, store=store))
+    gwei = AsyncGaspriceController(return_unit=EthereumUnit.GWEI, cache=GaspriceCache(ttl=60, store=store))
+
+    for controller in (wei, gwei):
+        controller.cache.set(controller._cache_key("gasprices"), {"fast": 1})
+        controller.cache.set(controller._cache_key("gasprice_by_strategy", GaspriceStrategy.FAST), 1)
+
+    asyncio.run(_invalidate_on_block(wei))
+
+    assert all(wei.cache.peek(key).status == CacheStatus.MISS for key in wei._cache_keys())
+    assert gwei.cache.peek(gwei._cache_key("gasprices")).status == CacheStatus.HIT
+    assert gwei.cache.peek(gwei._cache_key("gasprice_by_strategy", "fast")).status == CacheStatus.HIT
+
+
+def test_results_stored_after_block_are_kept():
+    controller = AsyncGaspriceController(cache=GaspriceCache(ttl=60))
+    received_at = controller.cache.clock()
+    controller.cache.set(controller._cache_key("gasprices"), {"fast": 1})
+
+    controller.invalidate_cache(stored_before=received_at)
+    assert controller.cache.peek(controller._cache_key("gasprices")).status == CacheStatus.HIT
+
+    controller.invalidate_cache()
+    assert controller.cache.peek(controller._cache_key("gasprices")).status == CacheStatus.MISS
+
+
+def _head_message(number, subscription="0xsub", base_fee=None):
+    header = {"number": hex(number), "hash": hex(number)}
+    if base_fee is not None:
+        header["baseFeePerGas"] = hex(base_fee)
+
+    return json.dumps(
+        {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": subscription, "result": header}}
+    )
+
+
+class NodeStub:
+    """Websocket node answering eth_subscribe and sending scripted messages of every connection, number in script
+    is a pause in seconds."""
+
+    def __init__(self, connections, reject=0):
+        self.connections = connections
+        self.reject = reject
+        self.connected_at = []
+
+    async def handler(self, websocket):
+        self.connected_at.append(time.monotonic())
+        request = json.loads(await websocket.recv())
+        assert request["method"] == "eth_subscribe" and request["params"] == ["newHeads"]
+
+        if len(self.connected_at) <= self.reject:
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "id": 1, "error": {"message": "busy"}}))
+            return
+
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "method": "eth_subscription", "params": {}}))
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0xsub"}))
+
+        messages = self.connections[min(len(self.connected_at) - self.reject, len(self.connections)) - 1]
+        for message in messages:
+            if isinstance(message, float):
+                await asyncio.sleep(message)
+            else:
+                await websocket.send(message)
+
+        if messages is self.connections[-1]:
+            await websocket.wait_closed()
+
+
+async def _read_heads(node, count, **options):
+    async with websockets.serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        subscriber = NewHeadsSubscriber(f"ws://127.0.0.1:{port}", **options)
+        heads = []
+
+        async for head in subscriber.heads():
+            heads.append(head)
+            if len(heads) == count:
+                return heads
+
+
+def test_subscriber_skips_foreign_and_repeated_heads():
+    node = NodeStub(
+        [
+            [_head_message(1, base_fee=10**9), _head_message(2, subscription="0xother"), _head_message(2)],
+            # head 2 is sent again after reconnect
+            [_head_message(2), _head_message(3)],
+        ]
+    )
+
+    heads = asyncio.run(_read_heads(node, 3, reconnect_delay=0.01))
+
+    assert heads == [BlockHead(1, "0x1", 10**9), BlockHead(2, "0x2"), BlockHead(3, "0x3")]
+    assert len(node.connected_at) == 2
+
+
+def test_subscriber_reconnects_with_backoff():
+    node = NodeStub([[_head_message(1)]], reject=3)
+
+    heads = asyncio.run(_read_heads(node, 1, reconnect_delay=0.05, max_reconnect_delay=0.1))
+
+    delays = [after - before for before, after in zip(node.connected_at, node.connected_at[1:])]
+    assert heads == [BlockHead(1, "0x1")] and len(delays) == 3
+    assert 0.05 <= delays[0] < 0.1 <= delays[1] < 0.15 and 0.1 <= delays[2] < 0.15
+
+
+class SlowPoller(AsyncGaspricePoller):
+    async def refresh(self):
+        await asyncio.sleep(0.2)
+
+
+async def _refresh_on_burst():
+    node = NodeStub([[_head_message(1), 0.05, *[_head_message(number) for number in range(2, 6)]]])
+
+    async with websockets.serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        subscriber = NewHeadsSubscriber(f"ws://127.0.0.1:{port}")
+        refresher = NewBlockRefresher(SlowPoller(AsyncGaspriceController()), subscriber)
+
+        async with refresher:
+            await asyncio.sleep(0.8)
+
+    return subscriber.last_head, refresher.refreshes
+
+
+def test_intermediate_blocks_are_skipped():
+    last_head, refreshes = asyncio.run(_refresh_on_burst())
+
+    # block 1 is refreshed, blocks 2-4 arrive during its refresh and only block 5 triggers next one
+    assert last_head.number == 5 and refreshes == 2
@@ -0,0 +1,44 @@
+import pytest
+
+from benchmarks.mock_server import MockOracleServer, mock_providers
+from ethereum_gasprice.aggregation import GaspriceAggregator
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.controller import GaspriceController
+from ethereum_gasprice.forecast import GaspriceForecaster
+from ethereum_gasprice.poller import GaspricePoller
+
+
+class FailingAggregator(GaspriceAggregator):
+    def aggregate(self, data, unit=None):
+        raise ArithmeticError("aggregation failed")
+
+
+class FailingForecaster(GaspriceForecaster):
+    def update(self, data, timestamp=None):
+        raise ArithmeticError("forecast failed")
+
+
+@pytest.fixture(scope="module")
+def oracle():
+    with MockOracleServer() as server:
+        yield server
+
+
+def test_publish_without_aggregation(oracle):
+    with GaspriceController(providers=mock_providers(oracle)) as controller:
+        poller = GaspricePoller(controller, aggregator=FailingAggregator(), forecaster=FailingForecaster())
+        received = []
+        poller.subscribe(received.append)
+
+        snapshot = poller.refresh()
+
+    assert snapshot is not None and poller.snapshot is snapshot and received == [snapshot]
+    assert snapshot.data["etherscan"][GaspriceStrategy.FAST] == 25 * 10**9
+    assert snapshot.aggregated is None and snapshot.forecasts is None
+
+
+def test_publish_with_aggregation(oracle):
+    with GaspriceController(providers=mock_providers(oracle)) as controller:
+        snapshot = GaspricePoller(controller, aggregator=GaspriceAggregator()).refresh()
+
+    assert snapshot.aggregated.values[GaspriceStrategy.FAST] == 26 * 10**9
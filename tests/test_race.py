@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.consts import FallbackMode, GaspriceStrategy
+from ethereum_gasprice.controller import AsyncGaspriceController
+from ethereum_gasprice.providers import AsyncEtherscanProvider, AsyncEthGasStationProvider
+
+
+async def _race(oracle):
+    providers = mock_providers(
+        oracle, asynchronous=True, providers=(AsyncEtherscanProvider, AsyncEthGasStationProvider)
+    )
+
+    async with AsyncGaspriceController(
+        providers=providers, fallback_mode=FallbackMode.RACE, hedge_delay=0.05
+    ) as controller:
+        started_at = time.perf_counter()
+        gasprice = await controller.get_gasprice_by_strategy(GaspriceStrategy.FAST)
+        elapsed = time.perf_counter() - started_at
+
+        # loser would be answered in this time, if its request was not aborted
+        await asyncio.sleep(0.8)
+        return gasprice, elapsed, controller.single_flight.stats
+
+
+def test_loser_request_is_aborted():
+    slow = EndpointConfig(latency=0.5)
+
+    with MockOracleServer(endpoints={AsyncEtherscanProvider.title: slow}) as oracle:
+        gasprice, elapsed, stats = asyncio.run(_race(oracle))
+        aborted, stats_by_title = oracle.aborted, oracle.stats
+
+    assert gasprice == 26 * 10**9 and elapsed < 0.5
+    assert aborted[AsyncEtherscanProvider.title] == 1 and stats_by_title[AsyncEtherscanProvider.title] == (0, 0)
+    assert stats.executions == 2
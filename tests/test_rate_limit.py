@@ -0,0 +1,101 @@
+import time
+import uuid
+from typing import List, Tuple
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.consts import GaspriceStrategy, RequestOutcome
+from ethereum_gasprice.controller import GaspriceController
+from ethereum_gasprice.hooks import GaspriceHooks
+from ethereum_gasprice.providers import EtherscanProvider, EthGasStationProvider
+from ethereum_gasprice.rate_limit import TokenBucket
+
+
+class RateLimitRecorder(GaspriceHooks):
+    def __init__(self):
+        self.requests: List[Tuple[RequestOutcome, bool]] = []
+        self.skipped: List[Tuple[str, RequestOutcome]] = []
+
+    def on_request(self, provider, outcome, latency, attempt):
+        self.requests.append((outcome, latency is not None))
+
+    def on_provider_skipped(self, provider, reason):
+        self.skipped.append((provider, reason))
+
+
+def test_bucket_is_refilled_with_rate():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.time_until_available() <= 0.1
+
+    time.sleep(0.11)
+    assert bucket.try_acquire() and not bucket.try_acquire()
+
+
+def test_reserved_requests_are_spread_within_quota():
+    bucket = TokenBucket(rate=10, capacity=1)
+
+    delays = [bucket.reserve(max_wait=0.25) for _ in range(4)]
+
+    assert delays[0] == 0 and delays[1] == pytest.approx(0.1, abs=0.01) and delays[2] == pytest.approx(0.2, abs=0.01)
+    # token is not taken when wait is too long
+    assert delays[3] is None and bucket.reserve(max_wait=0.25) is None
+
+
+def _count_drains(monkeypatch, provider):
+    drains = []
+    monkeypatch.setattr(provider.rate_limiter, "drain", lambda: drains.append(True))
+    return drains
+
+
+def test_upstream_rejection_drains_bucket(monkeypatch):
+    hooks = RateLimitRecorder()
+    rejecting = EndpointConfig(error_rate=1, error_status=429)
+
+    with MockOracleServer(endpoints={EtherscanProvider.title: rejecting}) as oracle, httpx.Client() as client:
+        (provider_class,) = mock_providers(oracle, providers=(EtherscanProvider,))
+        provider = provider_class(secret=uuid.uuid4().hex, client=client, hooks=hooks, rate_limit=10)
+        drains = _count_drains(monkeypatch, provider)
+
+        assert not provider.request()[0]
+
+    assert hooks.requests == [(RequestOutcome.RATE_LIMITED, True)] and len(drains) == 1
+
+
+def test_exhausted_local_quota_does_not_drain_bucket(monkeypatch):
+    hooks = RateLimitRecorder()
+
+    with MockOracleServer() as oracle, httpx.Client() as client:
+        (provider_class,) = mock_providers(oracle, providers=(EtherscanProvider,))
+        provider = provider_class(secret=uuid.uuid4().hex, client=client, hooks=hooks, rate_limit=1)
+        drains = _count_drains(monkeypatch, provider)
+
+        assert provider.request()[0]
+        assert not provider.request()[0]
+        requests, _ = oracle.stats[EtherscanProvider.title]
+
+    assert requests == 1 and not drains
+    assert hooks.requests == [(RequestOutcome.SUCCESS, True), (RequestOutcome.RATE_LIMITED, False)]
+
+
+def test_controller_skips_provider_without_quota():
+    hooks = RateLimitRecorder()
+
+    with MockOracleServer() as oracle:
+        with GaspriceController(
+            providers=mock_providers(oracle, providers=(EtherscanProvider, EthGasStationProvider)),
+            settings={EtherscanProvider.title: uuid.uuid4().hex, EthGasStationProvider.title: None},
+            provider_options={EtherscanProvider.title: {"rate_limit": 1}},
+            hooks=hooks,
+        ) as controller:
+            gasprices = [controller.get_gasprice_by_strategy(GaspriceStrategy.FAST) for _ in range(2)]
+
+        requests, _ = oracle.stats[EtherscanProvider.title]
+
+    # the second call is served by the next provider without request to etherscan
+    assert gasprices == [25 * 10**9, 26 * 10**9] and requests == 1
+    assert hooks.skipped == [(EtherscanProvider.title, RequestOutcome.RATE_LIMITED)]
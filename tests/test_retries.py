@@ -0,0 +1,62 @@
+from typing import List, Tuple
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.consts import RequestOutcome
+from ethereum_gasprice.hooks import GaspriceHooks
+from ethereum_gasprice.providers import EtherscanProvider
+
+
+class RequestRecorder(GaspriceHooks):
+    def __init__(self):
+        self.requests: List[Tuple[RequestOutcome, int]] = []
+
+    def on_request(self, provider, outcome, latency, attempt):
+        self.requests.append((outcome, attempt))
+
+
+def _request(config, **options):
+    hooks = RequestRecorder()
+
+    with MockOracleServer(endpoints={EtherscanProvider.title: config}) as oracle, httpx.Client() as client:
+        (provider,) = mock_providers(oracle, providers=(EtherscanProvider,))
+        success, _ = provider(client=client, hooks=hooks, **options).request()
+        requests, _ = oracle.stats[EtherscanProvider.title]
+
+    return success, requests, hooks.requests
+
+
+def test_retryable_status_is_retried():
+    success, requests, attempts = _request(EndpointConfig(error_rate=1, error_status=502), retries=2)
+
+    assert not success and requests == 3
+    assert attempts == [(RequestOutcome.BAD_STATUS, 0), (RequestOutcome.BAD_STATUS, 1), (RequestOutcome.BAD_STATUS, 2)]
+
+
+def test_other_status_is_not_retried():
+    success, requests, attempts = _request(EndpointConfig(error_rate=1, error_status=404), retries=2)
+
+    assert not success and requests == 1 and attempts == [(RequestOutcome.BAD_STATUS, 0)]
+
+
+def test_timeout_is_retried():
+    success, requests, attempts = _request(EndpointConfig(latency=0.2), retries=1, timeout=0.05)
+
+    assert not success and attempts == [(RequestOutcome.TIMEOUT, 0), (RequestOutcome.TIMEOUT, 1)]
+
+
+def test_success_is_not_retried():
+    success, requests, attempts = _request(EndpointConfig(), retries=2)
+
+    assert success and requests == 1 and attempts == [(RequestOutcome.SUCCESS, 0)]
+
+
+@pytest.mark.parametrize("attempt", [1, 2, 3])
+def test_backoff_is_jittered_and_exponential(attempt):
+    provider = EtherscanProvider(backoff_factor=0.1)
+    delays = [provider._retry_delay(attempt) for _ in range(200)]
+
+    assert all(0 <= delay <= 0.1 * 2 ** (attempt - 1) for delay in delays)
+    assert len(set(delays)) > 1 and max(delays) > 0.1 * 2 ** (attempt - 1) / 2
@@ -0,0 +1,61 @@
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.consts import GaspriceStrategy, ProviderOrdering
+from ethereum_gasprice.controller import GaspriceController
+from ethereum_gasprice.providers import EtherchainProvider, EtherscanProvider, EthGasStationProvider
+from ethereum_gasprice.scheduling import ProviderScheduler
+
+PROVIDERS = (EtherscanProvider, EthGasStationProvider, EtherchainProvider)
+
+
+def test_unmeasured_providers_keep_configured_order():
+    assert ProviderScheduler(exploration=0).order(PROVIDERS) == list(PROVIDERS)
+
+
+def test_slow_provider_is_moved_back():
+    scheduler = ProviderScheduler(alpha=0.5, exploration=0)
+
+    for _ in range(3):
+        scheduler.record(EtherscanProvider.title, 0.5, True)
+        scheduler.record(EthGasStationProvider.title, 0.1, True)
+        scheduler.record(EtherchainProvider.title, 0.2, True)
+
+    assert scheduler.order(PROVIDERS) == [EthGasStationProvider, EtherchainProvider, EtherscanProvider]
+
+    # etherscan becomes the fastest, moving average follows it
+    for _ in range(5):
+        scheduler.record(EtherscanProvider.title, 0.05, True)
+
+    assert scheduler.order(PROVIDERS)[0] is EtherscanProvider
+
+
+def test_failing_provider_is_moved_back():
+    scheduler = ProviderScheduler(alpha=0.5, exploration=0, failure_penalty=1.0)
+    scheduler.record(EtherscanProvider.title, 0.1, True)
+    scheduler.record(EthGasStationProvider.title, 0.2, True)
+
+    assert scheduler.order(PROVIDERS[:2]) == [EtherscanProvider, EthGasStationProvider]
+
+    scheduler.record(EtherscanProvider.title, 0.1, False)
+
+    assert scheduler.order(PROVIDERS[:2]) == [EthGasStationProvider, EtherscanProvider]
+    assert scheduler.stats[EtherscanProvider.title].success_rate == 0.5
+
+
+def test_adaptive_controller_prefers_fast_healthy_provider():
+    with MockOracleServer(endpoints={EtherscanProvider.title: EndpointConfig(latency=0.1)}) as oracle:
+        with GaspriceController(
+            providers=mock_providers(oracle, providers=PROVIDERS[:2]),
+            provider_ordering=ProviderOrdering.ADAPTIVE,
+            scheduler=ProviderScheduler(exploration=0),
+            breaker_failure_threshold=0,
+        ) as controller:
+            # etherscan is tried first and measured, then unmeasured ethgasstation, which is faster
+            fast = [controller.get_gasprice_by_strategy(GaspriceStrategy.FAST) for _ in range(3)]
+
+            oracle.configure(EthGasStationProvider.title, EndpointConfig(error_rate=1))
+            failing = [controller.get_gasprice_by_strategy(GaspriceStrategy.FAST) for _ in range(3)]
+            requests, _ = oracle.stats[EthGasStationProvider.title]
+
+    assert fast == [25 * 10**9, 26 * 10**9, 26 * 10**9]
+    # failed request costs more than latency of etherscan, so failing provider is moved back after first failure
+    assert failing == [25 * 10**9] * 3 and requests == 1
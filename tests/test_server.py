@@ -0,0 +1,109 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import MockOracleServer, mock_providers
+from ethereum_gasprice.__main__ import _build_parser, _build_server
+from ethereum_gasprice.aggregation import GaspriceAggregator
+from ethereum_gasprice.consts import EthereumUnit
+from ethereum_gasprice.controller import AsyncGaspriceController
+from ethereum_gasprice.forecast import GaspriceForecaster
+from ethereum_gasprice.poller import AsyncGaspricePoller
+from ethereum_gasprice.server import GaspriceServer
+
+
+@pytest.fixture(scope="module")
+def oracle():
+    with MockOracleServer() as server:
+        yield server
+
+
+async def _get_all(oracle, unit):
+    args = _build_parser().parse_args(["serve", "--unit", unit, "--port", "0", "--interval", "5", "--forecast"])
+
+    async with AsyncGaspriceController(
+        return_unit=EthereumUnit(args.unit), providers=mock_providers(oracle, asynchronous=True)
+    ) as controller:
+        async with _build_server(args, controller) as server:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+                gasprices = await client.get("/v1/gasprices", params={"wait": 5})
+                etag = gasprices.headers["etag"]
+                providers = await client.get("/v1/providers")
+                not_modified = await client.get("/v1/gasprices", headers={"If-None-Match": etag})
+                health = await client.get("/health")
+
+    return gasprices, providers, not_modified, health
+
+
+@pytest.mark.parametrize("unit, scale", [("wei", 10**9), ("gwei", 1)])
+def test_serve(oracle, unit, scale):
+    gasprices, providers, not_modified, health = asyncio.run(_get_all(oracle, unit))
+
+    assert gasprices.status_code == 200
+    body = gasprices.json()
+    assert body["unit"] == unit
+    assert body["gasprices"] == {"slow": 18 * scale, "regular": 21 * scale, "fast": 26 * scale, "fastest": 30 * scale}
+
+    # fractional gwei of Etherchain is sent as exact decimal string
+    etherchain = json.loads(providers.content)["providers"]["etherchain"]
+    assert Decimal(str(etherchain["fast"])) == Decimal("20.5") * scale
+
+    assert not_modified.status_code == 304
+    assert health.status_code == 200
+
+
+class FailingAggregator(GaspriceAggregator):
+    def aggregate(self, data, unit=None):
+        raise ArithmeticError("aggregation failed")
+
+
+async def _get_without_aggregation(oracle):
+    async with AsyncGaspriceController(providers=mock_providers(oracle, asynchronous=True)) as controller:
+        poller = AsyncGaspricePoller(controller, aggregator=FailingAggregator())
+
+        async with GaspriceServer(poller, port=0) as server:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+                return await client.get("/v1/gasprices", params={"wait": 5}), await client.get("/v1/providers")
+
+
+def test_serve_without_aggregation(oracle):
+    gasprices, providers = asyncio.run(_get_without_aggregation(oracle))
+
+    assert gasprices.status_code == 200
+    assert set(gasprices.json()["gasprices"].values()) == {None}
+    assert providers.json()["providers"]["etherscan"]["fast"] == 25 * 10**9
+
+
+async def _get_forecasts_of_two_polls(oracle):
+    async with AsyncGaspriceController(providers=mock_providers(oracle, asynchronous=True)) as controller:
+        poller = AsyncGaspricePoller(controller, interval=60, forecaster=GaspriceForecaster())
+
+        async with GaspriceServer(poller, port=0) as server:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+                gasprices = await client.get("/v1/gasprices", params={"wait": 5})
+                first = await client.get("/v1/forecasts")
+
+                # gasprices of mock server are the same, only forecasts are updated
+                assert await poller.refresh() is None
+
+                second = await client.get("/v1/forecasts", headers={"If-None-Match": first.headers["etag"]})
+                not_modified = await client.get("/v1/forecasts", headers={"If-None-Match": second.headers["etag"]})
+                same_gasprices = await client.get("/v1/gasprices", headers={"If-None-Match": gasprices.headers["etag"]})
+                batch = await client.post("/v1/batch", json={"requests": ["/v1/forecasts"]})
+
+    return first, second, not_modified, same_gasprices, batch
+
+
+def test_forecasts_are_rendered_on_every_poll(oracle):
+    first, second, not_modified, same_gasprices, batch = asyncio.run(_get_forecasts_of_two_polls(oracle))
+
+    assert first.status_code == second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.json()["timestamp"] > first.json()["timestamp"]
+    assert second.json()["version"] == first.json()["version"]
+    assert not_modified.status_code == 304
+    assert same_gasprices.status_code == 304
+    assert batch.json()["responses"][0]["body"] == second.json()
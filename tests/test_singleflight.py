@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.controller import AsyncGaspriceController
+from ethereum_gasprice.providers import AsyncEtherscanProvider
+from ethereum_gasprice.singleflight import AsyncSingleFlight, SingleFlightStats
+
+
+async def _get_concurrently(oracle, count):
+    providers = mock_providers(oracle, asynchronous=True, providers=(AsyncEtherscanProvider,))
+
+    async with AsyncGaspriceController(providers=providers) as controller:
+        results = await asyncio.gather(*(controller.get_gasprices() for _ in range(count)))
+        return results, controller.single_flight.stats
+
+
+def test_concurrent_calls_make_one_request():
+    with MockOracleServer(endpoints={AsyncEtherscanProvider.title: EndpointConfig(latency=0.1)}) as oracle:
+        results, stats = asyncio.run(_get_concurrently(oracle, 20))
+        requests, _ = oracle.stats[AsyncEtherscanProvider.title]
+
+    assert requests == 1
+    assert stats == SingleFlightStats(calls=20, executions=1, coalesced=19)
+    assert all(result[GaspriceStrategy.FAST] == 25 * 10**9 for result in results)
+
+
+async def _fail_concurrently(count):
+    single_flight = AsyncSingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ArithmeticError("upstream failed")
+
+    results = await asyncio.gather(*(single_flight.do("key", fail) for _ in range(count)), return_exceptions=True)
+    return results, single_flight.stats
+
+
+def test_exception_reaches_every_waiter():
+    results, stats = asyncio.run(_fail_concurrently(5))
+
+    assert stats.executions == 1
+    assert len(results) == 5 and all(isinstance(result, ArithmeticError) for result in results)
+
+
+async def _cancel_one_waiter():
+    single_flight = AsyncSingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return 1
+
+    first = asyncio.ensure_future(single_flight.do("key", call))
+    second = asyncio.ensure_future(single_flight.do("key", call))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    return await second, await single_flight.do("key", call), single_flight.stats
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    second, next_call, stats = asyncio.run(_cancel_one_waiter())
+
+    assert second == next_call == 1
+    assert stats == SingleFlightStats(calls=3, executions=2, coalesced=1)
@@ -0,0 +1,86 @@
+import copy
+import pickle
+
+import pytest
+
+from ethereum_gasprice.consts import EthereumUnit, GaspriceStrategy
+from ethereum_gasprice.snapshot import STRATEGIES, GaspriceSnapshot
+
+
+@pytest.fixture
+def snapshot():
+    return GaspriceSnapshot(regular=20, fast=25, timestamp=1000.0, source="etherscan")
+
+
+def test_snapshot_is_immutable(snapshot):
+    with pytest.raises(AttributeError):
+        snapshot.source = "poa"
+
+    with pytest.raises(AttributeError):
+        snapshot._values = (1, 2, 3, 4)
+
+    with pytest.raises(AttributeError):
+        del snapshot._timestamp
+
+    with pytest.raises(TypeError):
+        snapshot[GaspriceStrategy.FAST] = 30
+
+    assert snapshot.values_tuple() == (None, 20, 25, None)
+    assert copy.copy(snapshot) is snapshot
+    assert copy.deepcopy(snapshot) is snapshot
+
+
+def test_snapshot_is_mapping(snapshot):
+    assert list(snapshot) == list(STRATEGIES)
+    assert len(snapshot) == len(STRATEGIES)
+    assert snapshot[GaspriceStrategy.FAST] == snapshot["fast"] == 25
+    assert snapshot.get("unknown", 0) == 0
+    assert "regular" in snapshot
+    assert [] not in snapshot
+
+    with pytest.raises(KeyError):
+        snapshot["unknown"]
+
+
+def test_snapshot_equals_dict(snapshot):
+    data = {
+        GaspriceStrategy.SLOW: None,
+        GaspriceStrategy.REGULAR: 20,
+        GaspriceStrategy.FAST: 25,
+        GaspriceStrategy.FASTEST: None,
+    }
+
+    assert snapshot == data
+    assert data == snapshot
+    assert snapshot != {**data, GaspriceStrategy.FAST: 26}
+    assert snapshot != {GaspriceStrategy.REGULAR: 20, GaspriceStrategy.FAST: 25}
+    assert snapshot.to_dict() == data and type(snapshot.to_dict()) is dict
+    assert snapshot != [None, 20, 25, None]
+
+
+def test_snapshot_equality_ignores_metadata(snapshot):
+    other = GaspriceSnapshot.from_mapping(snapshot.to_dict(), timestamp=2000.0, source="poa")
+
+    assert other == snapshot
+    assert hash(other) == hash(snapshot)
+    assert len({snapshot, other}) == 1
+
+
+def test_snapshot_pickle(snapshot):
+    restored = pickle.loads(pickle.dumps(snapshot))
+
+    assert type(restored) is GaspriceSnapshot
+    assert restored == snapshot
+    assert restored.timestamp == 1000.0
+    assert restored.source == "etherscan"
+
+    with pytest.raises(AttributeError):
+        restored.source = "poa"
+
+
+def test_snapshot_convert(snapshot):
+    converted = snapshot.convert(EthereumUnit.GWEI, EthereumUnit.WEI)
+
+    assert converted[GaspriceStrategy.FAST] == 25 * 10**9
+    assert converted.timestamp == snapshot.timestamp and converted.source == snapshot.source
+    assert snapshot.convert(EthereumUnit.GWEI, EthereumUnit.GWEI) is snapshot
@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from benchmarks.mock_server import EndpointConfig, MockOracleServer, mock_providers
+from ethereum_gasprice.cache import GaspriceCache
+from ethereum_gasprice.consts import GaspriceStrategy
+from ethereum_gasprice.controller import AsyncGaspriceController, GaspriceController
+from ethereum_gasprice.providers import AsyncEtherscanProvider, EtherscanProvider
+from ethereum_gasprice.stores import MemoryStore, MmapFileStore, RedisStore
+
+
+def _worker(port, path, start, results):
+    oracle = MockOracleServer(port=port)
+    cache = GaspriceCache(ttl=60, store=MmapFileStore(path), poll_interval=0.01)
+
+    with GaspriceController(
+        providers=mock_providers(oracle, providers=(EtherscanProvider,)), cache=cache
+    ) as controller:
+        # all workers request gasprice at once
+        start.wait()
+        results.put(controller.get_gasprice_by_strategy(GaspriceStrategy.FAST))
+
+
+def test_one_process_fetches_for_all(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    start, results = context.Barrier(4), context.Queue()
+
+    with MockOracleServer(endpoints={EtherscanProvider.title: EndpointConfig(latency=0.3)}) as oracle:
+        workers = [
+            context.Process(target=_worker, args=(oracle.port, str(tmp_path / "gasprice.bin"), start, results))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+
+        values = [results.get(timeout=30) for _ in workers]
+
+        for worker in workers:
+            worker.join()
+
+        requests, _ = oracle.stats[EtherscanProvider.title]
+
+    assert values == [25 * 10**9] * 4
+    assert requests == 1
+
+
+def _hold_lock(path, key, locked):
+    MmapFileStore(path).acquire_lock(key, 60)
+    locked.set()
+    # process dies without releasing lock
+
+
+def test_file_lock_is_released_when_holder_dies(tmp_path):
+    path = str(tmp_path / "gasprice.bin")
+    context = multiprocessing.get_context("spawn")
+    locked = context.Event()
+
+    holder = context.Process(target=_hold_lock, args=(path, "gasprices", locked))
+    holder.start()
+    assert locked.wait(30)
+    holder.join()
+
+    assert MmapFileStore(path).acquire_lock("gasprices", 60)
+
+
+def test_value_is_fetched_when_lock_holder_does_not_store_it(tmp_path):
+    path = str(tmp_path / "gasprice.bin")
+    cache = GaspriceCache(ttl=60, store=MmapFileStore(path), lock_timeout=0.2, poll_interval=0.01)
+
+    with MockOracleServer() as oracle:
+        with GaspriceController(
+            providers=mock_providers(oracle, providers=(EtherscanProvider,)), cache=cache
+        ) as controller:
+            # lock of another process, which hangs
+            holder = MmapFileStore(path)
+            assert holder.acquire_lock(GaspriceCache._key(controller._cache_key("gasprices")), 60)
+
+            started_at = time.monotonic()
+            snapshot = controller.get_gasprices()
+            elapsed = time.monotonic() - started_at
+
+    assert snapshot[GaspriceStrategy.FAST] == 25 * 10**9
+    assert 0.2 <= elapsed < 1
+
+
+def test_redis_lock_expires():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    store, other = RedisStore(client), RedisStore(client)
+
+    assert store.acquire_lock("gasprices", 0.05)
+    assert not other.acquire_lock("gasprices", 0.05)
+
+    time.sleep(0.1)
+    assert other.acquire_lock("gasprices", 0.05)
+
+    # expired holder can't release lock of new holder
+    store.release_lock("gasprices")
+    assert not store.acquire_lock("gasprices", 0.05)
+
+
+class ThreadRecordingStore(MemoryStore):
+    shared = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, entry, expire=None):
+        self.threads.add(threading.get_ident())
+        super().set(key, entry, expire)
+
+
+async def _get_twice(oracle, store):
+    cache = GaspriceCache(ttl=60, store=store)
+    providers = mock_providers(oracle, asynchronous=True, providers=(AsyncEtherscanProvider,))
+
+    async with AsyncGaspriceController(providers=providers, cache=cache) as controller:
+        return [await controller.get_gasprices(), await controller.get_gasprices()]
+
+
+def test_async_controller_does_not_block_loop_on_shared_store():
+    store = ThreadRecordingStore()
+
+    with MockOracleServer() as oracle:
+        first, second = asyncio.run(_get_twice(oracle, store))
+
+    assert first == second and first[GaspriceStrategy.FAST] == 25 * 10**9
+    assert store.threads and threading.get_ident() not in store.threads